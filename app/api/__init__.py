@@ -0,0 +1,17 @@
+from .export import router as export_router
+from .health import router as health_router
+from .metrics import router as metrics_router
+from .projects import router as projects_router
+from .reports import router as reports_router
+from .search import router as search_router
+from .tasks import router as tasks_router
+
+__all__ = [
+    "export_router",
+    "health_router",
+    "metrics_router",
+    "projects_router",
+    "reports_router",
+    "search_router",
+    "tasks_router",
+]
@@ -0,0 +1,38 @@
+from typing import Literal
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.models.audit import Audit
+from app.models.base import BaseDoc
+from app.models.project import Project
+from app.models.task import Task
+from app.repositories.export import MEDIA_TYPES, ExportFormat, export_stream
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+ExportCollection = Literal["tasks", "projects", "audit"]
+
+_MODELS: dict[str, type[BaseDoc]] = {
+    "tasks": Task,
+    "projects": Project,
+    "audit": Audit,
+}
+
+
+@router.get("/{collection}")
+async def export_collection(
+    collection: ExportCollection,
+    format: ExportFormat = Query("ndjson"),
+    gzip: bool = Query(False),
+) -> StreamingResponse:
+    """Stream a whole collection as NDJSON or CSV, optionally gzip-encoded."""
+    filename = f"{collection}.{format}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_stream(_MODELS[collection], format, gzip=gzip),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
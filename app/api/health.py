@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Response
+
+from app.core.health import HEALTH_BODY, LIVE_BODY, readiness
+
+router = APIRouter(tags=["health"])
+
+_JSON = "application/json"
+
+
+@router.get("/health")
+async def health() -> Response:
+    return Response(HEALTH_BODY, media_type=_JSON)
+
+
+@router.get("/livez")
+async def livez() -> Response:
+    """The process is up and serving; never touches a dependency."""
+    return Response(LIVE_BODY, media_type=_JSON)
+
+
+@router.get("/readyz")
+async def readyz() -> Response:
+    """Last background probe of Mongo and Redis; 503 until they answer."""
+    ready, body = readiness()
+    return Response(body, status_code=200 if ready else 503, media_type=_JSON)
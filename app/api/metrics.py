@@ -0,0 +1,111 @@
+import asyncio
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from app.core.admission import admission_stats
+from app.core.cache import cache_stats
+from app.core.logging import dropped_log_records
+from app.core.metrics import CONTENT_TYPE, CallbackMetric, Labels, render
+from app.core.mongo import mongo_pool_stats
+from app.core.redis import redis_pool_stats, session_cache_stats
+from app.repositories.search import search_cache_stats
+
+router = APIRouter(tags=["metrics"])
+
+_CACHE_RESULTS = ("hits", "negative_hits", "misses")
+
+
+def _cache_lookups() -> dict[Labels, float]:
+    caches: dict[str, dict[str, Any]] = {
+        f"document:{name}": stats for name, stats in cache_stats().items()
+    }
+    caches["session"] = session_cache_stats()
+    caches["search"] = search_cache_stats()
+    return {
+        (cache, result): stats[result]
+        for cache, stats in caches.items()
+        for result in _CACHE_RESULTS
+        if result in stats
+    }
+
+
+def _pool(key: str) -> Any:
+    return lambda: mongo_pool_stats()[key]
+
+
+CallbackMetric(
+    "mongodb_pool_connections_in_use",
+    "Connections checked out of the Mongo pool.",
+    _pool("in_use"),
+)
+CallbackMetric(
+    "mongodb_pool_checkouts_total",
+    "Successful Mongo pool checkouts.",
+    _pool("checkouts"),
+    kind="counter",
+)
+CallbackMetric(
+    "mongodb_pool_checkout_failures_total",
+    "Mongo pool checkouts that failed or timed out.",
+    _pool("failures"),
+    kind="counter",
+)
+CallbackMetric(
+    "mongodb_pool_checkout_wait_seconds_total",
+    "Time spent waiting for Mongo pool connections.",
+    _pool("wait_seconds_total"),
+    kind="counter",
+)
+CallbackMetric(
+    "redis_pool_connections",
+    "Redis pool connections by state.",
+    lambda: {
+        (state,): value
+        for state, value in redis_pool_stats().items()
+        if state in ("in_use", "available")
+    },
+    labelnames=("state",),
+)
+CallbackMetric(
+    "redis_pool_max_connections",
+    "Redis pool size limit.",
+    lambda: redis_pool_stats().get("max_size"),
+)
+CallbackMetric(
+    "app_cache_lookups_total",
+    "In-process and Redis cache lookups by cache and result.",
+    _cache_lookups,
+    kind="counter",
+    labelnames=("cache", "result"),
+)
+CallbackMetric(
+    "log_records_dropped_total",
+    "Log records dropped because the log queue was full.",
+    dropped_log_records,
+    kind="counter",
+)
+
+CallbackMetric(
+    "admission_concurrency",
+    "Adaptive concurrency limit state (limit, in_flight, queued).",
+    lambda: {
+        (name,): value
+        for name, value in admission_stats().items()
+        if name in ("limit", "in_flight", "queued")
+    },
+    labelnames=("state",),
+)
+CallbackMetric(
+    "admission_shed_total",
+    "Requests shed with 503 by the concurrency limit.",
+    lambda: admission_stats().get("shed"),
+    kind="counter",
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    # With METRICS_MULTIPROCESS_DIR set, render() reads every worker's
+    # snapshot under a file lock; keep that off the event loop.
+    return Response(await asyncio.to_thread(render), media_type=CONTENT_TYPE)
@@ -0,0 +1,69 @@
+from typing import Any
+
+from beanie import PydanticObjectId
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from app.core.conditional import (
+    document_validators,
+    is_conditional,
+    is_not_modified,
+    not_modified,
+    page_validators,
+)
+from app.models.projections import DocVersion
+from app.repositories.project import ProjectRepository
+
+router = APIRouter(prefix="/projects", tags=["projects"])
+
+
+@router.get("", response_model=None)
+async def list_projects(
+    request: Request,
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+) -> dict[str, Any] | Response:
+    """
+    One page of projects. Sends a weak ETag; a matching If-None-Match gets 304,
+    checked against a projection of the page before the projects are loaded.
+    """
+    repo = ProjectRepository()
+    try:
+        if is_conditional(request):
+            versions = await repo.list_projected(DocVersion, cursor=cursor, limit=limit)
+            validators = page_validators(versions.items, versions.next_cursor)
+            if is_not_modified(request, validators):
+                return not_modified(validators)
+        page = await repo.list_page(cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers.update(page_validators(page.items, page.next_cursor))
+    return {
+        "items": [doc.model_dump(mode="json", by_alias=True) for doc in page.items],
+        "next_cursor": page.next_cursor,
+    }
+
+
+@router.get("/{project_id}", response_model=None)
+async def get_project(
+    project_id: PydanticObjectId, request: Request, response: Response
+) -> dict[str, Any] | Response:
+    """
+    One project, with ETag and Last-Modified. Conditional requests are checked
+    against the cached copy or a projection of its version and get 304 without
+    loading the project when it is unchanged.
+    """
+    repo = ProjectRepository()
+    if is_conditional(request):
+        version = await repo.get_version(project_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+        validators = document_validators(version)
+        if is_not_modified(request, validators):
+            return not_modified(validators)
+    project = await repo.get(project_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    response.headers.update(document_validators(project))
+    body: dict[str, Any] = project.model_dump(mode="json", by_alias=True)
+    return body
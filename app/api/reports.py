@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+
+from app.repositories.reporting import open_tasks_by_assignee, tasks_by_project_status
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/tasks/by-project")
+async def tasks_by_project(
+    project_id: int | None = None,
+) -> dict[int, dict[str, int]]:
+    """Task counts per project and status."""
+    return await tasks_by_project_status(project_id)
+
+
+@router.get("/tasks/open-by-assignee")
+async def open_by_assignee(assigned_to: int | None = None) -> dict[int, int]:
+    """Open (assigned or pending) task counts per assignee."""
+    return await open_tasks_by_assignee(assigned_to)
@@ -0,0 +1,59 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.models.enums import TaskStatus
+from app.repositories.project import ProjectRepository
+from app.repositories.search import SearchPage
+from app.repositories.task import TaskRepository
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def _page(page: SearchPage[Any]) -> dict[str, Any]:
+    items = [
+        {"score": hit.score, **hit.doc.model_dump(mode="json", by_alias=True)}
+        for hit in page.hits
+    ]
+    return {"items": items, "next_cursor": page.next_cursor}
+
+
+@router.get("/tasks")
+async def search_tasks(
+    q: str = Query(..., min_length=1),
+    status: TaskStatus | None = None,
+    project_id: int | None = None,
+    assigned_to: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+) -> dict[str, Any]:
+    """Ranked full-text search over tasks."""
+    try:
+        page = await TaskRepository().search(
+            q,
+            status=status,
+            project_id=project_id,
+            assigned_to=assigned_to,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _page(page)
+
+
+@router.get("/projects")
+async def search_projects(
+    q: str = Query(..., min_length=1),
+    owner_id: int | None = None,
+    cursor: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+) -> dict[str, Any]:
+    """Ranked full-text search over projects."""
+    try:
+        page = await ProjectRepository().search(
+            q, owner_id=owner_id, cursor=cursor, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _page(page)
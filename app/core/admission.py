@@ -0,0 +1,144 @@
+"""
+Adaptive in-process concurrency limit (admission control).
+
+Up to `limit` requests run at once; the rest wait in a short FIFO queue and
+are shed (503 + Retry-After) when the queue is full or their wait exceeds
+ADMISSION_QUEUE_TIMEOUT_SECONDS. That bounds the latency a request can pick
+up here, instead of letting every request slow down together.
+
+The limit follows AIMD, checked once per second: it shrinks by 10% while the
+average Mongo pool checkout wait exceeds ADMISSION_POOL_WAIT_TARGET_SECONDS
+or the Redis pool is exhausted (downstream is saturated, more concurrency
+only queues there), and grows while it is the binding constraint and the
+pools are healthy.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.mongo import mongo_pool_stats
+from app.core.redis import redis_pool_stats
+
+logger = get_logger(__name__)
+
+_ADJUST_INTERVAL = 1.0
+_DECREASE_FACTOR = 0.9
+
+
+class AdaptiveConcurrencyLimit:
+    """Event-loop-only; not thread-safe."""
+
+    def __init__(self) -> None:
+        self.maximum = settings.admission_max_concurrency
+        self.minimum = min(settings.admission_min_concurrency, self.maximum)
+        self.limit = self.maximum
+        self.in_flight = 0
+        self.shed = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._window_start = time.monotonic()
+        self._binding = False
+        stats = mongo_pool_stats()
+        self._pool_mark = (stats["checkouts"], stats["wait_seconds_total"])
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed; False when shed."""
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            return True
+        self._binding = True
+        if len(self._waiters) >= settings.admission_max_queue:
+            self.shed += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(waiter), settings.admission_queue_timeout_seconds
+            )
+        except TimeoutError:
+            if waiter.done():  # admitted just as the timeout fired
+                return True
+            waiter.cancel()
+            with contextlib.suppress(ValueError):
+                self._waiters.remove(waiter)
+            self.shed += 1
+            return False
+        except asyncio.CancelledError:
+            # Client went away; hand back a slot granted in the meantime.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+        return True
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._maybe_adjust()
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _pool_pressure(self) -> bool:
+        stats = mongo_pool_stats()
+        checkouts, wait_total = stats["checkouts"], stats["wait_seconds_total"]
+        done = checkouts - self._pool_mark[0]
+        waited = wait_total - self._pool_mark[1]
+        self._pool_mark = (checkouts, wait_total)
+        mongo_slow = done > 0 and waited / done > (
+            settings.admission_pool_wait_target_seconds
+        )
+        redis = redis_pool_stats()
+        redis_full = (
+            bool(redis.get("max_size")) and redis["in_use"] >= redis["max_size"]
+        )
+        return mongo_slow or redis_full
+
+    def _maybe_adjust(self) -> None:
+        now = time.monotonic()
+        if now - self._window_start < _ADJUST_INTERVAL:
+            return
+        previous = self.limit
+        if self._pool_pressure():
+            self.limit = max(self.minimum, int(self.limit * _DECREASE_FACTOR))
+        elif self._binding:
+            self.limit = min(self.maximum, self.limit + max(1, self.limit // 20))
+        if self.limit != previous:
+            logger.info("Concurrency limit %d -> %d", previous, self.limit)
+        self._window_start = now
+        self._binding = False
+
+
+_limiter: AdaptiveConcurrencyLimit | None = None
+
+
+def get_limiter() -> AdaptiveConcurrencyLimit:
+    global _limiter
+    if _limiter is None:
+        _limiter = AdaptiveConcurrencyLimit()
+    return _limiter
+
+
+def admission_stats() -> dict[str, int]:
+    """Current limit, in-flight and queued requests, and requests shed."""
+    if _limiter is None:
+        return {}
+    return {
+        "limit": _limiter.limit,
+        "in_flight": _limiter.in_flight,
+        "queued": _limiter.queued,
+        "shed": _limiter.shed,
+    }
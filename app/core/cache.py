@@ -0,0 +1,294 @@
+import asyncio
+import json
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any, Generic, TypeVar
+
+from beanie import Document, PydanticObjectId
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.redis import get_redis
+
+DocT = TypeVar("DocT", bound=Document)
+IdT = TypeVar("IdT", bound=PydanticObjectId | str)
+
+logger = get_logger(__name__)
+
+# Stored for ids that do not exist so repeated lookups of a missing id do not
+# fall through to Mongo. Cannot collide with a serialized document (JSON).
+_NEGATIVE = "\x00missing"
+
+
+def _encode(doc: Document) -> str:
+    if doc.revision_id is None:
+        dumped: str = doc.model_dump_json(by_alias=True)
+        return dumped
+    # revision_id is excluded from dumps, but callers need it to pass as
+    # expected_revision.
+    payload = doc.model_dump(mode="json", by_alias=True)
+    payload["revision_id"] = str(doc.revision_id)
+    return json.dumps(payload)
+
+
+class DocumentCache(Generic[DocT]):
+    """
+    Read-through Redis cache for single-document lookups of one model.
+
+    - Documents are stored as JSON under `cache:<version>:<collection>:<id>`,
+      so bumping CACHE_KEY_VERSION orphans every entry written by older code.
+    - Missing ids are cached for a shorter, separate TTL.
+    - Concurrent misses for the same id within this process share one load.
+    - Redis errors are logged and counted; the loader result is still returned.
+    """
+
+    def __init__(
+        self,
+        model: type[DocT],
+        *,
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+        version: str | None = None,
+    ) -> None:
+        self.model = model
+        self.ttl = ttl or settings.cache_ttl_seconds
+        self.negative_ttl = negative_ttl or settings.cache_negative_ttl_seconds
+        self.version = version or settings.cache_key_version
+        self._inflight: dict[str, asyncio.Future[DocT | None]] = {}
+        # Keys invalidated while a load was in flight; that load's result may
+        # predate the write and must not be cached.
+        self._stale: set[str] = set()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    def key(self, id: PydanticObjectId | str) -> str:
+        return f"cache:{self.version}:{self.model.get_collection_name()}:{id}"
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+    async def get(
+        self,
+        id: PydanticObjectId | str,
+        loader: Callable[[], Awaitable[DocT | None]],
+    ) -> DocT | None:
+        key = self.key(id)
+        found, cached = await self._read(key)
+        if found:
+            return cached
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            try:
+                doc = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # The leading caller was cancelled, not us: load ourselves.
+                if not pending.cancelled():
+                    raise
+                return await loader()
+            return doc.model_copy() if doc is not None else None
+
+        self.misses += 1
+        future: asyncio.Future[DocT | None] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            doc = await loader()
+            future.set_result(doc)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del self._inflight[key]
+
+        if key in self._stale:
+            self._stale.discard(key)
+        else:
+            await self._write(key, doc)
+        return doc
+
+    async def get_many(
+        self,
+        ids: Iterable[IdT],
+        loader: Callable[[list[IdT]], Awaitable[Mapping[IdT, DocT]]],
+    ) -> dict[IdT, DocT]:
+        """
+        Batch form of get(): one MGET for all `ids`, then a single `loader`
+        call for the misses (it returns the documents it found, keyed like
+        `ids`), written back in one pipeline. Ids another caller is already
+        loading are awaited instead of loaded twice. Missing ids are left out
+        of the result.
+        """
+        ids = list(dict.fromkeys(ids))
+        found: dict[IdT, DocT] = {}
+        if not ids:
+            return found
+        missing: list[IdT] = []
+        for id, (hit, doc) in zip(
+            ids, await self._read_many([self.key(i) for i in ids]), strict=True
+        ):
+            if not hit:
+                missing.append(id)
+            elif doc is not None:
+                found[id] = doc
+        if not missing:
+            return found
+
+        pending = {
+            i: self._inflight[self.key(i)]
+            for i in missing
+            if self.key(i) in self._inflight
+        }
+        to_load = [i for i in missing if i not in pending]
+        self.misses += len(to_load)
+        self.coalesced += len(pending)
+        loop = asyncio.get_running_loop()
+        futures: dict[IdT, asyncio.Future[DocT | None]] = {}
+        for id in to_load:
+            futures[id] = self._inflight[self.key(id)] = loop.create_future()
+        try:
+            loaded = await loader(to_load) if to_load else {}
+            for id, future in futures.items():
+                future.set_result(loaded.get(id))
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures.values():
+                future.set_exception(e)
+                future.exception()
+            raise
+        finally:
+            for id in to_load:
+                del self._inflight[self.key(id)]
+
+        found.update(loaded)
+        fresh: dict[str, DocT | None] = {}
+        for id in to_load:
+            key = self.key(id)
+            if key in self._stale:
+                self._stale.discard(key)
+            else:
+                fresh[key] = loaded.get(id)
+        await self._write_many(fresh)
+
+        for id, future in pending.items():
+            try:
+                doc = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                doc = (await loader([id])).get(id)
+            if doc is not None:
+                found[id] = doc.model_copy()
+        return found
+
+    async def invalidate(self, *ids: PydanticObjectId | str | None) -> None:
+        keys = [self.key(i) for i in ids if i is not None]
+        if not keys:
+            return
+        self._stale.update(k for k in keys if k in self._inflight)
+        try:
+            await get_redis().delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Cache invalidation failed for %s: %s", keys, e)
+
+    async def peek(self, id: PydanticObjectId | str) -> tuple[bool, DocT | None]:
+        """
+        Cached entry for `id` without loading on a miss: (found, doc), where
+        doc is None for a cached missing id.
+        """
+        return await self._read(self.key(id))
+
+    async def _read(self, key: str) -> tuple[bool, DocT | None]:
+        try:
+            raw = await get_redis().get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Cache read failed for %s: %s", key, e)
+            return False, None
+        return self._decode(raw)
+
+    async def _read_many(self, keys: list[str]) -> list[tuple[bool, DocT | None]]:
+        try:
+            raws = await get_redis().mget(keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Cache read failed for %d keys: %s", len(keys), e)
+            return [(False, None)] * len(keys)
+        return [self._decode(raw) for raw in raws]
+
+    def _decode(self, raw: bytes | str | None) -> tuple[bool, DocT | None]:
+        if raw is None:
+            return False, None
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        if raw == _NEGATIVE:
+            self.negative_hits += 1
+            return True, None
+        self.hits += 1
+        return True, self.model.model_validate_json(raw)
+
+    async def _write(self, key: str, doc: DocT | None) -> None:
+        try:
+            if doc is None:
+                await get_redis().set(key, _NEGATIVE, ex=self.negative_ttl)
+            else:
+                await get_redis().set(key, _encode(doc), ex=self.ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Cache write failed for %s: %s", key, e)
+
+    async def _write_many(self, docs: dict[str, DocT | None]) -> None:
+        if not docs:
+            return
+        try:
+            async with get_redis().pipeline(transaction=False) as pipe:
+                for key, doc in docs.items():
+                    if doc is None:
+                        pipe.set(key, _NEGATIVE, ex=self.negative_ttl)
+                    else:
+                        pipe.set(key, _encode(doc), ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            self.errors += 1
+            logger.warning("Cache write failed for %d keys: %s", len(docs), e)
+
+
+_caches: dict[type[Document], DocumentCache[Any]] = {}
+
+
+def get_document_cache(model: type[DocT]) -> DocumentCache[DocT] | None:
+    """
+    Shared cache for `model`, or None when CACHE_ENABLED is off or the model
+    is not `cacheable`. One instance per model keeps single-flight and
+    counters process-wide.
+    """
+    if not settings.cache_enabled or not getattr(model, "cacheable", True):
+        return None
+    if model not in _caches:
+        _caches[model] = DocumentCache(model)
+    return _caches[model]
+
+
+def cache_stats() -> dict[str, dict[str, Any]]:
+    """Hit/miss counters per collection, for tuning TTLs."""
+    return {
+        model.get_collection_name(): cache.stats() for model, cache in _caches.items()
+    }
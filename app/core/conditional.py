@@ -0,0 +1,115 @@
+"""
+Conditional GET (RFC 9110 section 13.1) for document reads.
+
+ETags are derived from the revision id, which every write path renews on
+revisioned models (Task, Project, User: save hooks, atomic_update and the
+bulk writes) and which cached copies keep. Documents without one fall back
+to `updatedAt` at the millisecond precision Mongo stores, where two writes
+in the same millisecond share an ETag. Last-Modified is always `updatedAt`.
+
+A single document gets a strong ETag and Last-Modified. A list page gets a
+weak ETag over its documents' ids and versions plus the next cursor: it
+changes whenever the page would, but is not a hash of the response bytes.
+Both can be computed from a DocVersion projection, so a 304 never loads or
+serializes the full documents.
+"""
+
+import hashlib
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Protocol
+from uuid import UUID
+
+from fastapi import Request, Response, status
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Clients may reuse a response but must revalidate it first.
+_CACHE_CONTROL = "private, no-cache"
+
+
+class Versioned(Protocol):
+    """A model or DocVersion projection."""
+
+    @property
+    def id(self) -> object: ...
+
+    @property
+    def updated_at(self) -> datetime: ...
+
+    @property
+    def revision_id(self) -> UUID | None: ...
+
+
+def _utc(ts: datetime) -> datetime:
+    # The driver returns naive UTC datetimes unless tz_aware is set.
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC)
+
+
+def _version(doc: Versioned) -> str:
+    if doc.revision_id is not None:
+        return doc.revision_id.hex
+    return format((_utc(doc.updated_at) - _EPOCH) // timedelta(milliseconds=1), "x")
+
+
+def document_validators(doc: Versioned) -> dict[str, str]:
+    """ETag, Last-Modified and Cache-Control headers for one document."""
+    return {
+        "ETag": f'"{_version(doc)}"',
+        "Last-Modified": format_datetime(_utc(doc.updated_at), usegmt=True),
+        "Cache-Control": _CACHE_CONTROL,
+    }
+
+
+def page_validators(
+    docs: Iterable[Versioned], next_cursor: str | None
+) -> dict[str, str]:
+    """Weak ETag and Cache-Control headers for one list page."""
+    digest = hashlib.blake2b(digest_size=12)
+    for doc in docs:
+        digest.update(f"{doc.id}:{_version(doc)};".encode())
+    digest.update((next_cursor or "").encode())
+    return {"ETag": f'W/"{digest.hexdigest()}"', "Cache-Control": _CACHE_CONTROL}
+
+
+def is_conditional(request: Request) -> bool:
+    headers = request.headers
+    return "if-none-match" in headers or "if-modified-since" in headers
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as required for If-None-Match.
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def _parse_http_date(value: str) -> datetime | None:
+    try:
+        return _utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_not_modified(request: Request, validators: dict[str, str]) -> bool:
+    """
+    Whether the client's copy is current. If-None-Match takes precedence;
+    If-Modified-Since is only looked at without it, and at the one-second
+    precision of HTTP dates.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, validators["ETag"])
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = validators.get("Last-Modified")
+    if if_modified_since is None or last_modified is None:
+        return False
+    since = _parse_http_date(if_modified_since)
+    modified = _parse_http_date(last_modified)
+    return since is not None and modified is not None and modified <= since
+
+
+def not_modified(validators: dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators)
@@ -34,6 +34,38 @@ class Settings(BaseSettings):
     app_scalar_url: str = Field("/scalar", alias="APP_SCALARA_URL")
     app_openapi_url: str = Field("/openapi.json", alias="APP_OPENAPI_URL")
 
+    # Serving (see app/server.py). "development" runs one uvicorn process
+    # (with APP_RELOAD); "production" runs gunicorn with uvicorn workers.
+    # Mongo/Redis pools are per worker: size them per process.
+    server_mode: Literal["development", "production"] = Field(
+        "development", alias="SERVER_MODE"
+    )
+    # 0 = one worker per CPU core available to the process.
+    server_workers: int = Field(0, alias="SERVER_WORKERS")
+    server_loop: Literal["auto", "asyncio", "uvloop"] = Field(
+        "uvloop", alias="SERVER_LOOP"
+    )
+    server_http: Literal["auto", "h11", "httptools"] = Field(
+        "httptools", alias="SERVER_HTTP"
+    )
+    server_backlog: int = Field(2048, alias="SERVER_BACKLOG")
+    # Keep above the load balancer's idle timeout, so the balancer never
+    # reuses a connection the worker is closing.
+    server_keepalive_seconds: int = Field(65, alias="SERVER_KEEPALIVE_SECONDS")
+    # Recycle a worker after this many requests (0 = never), staggered by up
+    # to the jitter so workers do not restart together.
+    server_max_requests: int = Field(10000, alias="SERVER_MAX_REQUESTS")
+    server_max_requests_jitter: int = Field(1000, alias="SERVER_MAX_REQUESTS_JITTER")
+    server_graceful_timeout_seconds: int = Field(
+        30, alias="SERVER_GRACEFUL_TIMEOUT_SECONDS"
+    )
+    server_worker_timeout_seconds: int = Field(
+        60, alias="SERVER_WORKER_TIMEOUT_SECONDS"
+    )
+    # Import the app once in the master so workers share its memory
+    # copy-on-write; workers still open their own connections in the lifespan.
+    server_preload: bool = Field(True, alias="SERVER_PRELOAD")
+
     # Security settings
     security_secret_key: str = Field(
         "change-me-in-production", alias="SECURITY_SECRET_KEY"
@@ -50,6 +82,54 @@ class Settings(BaseSettings):
     database_user: str = Field("todo_user", alias="DATABASE_USER")
     database_password: str = Field("change-me-in-production", alias="DATABASE_PASSWORD")
     database_auth_source: str = Field("admin", alias="DATABASE_AUTH_SOURCE")
+    database_bulk_chunk_size: int = Field(1000, alias="DATABASE_BULK_CHUNK_SIZE")
+    export_batch_size: int = Field(1000, alias="EXPORT_BATCH_SIZE")
+
+    # Mongo client pool / wire settings
+    database_max_pool_size: int = Field(100, alias="DATABASE_MAX_POOL_SIZE")
+    database_min_pool_size: int = Field(0, alias="DATABASE_MIN_POOL_SIZE")
+    database_max_idle_time_ms: int | None = Field(
+        None, alias="DATABASE_MAX_IDLE_TIME_MS"
+    )
+    database_wait_queue_timeout_ms: int | None = Field(
+        None, alias="DATABASE_WAIT_QUEUE_TIMEOUT_MS"
+    )
+    database_server_selection_timeout_ms: int = Field(
+        30_000, alias="DATABASE_SERVER_SELECTION_TIMEOUT_MS"
+    )
+    # Comma separated, in order of preference: zstd, snappy, zlib
+    database_compressors: str = Field("", alias="DATABASE_COMPRESSORS")
+
+    # Mongo read routing and durability. Point reads and writes always go to
+    # the primary (as do counter rebuilds); list, export and search reads use
+    # DATABASE_LIST_READ_PREFERENCE.
+    database_list_read_preference: str = Field(
+        "primary", alias="DATABASE_LIST_READ_PREFERENCE"
+    )
+    database_read_concern: str | None = Field(None, alias="DATABASE_READ_CONCERN")
+    database_write_concern: str | None = Field(None, alias="DATABASE_WRITE_CONCERN")
+    database_write_journal: bool | None = Field(None, alias="DATABASE_WRITE_JOURNAL")
+    # Per-collection overrides of the four settings above, as JSON keyed by
+    # collection name and setting name without the prefix (see .env.example)
+    database_collection_options: dict[str, dict[str, str]] = Field(
+        default_factory=dict, alias="DATABASE_COLLECTION_OPTIONS"
+    )
+    # Create/verify the model indexes at startup. Turn off in production and
+    # run `python -m app.jobs.migrate_indexes` on deploy instead.
+    database_build_indexes: bool = Field(True, alias="DATABASE_BUILD_INDEXES")
+
+    # Audit sink settings (buffered, batched audit writes)
+    audit_batch_size: int = Field(500, alias="AUDIT_BATCH_SIZE")
+    audit_flush_interval_seconds: float = Field(
+        1.0, alias="AUDIT_FLUSH_INTERVAL_SECONDS"
+    )
+    audit_queue_max: int = Field(10_000, alias="AUDIT_QUEUE_MAX")
+    audit_spill_path: str | None = Field(None, alias="AUDIT_SPILL_PATH")
+    # "timeseries" only applies when the audit collection is first created
+    audit_storage_mode: Literal["standard", "timeseries"] = Field(
+        "standard", alias="AUDIT_STORAGE_MODE"
+    )
+    audit_retention_days: int | None = Field(None, alias="AUDIT_RETENTION_DAYS")
 
     # Redis settings
     redis_host: str = Field("localhost", alias="REDIS_HOST")
@@ -66,16 +146,100 @@ class Settings(BaseSettings):
     )
     redis_decode_responses: bool = Field(True, alias="REDIS_DECODE_RESPONSES")
 
+    # Session cache settings (in-process tier in front of the session hash)
+    session_cache_enabled: bool = Field(True, alias="SESSION_CACHE_ENABLED")
+    session_cache_max_entries: int = Field(10_000, alias="SESSION_CACHE_MAX_ENTRIES")
+    session_cache_ttl_seconds: float = Field(5.0, alias="SESSION_CACHE_TTL_SECONDS")
+    session_cache_channel: str = Field(
+        "session:invalidate", alias="SESSION_CACHE_CHANNEL"
+    )
+
+    # Document cache settings (Redis read-through cache for repository get())
+    cache_enabled: bool = Field(False, alias="CACHE_ENABLED")
+    cache_ttl_seconds: int = Field(300, alias="CACHE_TTL_SECONDS")
+    cache_negative_ttl_seconds: int = Field(30, alias="CACHE_NEGATIVE_TTL_SECONDS")
+    cache_key_version: str = Field("v1", alias="CACHE_KEY_VERSION")
+
+    # Search result cache settings (in-process, per worker; 0 TTL disables)
+    search_cache_max_entries: int = Field(1024, alias="SEARCH_CACHE_MAX_ENTRIES")
+    search_cache_ttl_seconds: float = Field(30.0, alias="SEARCH_CACHE_TTL_SECONDS")
+
+    # Health probes: dependencies are pinged in the background on this
+    # interval and /readyz serves the cached result.
+    health_probe_interval_seconds: float = Field(
+        5.0, alias="HEALTH_PROBE_INTERVAL_SECONDS"
+    )
+    health_probe_timeout_seconds: float = Field(
+        2.0, alias="HEALTH_PROBE_TIMEOUT_SECONDS"
+    )
+
+    # Prometheus metrics at /metrics, plus Mongo/Redis command timing
+    metrics_enabled: bool = Field(True, alias="METRICS_ENABLED")
+    # With several worker processes (SERVER_MODE=production) each worker
+    # snapshots its metrics here and /metrics serves the sum over workers.
+    # Created automatically in production mode when unset.
+    metrics_multiprocess_dir: str = Field("", alias="METRICS_MULTIPROCESS_DIR")
+    metrics_snapshot_interval_seconds: float = Field(
+        5.0, alias="METRICS_SNAPSHOT_INTERVAL_SECONDS"
+    )
+
+    # On-demand request profiling (see app/core/profiling.py). Off unless a
+    # sample rate or a token for the X-Profile header is set.
+    profiling_sample_rate: float = Field(0.0, alias="PROFILING_SAMPLE_RATE")
+    profiling_token: str | None = Field(None, alias="PROFILING_TOKEN")
+    profiling_dir: str = Field("profiles", alias="PROFILING_DIR")
+    profiling_max_files: int = Field(200, alias="PROFILING_MAX_FILES")
+
+    # Per-client rate limiting (token bucket in Redis), keyed by user or IP
+    # and route. Overrides are JSON keyed by route template, e.g.
+    # {"/export/{collection}": [0.2, 2]} for [rate, burst].
+    rate_limit_enabled: bool = Field(False, alias="RATE_LIMIT_ENABLED")
+    rate_limit_per_second: float = Field(20.0, alias="RATE_LIMIT_PER_SECOND")
+    rate_limit_burst: int = Field(40, alias="RATE_LIMIT_BURST")
+    rate_limit_route_overrides: dict[str, tuple[float, int]] = Field(
+        default_factory=dict, alias="RATE_LIMIT_ROUTE_OVERRIDES"
+    )
+    # Key anonymous clients by the first X-Forwarded-For hop; only behind a
+    # proxy that sets it.
+    rate_limit_trust_forwarded: bool = Field(False, alias="RATE_LIMIT_TRUST_FORWARDED")
+
+    # Adaptive concurrency limit: requests beyond it queue briefly and are
+    # shed with 503 once the queue is full or the wait exceeds the timeout.
+    # The limit shrinks while the Mongo pool wait exceeds the target.
+    admission_enabled: bool = Field(False, alias="ADMISSION_ENABLED")
+    admission_max_concurrency: int = Field(200, alias="ADMISSION_MAX_CONCURRENCY")
+    admission_min_concurrency: int = Field(10, alias="ADMISSION_MIN_CONCURRENCY")
+    admission_max_queue: int = Field(100, alias="ADMISSION_MAX_QUEUE")
+    admission_queue_timeout_seconds: float = Field(
+        0.5, alias="ADMISSION_QUEUE_TIMEOUT_SECONDS"
+    )
+    admission_pool_wait_target_seconds: float = Field(
+        0.01, alias="ADMISSION_POOL_WAIT_TARGET_SECONDS"
+    )
+
+    # Startup: Mongo and Redis are awaited concurrently, each retried with
+    # jittered exponential backoff.
+    startup_wait_attempts: int = Field(20, alias="STARTUP_WAIT_ATTEMPTS")
+    startup_backoff_base_seconds: float = Field(
+        0.05, alias="STARTUP_BACKOFF_BASE_SECONDS"
+    )
+    startup_backoff_max_seconds: float = Field(2.0, alias="STARTUP_BACKOFF_MAX_SECONDS")
+
     # Logger settings
-    log_level: Literal[
-        "trace", "debug", "info", "warning", "error", "critical"
-    ] = Field("debug", alias="LOG_LEVEL")
+    log_level: Literal["trace", "debug", "info", "warning", "error", "critical"] = (
+        Field("debug", alias="LOG_LEVEL")
+    )
     log_format: Literal["text", "json", "csv"] = Field("text", alias="LOG_FORMAT")
     log_file: str = Field("/var/log/app.log", alias="LOG_FILE")
     log_retention: str = Field("7d", alias="LOG_RETENTION")
     log_rotation: str = Field("1d", alias="LOG_ROTATION")
     log_date_format: str = Field("%Y-%m-%d %H:%M:%S", alias="LOG_DATE_FORMAT")
     log_handlers_raw: str = Field("console,file", alias="LOG_HANDLERS")
+    log_compress: bool = Field(True, alias="LOG_COMPRESS")
+    log_queue_size: int = Field(10_000, alias="LOG_QUEUE_SIZE")
+    log_queue_full_policy: Literal["drop", "block"] = Field(
+        "drop", alias="LOG_QUEUE_FULL_POLICY"
+    )
 
     @computed_field(return_type=str)
     def mongodb_uri(self) -> str:
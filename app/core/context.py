@@ -0,0 +1,26 @@
+from collections.abc import MutableMapping
+from contextvars import ContextVar
+from typing import Any
+
+# Request-scoped values read by the log formatters. They are set by
+# RequestContextMiddleware (app/core/middleware.py) for every HTTP request.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+user_var: ContextVar[str | None] = ContextVar("user", default=None)
+# The ASGI scope itself, so the matched route template can be resolved lazily
+# (the router only records it after the middleware has run).
+scope_var: ContextVar[MutableMapping[str, Any] | None] = ContextVar(
+    "scope", default=None
+)
+
+
+def bind_user(username: str | None) -> None:
+    """Attach the authenticated user to the current request context."""
+    user_var.set(username)
+
+
+def current_route() -> str | None:
+    scope = scope_var.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path")
@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.mongo import get_client, mongo_pool_stats
+from app.core.redis import get_redis, redis_pool_stats
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class AppInfo:
+    """Settings the probes report, read once so requests never touch disk."""
+
+    config_source: str
+    app_name: str
+    version: str
+
+
+APP_INFO = AppInfo(
+    # A computed field: a str at runtime, a method to the type checker.
+    config_source=str(settings.config_source),
+    app_name=settings.app_name,
+    version=settings.app_version,
+)
+
+
+def _dumps(payload: dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+HEALTH_BODY = _dumps({"status": "healthy", **asdict(APP_INFO)})
+LIVE_BODY = _dumps({"status": "alive", "version": APP_INFO.version})
+_STARTING_BODY = _dumps({"status": "starting"})
+_STALE_BODY = _dumps({"status": "stale"})
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    ok: bool
+    latency_ms: float | None
+    error: str | None = None
+
+
+class HealthProber:
+    """
+    Pings Mongo and Redis every `interval` seconds in the background and keeps
+    the last result as a pre-serialized /readyz body, so probe traffic costs
+    one dict lookup and never reaches the databases. A result older than
+    `stale_after` (the prober itself is stuck) reads as not ready.
+    """
+
+    def __init__(
+        self, *, interval: float | None = None, timeout: float | None = None
+    ) -> None:
+        self.interval = interval or settings.health_probe_interval_seconds
+        self.timeout = timeout or settings.health_probe_timeout_seconds
+        self.stale_after = 3 * self.interval + self.timeout
+        self._task: asyncio.Task[None] | None = None
+        self._checked_at = 0.0
+        self._ready = False
+        self._body = _STARTING_BODY
+
+    def snapshot(self) -> tuple[bool, bytes]:
+        """(ready, serialized body) as of the last probe."""
+        if time.monotonic() - self._checked_at > self.stale_after:
+            return False, _STALE_BODY
+        return self._ready, self._body
+
+    async def start(self) -> None:
+        await self.probe()
+        self._task = asyncio.create_task(self._run(), name="health-prober")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.probe()
+            except Exception as e:  # keep probing whatever happens
+                logger.error("Health probe failed: %s", e)
+
+    async def _timed(self, check: Callable[[], Awaitable[Any]]) -> ProbeResult:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(check(), self.timeout)
+        except Exception as e:
+            return ProbeResult(ok=False, latency_ms=None, error=repr(e))
+        return ProbeResult(
+            ok=True, latency_ms=round((time.perf_counter() - start) * 1000, 3)
+        )
+
+    async def _ping_mongo(self) -> None:
+        client = get_client()
+        if client is None:
+            raise RuntimeError("Mongo client not initialized")
+        await client.admin.command("ping")
+
+    async def _ping_redis(self) -> None:
+        await get_redis().ping()
+
+    async def probe(self) -> None:
+        mongo, redis = await asyncio.gather(
+            self._timed(self._ping_mongo), self._timed(self._ping_redis)
+        )
+        ready = mongo.ok and redis.ok
+        body = {
+            "status": "ready" if ready else "unavailable",
+            "version": APP_INFO.version,
+            "checks": {
+                "mongo": {**asdict(mongo), "pool": _mongo_pool()},
+                "redis": {**asdict(redis), "pool": _redis_pool()},
+            },
+        }
+        if ready != self._ready:
+            logger.info("Readiness changed to %s", body["status"])
+        self._ready = ready
+        self._body = _dumps(body)
+        self._checked_at = time.monotonic()
+
+
+def _saturation(in_use: int, size: int | None) -> float | None:
+    return round(in_use / size, 3) if size else None
+
+
+def _mongo_pool() -> dict[str, Any]:
+    stats = mongo_pool_stats()
+    size = settings.database_max_pool_size
+    return {
+        "in_use": stats["in_use"],
+        "max_size": size,
+        "saturation": _saturation(stats["in_use"], size),
+        "wait_seconds_avg": stats["wait_seconds_avg"],
+        "checkout_failures": stats["failures"],
+    }
+
+
+def _redis_pool() -> dict[str, Any]:
+    stats = redis_pool_stats()
+    if not stats:
+        return {}
+    return {
+        "in_use": stats["in_use"],
+        "max_size": stats["max_size"],
+        "saturation": _saturation(stats["in_use"], stats["max_size"]),
+    }
+
+
+_prober: HealthProber | None = None
+
+
+def readiness() -> tuple[bool, bytes]:
+    """Cached readiness for /readyz; not ready outside health_lifespan."""
+    if _prober is None:
+        return False, _STARTING_BODY
+    return _prober.snapshot()
+
+
+@asynccontextmanager
+async def health_lifespan() -> AsyncIterator[None]:
+    """
+    Run the background prober. Must run inside redis_lifespan and
+    beanie_lifespan.
+    """
+    global _prober
+    _prober = HealthProber()
+    await _prober.start()
+    try:
+        yield
+    finally:
+        await _prober.stop()
+        _prober = None
@@ -1,10 +1,34 @@
+import atexit
+import copy
 import csv
+import gzip
 import json
 import logging
+import os
+import queue
+import shutil
 import sys
+import threading
+import time
+from collections.abc import Callable, Sequence
 from io import StringIO
+from logging.handlers import (
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+    TimedRotatingFileHandler,
+    WatchedFileHandler,
+)
+from operator import attrgetter
+from typing import Any, cast
 
 from app.core.config import settings
+from app.core.context import current_route, request_id_var, user_var
+
+try:  # optional, much faster JSON encoding
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
 
 
 # Custom logging formatters
@@ -21,36 +45,267 @@ class JSONFormatter(logging.Formatter):
 class CSVFormatter(logging.Formatter):
     def __init__(self, fmt: str | None = None, datefmt: str | None = None) -> None:
         super().__init__(fmt, datefmt)
-        self.output = StringIO()
-        self.writer = csv.writer(self.output)
+        # One buffer per thread: a shared StringIO interleaves rows when two
+        # threads format at once.
+        self._local = threading.local()
 
     def format(self, record: logging.LogRecord) -> str:
-        self.output.seek(0)
-        self.output.truncate(0)
-        self.writer.writerow(
+        local = self._local
+        if not hasattr(local, "writer"):
+            local.output = StringIO()
+            local.writer = csv.writer(local.output)
+        local.output.seek(0)
+        local.output.truncate(0)
+        local.writer.writerow(
             [
                 self.formatTime(record, self.datefmt),
                 record.levelname,
                 record.getMessage(),
             ]
         )
-        return self.output.getvalue().strip()
+        return str(local.output.getvalue().strip())
 
 
-def get_logger(name: str | None = None) -> logging.Logger:
+# Attributes every LogRecord has; anything else on a record came from `extra`.
+_RECORD_ATTRS = frozenset(
+    [
+        *vars(logging.LogRecord("", 0, "", 0, "", None, None)),
+        *("message", "asctime", "request_id", "user", "route"),
+    ]
+)
+
+
+# Reused across records; json.dumps() with any options builds a new encoder
+# per call.
+_json_encoder = json.JSONEncoder(default=str, separators=(",", ":"))
+
+
+def _context_value(
+    name: str, fallback: Callable[[], str | None]
+) -> Callable[[logging.LogRecord], Any]:
+    # Records that went through the queue carry the request context captured
+    # by RequestContextFilter; records formatted in place read the contextvars.
+    def get(record: logging.LogRecord) -> Any:
+        value = getattr(record, name, None)
+        return value if value is not None else fallback()
+
+    return get
+
+
+class StructuredFormatter(logging.Formatter):
     """
-    Initialize logging based on configuration in settings and return a logger.
-    Supports text, json, and csv formats and console and file handlers.
+    Single-line JSON formatter with request context, `extra` fields and
+    exception text.
 
-    Args:
-        name: The name for the logger. If None, returns the root logger.
+    The selected fields are resolved into a list of getters once, so format()
+    only evaluates what is emitted. orjson is used when installed.
+    """
 
-    Returns:
-        logging.Logger: A configured logger instance
+    DEFAULT_FIELDS = (
+        "time",
+        "level",
+        "logger",
+        "message",
+        "request_id",
+        "user",
+        "route",
+    )
+
+    def __init__(
+        self, fields: Sequence[str] | None = None, datefmt: str | None = None
+    ) -> None:
+        super().__init__(datefmt=datefmt)
+        getters: dict[str, Callable[[logging.LogRecord], Any]] = {
+            "time": self._format_time,
+            "level": attrgetter("levelname"),
+            "logger": attrgetter("name"),
+            "message": logging.LogRecord.getMessage,
+            "module": attrgetter("module"),
+            "function": attrgetter("funcName"),
+            "line": attrgetter("lineno"),
+            "process": attrgetter("process"),
+            "thread": attrgetter("threadName"),
+            "request_id": _context_value("request_id", request_id_var.get),
+            "user": _context_value("user", user_var.get),
+            "route": _context_value("route", current_route),
+        }
+        unknown = set(fields or ()) - getters.keys()
+        if unknown:
+            raise ValueError(f"Unknown log fields: {sorted(unknown)}")
+        self._fields = [(name, getters[name]) for name in fields or self.DEFAULT_FIELDS]
+        self._last_second = -1
+        self._last_stamp = ""
+
+    def _format_time(self, record: logging.LogRecord) -> str:
+        # strftime is the most expensive part of a record; reuse it within a
+        # second. Only ever called from one thread (the queue listener).
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_stamp = time.strftime(
+                self.datefmt or self.default_time_format, self.converter(second)
+            )
+            self._last_second = second
+        return f"{self._last_stamp}.{int(record.msecs):03d}"
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: dict[str, Any] = {}
+        for name, get in self._fields:
+            value = get(record)
+            if value is not None:
+                out[name] = value
+
+        attrs = vars(record)
+        extra_keys = attrs.keys() - _RECORD_ATTRS
+        if extra_keys:
+            out["extra"] = {k: attrs[k] for k in extra_keys}
+        if record.exc_info:
+            out["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc_info"] = record.exc_text
+        if record.stack_info:
+            out["stack_info"] = record.stack_info
+
+        if orjson is not None:
+            return str(orjson.dumps(out, default=str).decode())
+        return _json_encoder.encode(out)
+
+
+class RequestContextFilter(logging.Filter):
+    """Copy the request contextvars onto the record before it leaves the thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.user = user_var.get()
+        record.route = current_route()
+        return True
+
+
+_exc_formatter = logging.Formatter()
+
+
+class _BoundedQueueHandler(QueueHandler):
     """
-    # Remove existing handlers
-    for handler in logging.root.handlers[:]:
-        logging.root.removeHandler(handler)
+    QueueHandler for a bounded queue. When the queue is full the record is
+    either dropped (and counted) or the caller blocks, per LOG_QUEUE_FULL_POLICY.
+    """
+
+    def __init__(
+        self, log_queue: "queue.Queue[logging.LogRecord]", block: bool
+    ) -> None:
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Like QueueHandler.prepare, but keeps the traceback as exc_text for the
+        # listener's formatter instead of folding it into the message.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # `queue` is the only reference to the queue, so swapping it after a
+        # fork redirects every record; QueueHandler types it put_nowait()-only.
+        log_queue = cast("queue.Queue[logging.LogRecord]", self.queue)
+        if self.block:
+            log_queue.put(record)
+            return
+        try:
+            log_queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_SIZE_UNITS = {"kb": 1024, "mb": 1024**2, "gb": 1024**3, "b": 1}
+
+
+def _parse_size(value: str) -> int | None:
+    """'100MB' -> bytes; None when `value` is not a size (e.g. '1d')."""
+    value = value.strip().lower()
+    for unit, factor in _SIZE_UNITS.items():
+        if value.endswith(unit) and value[: -len(unit)].strip().isdigit():
+            return int(value[: -len(unit)]) * factor
+    return None
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """
+    Gzip the finished log file into `dest`. This runs on the listener thread,
+    so it never blocks a log call, and finishing before the next rollover
+    keeps the handler's backupCount renames and deletions exact.
+    """
+    partial = f"{dest}.part"
+    try:
+        with open(source, "rb") as src, gzip.open(partial, "wb") as out:
+            shutil.copyfileobj(src, out)
+        os.replace(partial, dest)
+        os.remove(source)
+    except OSError as e:
+        sys.stderr.write(f"Log compression of {source} failed: {e}\n")
+
+
+def _build_file_handler() -> logging.Handler:
+    if getattr(settings, "server_mode", "") == "production":
+        # Every gunicorn worker appends to the same file; rotating it in
+        # process would have each worker rotate it on its own. Reopen the
+        # file when it is moved instead, and leave rotation to logrotate.
+        return WatchedFileHandler(settings.log_file)
+
+    backup_count = 7  # default retention
+    if hasattr(settings, "log_retention") and settings.log_retention:
+        try:
+            backup_count = int(settings.log_retention.rstrip("dDhH"))
+        except Exception:
+            backup_count = 7
+
+    rotation = getattr(settings, "log_rotation", "") or ""
+    max_bytes = _parse_size(rotation)
+    handler: RotatingFileHandler | TimedRotatingFileHandler
+    if max_bytes is not None:
+        handler = RotatingFileHandler(
+            settings.log_file, maxBytes=max_bytes, backupCount=backup_count
+        )
+    else:
+        rotation_when = "d"  # daily rotation by default
+        if "h" in rotation.lower():
+            rotation_when = "h"
+        handler = TimedRotatingFileHandler(
+            settings.log_file,
+            when=rotation_when,
+            interval=1,
+            backupCount=backup_count,
+        )
+
+    if getattr(settings, "log_compress", False):
+        handler.namer = _gzip_namer
+        handler.rotator = _gzip_rotator
+    return handler
+
+
+_listener: QueueListener | None = None
+_queue_handler: _BoundedQueueHandler | None = None
+
+
+def configure_logging() -> None:
+    """
+    Configure the root logger once for the process.
+
+    Formatting and all handler I/O (console, file, rotation) run on a
+    QueueListener thread; the root logger only gets a QueueHandler, so a log
+    call on the event loop costs an enqueue. Calling this again is a no-op.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
 
     # Determine log level (convert to uppercase for logging module)
     log_level = getattr(logging, settings.log_level.upper(), logging.DEBUG)
@@ -63,7 +318,7 @@ def get_logger(name: str | None = None) -> logging.Logger:
         formatter = CSVFormatter(datefmt=settings.log_date_format)
 
     elif settings.log_format == "json":
-        formatter = JSONFormatter(datefmt=settings.log_date_format)
+        formatter = StructuredFormatter(datefmt=settings.log_date_format)
 
     else:  # default to text formatting
         formatter = logging.Formatter(
@@ -85,43 +340,27 @@ def get_logger(name: str | None = None) -> logging.Logger:
         log_handlers = handlers_attr if handlers_attr is not None else ["console"]
 
     if "console" in log_handlers:
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        handlers.append(console_handler)
+        handlers.append(logging.StreamHandler(sys.stdout))
     if "file" in log_handlers:
-        from logging.handlers import TimedRotatingFileHandler
-
-        rotation_when = "d"  # daily rotation by default
-        rotation_interval = 1
-        backup_count = 7  # default retention
-
-        if hasattr(settings, "log_rotation") and settings.log_rotation:
-            if "h" in settings.log_rotation.lower():
-                rotation_when = "h"
-            elif "d" in settings.log_rotation.lower():
-                rotation_when = "d"
-
-        if hasattr(settings, "log_retention") and settings.log_retention:
-            try:
-                backup_count = int(settings.log_retention.rstrip("dDhH"))
-            except Exception:
-                backup_count = 7
-
-        file_handler = TimedRotatingFileHandler(
-            settings.log_file,
-            when=rotation_when,
-            interval=rotation_interval,
-            backupCount=backup_count,
-        )
-        file_handler.setFormatter(formatter)
-        handlers.append(file_handler)
-
-    # Attach handlers to the root logger
+        handlers.append(_build_file_handler())
     for handler in handlers:
-        logging.root.addHandler(handler)
+        handler.setFormatter(formatter)
 
-    # Get the requested logger
-    logger = logging.getLogger(name)
+    # Remove existing handlers
+    for handler in logging.root.handlers[:]:
+        logging.root.removeHandler(handler)
+
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(
+        maxsize=getattr(settings, "log_queue_size", 0)
+    )
+    _queue_handler = _BoundedQueueHandler(
+        log_queue, block=getattr(settings, "log_queue_full_policy", "") == "block"
+    )
+    _queue_handler.addFilter(RequestContextFilter())
+    logging.root.addHandler(_queue_handler)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
 
     # Log an initialization message
     logging.getLogger(__name__).info(
@@ -130,4 +369,58 @@ def get_logger(name: str | None = None) -> logging.Logger:
         settings.log_level,
     )
 
-    return logger
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    if _queue_handler is not None:
+        logging.root.removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
+
+
+def _restart_after_fork() -> None:
+    """
+    Threads do not survive fork(): a worker forked from a master that already
+    configured logging (preloaded app) would enqueue records nobody drains.
+    Give the child its own queue and listener over the same handlers.
+    """
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(
+        maxsize=getattr(settings, "log_queue_size", 0)
+    )
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(
+        log_queue, *_listener.handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def dropped_log_records() -> int:
+    """Records dropped because the log queue was full (drop policy only)."""
+    return _queue_handler.dropped if _queue_handler is not None else 0
+
+
+def get_logger(name: str | None = None) -> logging.Logger:
+    """
+    Return a logger, configuring logging on first use.
+    Supports text, json, and csv formats and console and file handlers.
+
+    Args:
+        name: The name for the logger. If None, returns the root logger.
+
+    Returns:
+        logging.Logger: A configured logger instance
+    """
+    configure_logging()
+    return logging.getLogger(name)
@@ -0,0 +1,391 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+Updates never take a lock: every thread writes to its own cells (the event
+loop, and the driver threads pymongo publishes command events on), and a
+scrape adds the per-thread cells up. A lock is only taken the first time a
+thread touches a metric, to register its cells.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import threading
+from bisect import bisect_left
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
+from contextlib import asynccontextmanager, suppress
+from typing import Any
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Labels = tuple[str, ...]
+
+# Seconds; the Prometheus client defaults.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_registry: dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _label_text(names: Labels, values: Labels, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _add(totals: dict[Labels, Any], labels: Labels, value: Any) -> None:
+    """Add a sample value (a number, or a histogram cell) into `totals`."""
+    if isinstance(value, list):
+        total = totals.setdefault(labels, [0] * len(value))
+        for i, part in enumerate(value):
+            total[i] += part
+    else:
+        totals[labels] = totals.get(labels, 0.0) + value
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        with _registry_lock:
+            if name in _registry:
+                raise ValueError(f"Metric {name!r} already registered")
+            _registry[name] = self
+
+    def collect(self) -> dict[Labels, Any]:
+        """Current value per label set, in the shape samples() renders."""
+        raise NotImplementedError
+
+    def samples(self, values: Mapping[Labels, Any]) -> Iterable[str]:
+        for labels, value in sorted(values.items()):
+            yield f"{self.name}{_label_text(self.labelnames, labels)} {_number(value)}"
+
+    def render(self, values: Mapping[Labels, Any] | None = None) -> str:
+        if values is None:
+            values = self.collect()
+        header = f"# HELP {self.name} {self.help}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(f"{line}\n" for line in self.samples(values))
+
+
+class _Sharded(_Metric):
+    def __init__(self, name: str, help: str, labelnames: Labels = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._local = threading.local()
+        self._shards: list[dict[Labels, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _cells(self) -> dict[Labels, Any]:
+        try:
+            cells: dict[Labels, Any] = self._local.cells
+        except AttributeError:
+            cells = self._local.cells = {}
+            with self._shards_lock:
+                self._shards.append(cells)
+        return cells
+
+    def _snapshot(self) -> list[dict[Labels, Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() is atomic under the GIL, so a writer adding a label
+        # set concurrently cannot break the iteration below.
+        return [shard.copy() for shard in shards]
+
+
+class Counter(_Sharded):
+    """Monotonic count, e.g. requests or errors."""
+
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        cells = self._cells()
+        cells[labels] = cells.get(labels, 0.0) + amount
+
+    def values(self) -> dict[Labels, float]:
+        totals: dict[Labels, float] = {}
+        for shard in self._snapshot():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def collect(self) -> dict[Labels, Any]:
+        return dict(self.values())
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. requests in flight."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(_Sharded):
+    """Distribution of observations (latencies) over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        cells = self._cells()
+        cell = cells.get(labels)
+        if cell is None:
+            # One count per bucket plus +Inf, then the sum.
+            cell = cells[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    def collect(self) -> dict[Labels, Any]:
+        merged: dict[Labels, Any] = {}
+        for shard in self._snapshot():
+            for labels, cell in shard.items():
+                _add(merged, labels, cell)
+        return merged
+
+    def samples(self, values: Mapping[Labels, Any]) -> Iterable[str]:
+        for labels, cell in sorted(values.items()):
+            cumulative = 0.0
+            for bound, count in zip([*self.buckets, float("inf")], cell, strict=False):
+                cumulative += count
+                le = _label_text(self.labelnames, labels, f'le="{_number(bound)}"')
+                yield f"{self.name}_bucket{le} {_number(cumulative)}"
+            label_text = _label_text(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_number(cell[-1])}"
+            yield f"{self.name}_count{label_text} {_number(cumulative)}"
+
+
+class CallbackMetric(_Metric):
+    """
+    Metric read from existing state at scrape time (pool and cache stats),
+    so the code it describes pays nothing extra. `read` returns one value or
+    a value per label set; None (e.g. a pool not yet opened) is left out.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        read: Callable[[], Mapping[Labels, float | None] | float | None],
+        *,
+        kind: str = "gauge",
+        labelnames: Labels = (),
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.kind = kind
+        self._read = read
+
+    def collect(self) -> dict[Labels, Any]:
+        values = self._read()
+        if not isinstance(values, Mapping):
+            values = {(): values}
+        return {labels: value for labels, value in values.items() if value is not None}
+
+
+def _collect_all() -> dict[str, dict[Labels, Any]]:
+    with _registry_lock:
+        metrics = list(_registry.values())
+    collected = {}
+    for metric in metrics:
+        try:
+            collected[metric.name] = metric.collect()
+        except Exception as e:  # one broken source must not hide the rest
+            logger.warning("Metric %s failed to collect: %s", metric.name, e)
+    return collected
+
+
+def render() -> bytes:
+    """
+    Every registered metric, in the Prometheus text format. With
+    METRICS_MULTIPROCESS_DIR set, the sum over every worker process.
+    """
+    if settings.metrics_multiprocess_dir:
+        collected = aggregate(settings.metrics_multiprocess_dir)
+    else:
+        collected = _collect_all()
+    with _registry_lock:
+        metrics = list(_registry.values())
+    parts = []
+    for metric in metrics:
+        if metric.name in collected:
+            parts.append(metric.render(collected[metric.name]))
+    return "".join(parts).encode()
+
+
+# --- Several worker processes ------------------------------------------------
+#
+# Under gunicorn each worker has its own registry, and a scrape of the shared
+# port reaches one of them at random. So every worker writes a snapshot of
+# its values to METRICS_MULTIPROCESS_DIR (periodically, on exit, and before
+# serving a scrape), and a scrape sums all snapshots. Snapshots of workers
+# that have exited are folded into one archive file, keeping their counters
+# and histograms (so totals never go backwards when a worker is recycled)
+# and dropping their gauges.
+
+_ARCHIVE = "archive.json"
+_LOCK = ".lock"
+_SUFFIX = ".json"
+
+_snapshot_file: tuple[int, str] | None = None
+
+
+def _own_snapshot(directory: str) -> str:
+    global _snapshot_file
+    pid = os.getpid()
+    if _snapshot_file is None or _snapshot_file[0] != pid:
+        # The random part keeps a recycled pid from overwriting the
+        # snapshot of an exited worker before it is archived.
+        _snapshot_file = (pid, f"{pid}-{uuid4().hex[:8]}{_SUFFIX}")
+    return os.path.join(directory, _snapshot_file[1])
+
+
+def _dump(path: str, collected: Mapping[str, Mapping[Labels, Any]]) -> None:
+    rows = {
+        name: [[list(k), v] for k, v in values.items()]
+        for name, values in collected.items()
+    }
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(rows, f)
+    os.replace(tmp, path)  # readers never see a partial snapshot
+
+
+def _load(path: str) -> dict[str, dict[Labels, Any]]:
+    try:
+        with open(path) as f:
+            rows = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        logger.warning("Skipping unreadable metrics snapshot %s: %s", path, e)
+        return {}
+    return {
+        name: {tuple(labels): value for labels, value in values}
+        for name, values in rows.items()
+    }
+
+
+def _merge(
+    totals: dict[str, dict[Labels, Any]],
+    collected: Mapping[str, Mapping[Labels, Any]],
+    *,
+    cumulative_only: bool = False,
+) -> None:
+    for name, values in collected.items():
+        metric = _registry.get(name)
+        if metric is None or (cumulative_only and metric.kind == "gauge"):
+            continue
+        merged = totals.setdefault(name, {})
+        for labels, value in values.items():
+            _add(merged, labels, value)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def write_snapshot(directory: str) -> None:
+    """Write this process's current values for the other workers to read."""
+    _dump(_own_snapshot(directory), _collect_all())
+
+
+def aggregate(directory: str) -> dict[str, dict[Labels, Any]]:
+    """Values summed over this process and every snapshot in `directory`."""
+    own = _own_snapshot(directory)
+    collected = _collect_all()
+    _dump(own, collected)
+    with open(os.path.join(directory, _LOCK), "a") as lock:
+        # Serializes archiving between workers scraped at the same time.
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, _ARCHIVE)
+        archive = _load(archive_path)
+        exited = []
+        totals: dict[str, dict[Labels, Any]] = {}
+        for entry in os.scandir(directory):
+            if not entry.name.endswith(_SUFFIX) or entry.name == _ARCHIVE:
+                continue
+            if entry.path == own:
+                _merge(totals, collected)
+            elif _alive(int(entry.name.split("-", 1)[0])):
+                _merge(totals, _load(entry.path))
+            else:
+                _merge(archive, _load(entry.path), cumulative_only=True)
+                exited.append(entry.path)
+        if exited:
+            _dump(archive_path, archive)
+            for path in exited:
+                os.unlink(path)
+        _merge(totals, archive)
+    return totals
+
+
+def reset_snapshots(directory: str) -> None:
+    """Remove snapshots left by an earlier run; call before workers start."""
+    os.makedirs(directory, exist_ok=True)
+    for entry in os.scandir(directory):
+        if entry.name.endswith((_SUFFIX, f"{_SUFFIX}.tmp")):
+            os.unlink(entry.path)
+
+
+@asynccontextmanager
+async def snapshot_lifespan() -> AsyncIterator[None]:
+    """
+    Keep this worker's snapshot fresh while the app runs, and write a final
+    one on shutdown. A no-op unless METRICS_MULTIPROCESS_DIR is set.
+    """
+    directory = settings.metrics_multiprocess_dir
+    if not (settings.metrics_enabled and directory):
+        yield
+        return
+
+    async def refresh() -> None:
+        while True:
+            await asyncio.sleep(settings.metrics_snapshot_interval_seconds)
+            try:
+                await asyncio.to_thread(write_snapshot, directory)
+            except OSError as e:
+                logger.warning("Could not write metrics snapshot: %s", e)
+
+    task = asyncio.create_task(refresh())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+        write_snapshot(directory)
@@ -0,0 +1,215 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from uuid import uuid4
+
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.admission import get_limiter
+from app.core.context import current_route, request_id_var, scope_var, user_var
+from app.core.logging import get_logger
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.profiling import PROFILE_ID_HEADER, RequestProfile, wants_profile
+
+logger = get_logger(__name__)
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+
+def _request_id(scope: Scope) -> str:
+    for name, value in scope["headers"]:
+        if name == REQUEST_ID_HEADER and value:
+            return str(value.decode("latin-1"))
+    return uuid4().hex
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware that binds request id, user and route to contextvars
+    for the duration of a request and echoes the request id back in the
+    response headers. An incoming X-Request-ID is reused when present.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _request_id(scope)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        tokens = (
+            request_id_var.set(request_id),
+            user_var.set(None),
+            scope_var.set(scope),
+        )
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            scope_var.reset(tokens[2])
+            user_var.reset(tokens[1])
+            request_id_var.reset(tokens[0])
+
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to the end of its response body.",
+    ("method", "route"),
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "Completed HTTP requests.", ("method", "route", "status")
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled by a route.",
+    ("method", "route"),
+)
+
+# Route label of requests no route matched; raw paths would be unbounded.
+_UNMATCHED = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency and status per route template.
+    The template is read from the scope after the router has matched it.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or _UNMATCHED
+            labels = (scope["method"], route)
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, labels)
+            HTTP_REQUESTS.inc((*labels, str(status)))
+
+
+async def count_in_flight(request: Request) -> AsyncIterator[None]:
+    """
+    App-wide dependency counting in-flight requests per route. It runs after
+    routing, unlike middleware, so the route template is known on entry;
+    being a yield dependency, it exits once the response has been sent.
+    """
+    labels = (request.method, request.scope["route"].path)
+    HTTP_IN_FLIGHT.inc(labels)
+    try:
+        yield
+    finally:
+        HTTP_IN_FLIGHT.dec(labels)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware that profiles sampled or token-bearing requests
+    (see app/core/profiling.py) and names the profile in an X-Profile-ID
+    response header. Install inside RequestContextMiddleware, so the request
+    id is bound, and only when profiling is configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not wants_profile(scope["headers"]):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile.start(request_id_var.get() or uuid4().hex)
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER, profile.id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            summary = profile.stop()
+            summary.update(
+                method=scope["method"],
+                path=scope["path"],
+                route=current_route() or scope["path"],
+                status=status,
+            )
+            try:
+                path = await asyncio.to_thread(profile.save, summary)
+                logger.info("Request profile written to %s", path)
+            except OSError as e:
+                logger.error("Could not write request profile: %s", e)
+
+
+# Probes and scrapes must keep answering while the app sheds load.
+_ADMISSION_EXEMPT = frozenset(["/livez", "/readyz", "/health", "/metrics"])
+
+_OVERLOADED_BODY = b'{"detail":"Server overloaded, retry later"}'
+
+
+class AdmissionMiddleware:
+    """
+    Pure ASGI middleware applying the adaptive concurrency limit
+    (app/core/admission.py). Shed requests get 503 with Retry-After before
+    any routing or handler work is done.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.limiter = get_limiter()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in _ADMISSION_EXEMPT:
+            await self.app(scope, receive, send)
+            return
+
+        if not await self.limiter.acquire():
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 503,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"retry-after", b"1"),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": _OVERLOADED_BODY})
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.limiter.release()
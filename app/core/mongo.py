@@ -1,13 +1,25 @@
-import asyncio
+import importlib.util
+import threading
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any, cast
 
-from beanie import init_beanie
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from beanie import Document, init_beanie
+from motor.motor_asyncio import (
+    AsyncIOMotorClient,
+    AsyncIOMotorCollection,
+    AsyncIOMotorDatabase,
+)
+from pymongo import IndexModel, monitoring
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+from pymongo.write_concern import WriteConcern
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import Counter, Histogram
+from app.core.profiling import profiling_enabled, record_io
+from app.core.startup import wait_until_ready
 from app.models.audit import Audit
 from app.models.project import Project
 from app.models.task import Task
@@ -20,25 +32,272 @@ _database: AsyncIOMotorDatabase | None = None
 
 logger = get_logger(__name__)
 
+# Python module each wire compressor needs; pymongo only warns when missing.
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+# Seconds spent waiting for a pooled connection; upper bounds of the buckets.
+_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolWaitListener(monitoring.ConnectionPoolListener):
+    """
+    Records how long operations wait to check a connection out of the pool.
+    Sustained waits mean DATABASE_MAX_POOL_SIZE is too small for the load;
+    checkout failures mean DATABASE_WAIT_QUEUE_TIMEOUT_MS was hit.
+    Events arrive on driver threads, hence the lock.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.failures = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.buckets = [0] * (len(_WAIT_BUCKETS) + 1)
+        # Connections currently checked out, across all servers.
+        self.in_use = 0
+
+    def _record(self, duration: float | None, *, failed: bool) -> None:
+        wait = duration or 0.0
+        index = next(
+            (i for i, bound in enumerate(_WAIT_BUCKETS) if wait <= bound),
+            len(_WAIT_BUCKETS),
+        )
+        with self._lock:
+            if failed:
+                self.failures += 1
+            else:
+                self.checkouts += 1
+                self.in_use += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.buckets[index] += 1
+
+    def connection_checked_out(
+        self, event: monitoring.ConnectionCheckedOutEvent
+    ) -> None:
+        self._record(event.duration, failed=False)
+
+    def connection_check_out_failed(
+        self, event: monitoring.ConnectionCheckOutFailedEvent
+    ) -> None:
+        self._record(event.duration, failed=True)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.checkouts + self.failures
+            return {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "failures": self.failures,
+                "wait_seconds_total": self.wait_total,
+                "wait_seconds_max": self.wait_max,
+                "wait_seconds_avg": self.wait_total / total if total else 0.0,
+                "buckets": dict(
+                    zip([*map(str, _WAIT_BUCKETS), "+Inf"], self.buckets, strict=True)
+                ),
+            }
+
+    # The remaining pool events are not needed.
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None: ...
+    def pool_ready(self, event: monitoring.PoolReadyEvent) -> None: ...
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None: ...
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None: ...
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None: ...
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None: ...
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None: ...
+    def connection_check_out_started(
+        self, event: monitoring.ConnectionCheckOutStartedEvent
+    ) -> None: ...
+
+
+_pool_wait = PoolWaitListener()
+
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round trip time, as measured by the driver.",
+    ("command",),
+)
+MONGO_COMMAND_ERRORS = Counter(
+    "mongodb_command_errors_total", "MongoDB commands that failed.", ("command",)
+)
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    Feeds command latency and failures into the metrics registry, and into
+    the breakdown of the request being profiled, if any.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None: ...
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        seconds = event.duration_micros / 1e6
+        MONGO_COMMAND_SECONDS.observe(seconds, (event.command_name,))
+        record_io("mongo", seconds)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        seconds = event.duration_micros / 1e6
+        labels = (event.command_name,)
+        MONGO_COMMAND_SECONDS.observe(seconds, labels)
+        MONGO_COMMAND_ERRORS.inc(labels)
+        record_io("mongo", seconds)
+
+
+def mongo_pool_stats() -> dict[str, Any]:
+    """Connection pool checkout wait statistics of this process."""
+    return _pool_wait.stats()
+
+
+def _compressors() -> list[str]:
+    names = [c.strip() for c in settings.database_compressors.split(",") if c.strip()]
+    usable = []
+    for name in names:
+        module = _COMPRESSOR_MODULES.get(name)
+        if module is None or importlib.util.find_spec(module) is None:
+            logger.warning("Mongo compressor %r is not available, skipping", name)
+            continue
+        usable.append(name)
+    return usable
+
+
+def _client_options() -> dict[str, Any]:
+    options: dict[str, Any] = {
+        "maxPoolSize": settings.database_max_pool_size,
+        "minPoolSize": settings.database_min_pool_size,
+        "serverSelectionTimeoutMS": settings.database_server_selection_timeout_ms,
+        "event_listeners": [_pool_wait],
+    }
+    if settings.database_max_idle_time_ms is not None:
+        options["maxIdleTimeMS"] = settings.database_max_idle_time_ms
+    if settings.database_wait_queue_timeout_ms is not None:
+        options["waitQueueTimeoutMS"] = settings.database_wait_queue_timeout_ms
+    if compressors := _compressors():
+        options["compressors"] = compressors
+    if settings.metrics_enabled or profiling_enabled():
+        options["event_listeners"].append(CommandMetricsListener())
+    return options
+
+
+def _option(collection: str, key: str) -> Any:
+    overrides = settings.database_collection_options.get(collection, {})
+    return overrides.get(key, getattr(settings, f"database_{key}"))
+
+
+def _write_concern(collection: str) -> WriteConcern | None:
+    w = _option(collection, "write_concern")
+    journal = _option(collection, "write_journal")
+    if w is None and journal is None:
+        return None
+    if isinstance(journal, str):
+        journal = journal.lower() == "true"
+    return WriteConcern(w=int(w) if str(w).isdigit() else w, j=journal)
+
+
+def _apply_collection_options(models: list[type[Document]]) -> None:
+    """
+    Give each model's collection its configured read/write concern. Beanie
+    issues every operation through this handle, so it applies to writes and
+    point reads alike (read preference stays on the primary).
+    """
+    for model in models:
+        name = model.get_collection_name()
+        read_concern = _option(name, "read_concern")
+        write_concern = _write_concern(name)
+        if read_concern is None and write_concern is None:
+            continue
+        model_settings = model.get_settings()
+        model_settings.pymongo_collection = model.get_pymongo_collection().with_options(
+            read_concern=ReadConcern(read_concern) if read_concern else None,
+            write_concern=write_concern,
+        )
+
+
+async def apply_ttl_changes(database: AsyncIOMotorDatabase) -> None:
+    """
+    Give existing single-field indexes the TTL the models now declare.
+
+    createIndexes refuses to change the options of an index that already
+    exists (IndexOptionsConflict), so an expireAfterSeconds added to, or
+    changed on, an index built earlier goes through collMod first. Run before
+    the models' indexes are created.
+    """
+    for model in DOCUMENT_MODELS:
+        declared = [
+            index.document
+            for index in getattr(model.Settings, "indexes", [])
+            if isinstance(index, IndexModel) and "expireAfterSeconds" in index.document
+        ]
+        if not declared:
+            continue
+        collection = database[model.get_collection_name()]
+        existing = await collection.index_information()
+        for index in declared:
+            key = list(index["key"].items())
+            ttl = index["expireAfterSeconds"]
+            for info in existing.values():
+                if info["key"] != key or info.get("expireAfterSeconds") == ttl:
+                    continue
+                await database.command(
+                    {
+                        "collMod": collection.name,
+                        "index": {
+                            "keyPattern": dict(key),
+                            "expireAfterSeconds": ttl,
+                        },
+                    }
+                )
+                logger.info(
+                    "Set expireAfterSeconds=%s on %s.%s",
+                    ttl,
+                    collection.name,
+                    dict(key),
+                )
+
+
+_list_collections: dict[type[Document], AsyncIOMotorCollection] = {}
+
+
+def list_collection(model: type[Document]) -> AsyncIOMotorCollection:
+    """
+    Collection handle for list, export and search reads of `model`,
+    routed by DATABASE_LIST_READ_PREFERENCE (or the collection's override).
+    These reads tolerate replication lag; use the model's own collection
+    for anything that must observe the caller's latest write.
+    """
+    handle = _list_collections.get(model)
+    if handle is None:
+        name = model.get_collection_name()
+        mode = read_pref_mode_from_name(_option(name, "list_read_preference"))
+        # Beanie types the handle as pymongo's; it is the Motor collection
+        # of the database given to init_beanie.
+        handle = cast(
+            AsyncIOMotorCollection,
+            model.get_pymongo_collection().with_options(
+                read_preference=make_read_preference(mode, None)
+            ),
+        )
+        _list_collections[model] = handle
+    return handle
+
 
 async def _wait_for_mongo(
-    client: AsyncIOMotorClient, *, attempts: int = 10, delay: float = 0.5
+    client: AsyncIOMotorClient, *, attempts: int | None = None
 ) -> None:
     """Wait until Mongo responds to ping (helpful with Docker)."""
-    for _ in range(attempts):
-        try:
-            await client.admin.command("ping")
-            logger.info(
-                "Pinged your deployment. You successfully connected to MongoDB!"
-            )
-            return
-        except Exception as e:
-            error = e
-            await asyncio.sleep(delay)
-
-    raise RuntimeError(
-        f"MongoDB did not become ready after {attempts} times try error: {error}"
+    await wait_until_ready(
+        "MongoDB", lambda: client.admin.command("ping"), attempts=attempts
     )
+    logger.info("Pinged your deployment. You successfully connected to MongoDB!")
+
+
+def get_client() -> AsyncIOMotorClient | None:
+    """The Motor client, or None outside beanie_lifespan."""
+    return _client
 
 
 async def get_db() -> AsyncIOMotorDatabase | None:
@@ -60,21 +319,29 @@ async def beanie_lifespan() -> AsyncIterator[None]:
     # _database = _client(settings.database_name)
 
     mongodb_uri = str(settings.mongodb_uri)
-    _client = AsyncIOMotorClient(mongodb_uri)
+    _client = AsyncIOMotorClient(mongodb_uri, **_client_options())
 
     try:
         await _wait_for_mongo(_client)
         await get_db()
+        database = _client[settings.database_name]
+        if settings.database_build_indexes:
+            await apply_ttl_changes(database)
         # set up client / beanie initialization here
         await init_beanie(
-            database=cast(Any, _client[settings.database_name]),
+            database=cast(Any, database),
             document_models=DOCUMENT_MODELS,
+            skip_indexes=not settings.database_build_indexes,
         )
+        _apply_collection_options(DOCUMENT_MODELS)
+        _list_collections.clear()
 
         yield
     except Exception:
-        logger.error("Error initializes of **Beanie** {e}")
-        RuntimeError("Error initializes of **Beanie** {e}")
+        # Fatal: serving without the models (or their indexes) is worse than
+        # not starting.
+        logger.exception("Error initializing Beanie")
+        raise
     finally:
         if _client:
             _client.close()
@@ -0,0 +1,172 @@
+"""
+On-demand request profiling.
+
+A request is profiled when it is sampled (PROFILING_SAMPLE_RATE) or carries
+`X-Profile: <PROFILING_TOKEN>`. It runs under cProfile, and the time it
+spends in Mongo and Redis commands and on the CPU is added up. Both are
+written to PROFILING_DIR, which keeps the newest PROFILING_MAX_FILES
+profiles. With neither setting configured, the middleware is not installed.
+
+cProfile sees the whole event loop thread, so work of concurrent requests
+that interleaves with the profiled one appears in its profile. CPU time is
+that of the loop thread over the same window; Mongo and Redis time only
+counts the profiled request's own commands.
+"""
+
+import cProfile
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+# Functions listed in the JSON summary, by cumulative time.
+_TOP_FUNCTIONS = 30
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    """I/O time of one profiled request, added to from driver threads."""
+
+    mongo_seconds: float = 0.0
+    mongo_commands: int = 0
+    redis_seconds: float = 0.0
+    redis_commands: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, kind: str, seconds: float) -> None:
+        with self._lock:
+            if kind == "mongo":
+                self.mongo_seconds += seconds
+                self.mongo_commands += 1
+            else:
+                self.redis_seconds += seconds
+                self.redis_commands += 1
+
+
+# Set only while a profiled request runs. Motor runs each operation under a
+# copy of the caller's context, so command events on driver threads see it.
+_timings_var: ContextVar[RequestTimings | None] = ContextVar(
+    "profile_timings", default=None
+)
+
+
+def record_io(kind: str, seconds: float) -> None:
+    """Attribute a Mongo/Redis command to the profiled request, if any."""
+    timings = _timings_var.get()
+    if timings is not None:
+        timings.add(kind, seconds)
+
+
+def profiling_enabled() -> bool:
+    return settings.profiling_sample_rate > 0 or bool(settings.profiling_token)
+
+
+def wants_profile(headers: list[tuple[bytes, bytes]]) -> bool:
+    """Sampled, or the request presents the profiling token."""
+    if random.random() < settings.profiling_sample_rate:
+        return True
+    token = settings.profiling_token
+    if not token:
+        return False
+    for name, value in headers:
+        if name == PROFILE_HEADER:
+            return hmac.compare_digest(value, token.encode())
+    return False
+
+
+# cProfile allows one active profiler per thread; requests that would
+# overlap a running profile are served unprofiled.
+_active = threading.Lock()
+
+
+class RequestProfile:
+    """cProfile plus wall/CPU/IO timings of one request."""
+
+    def __init__(self, profile_id: str) -> None:
+        # May come from the client's X-Request-ID; it ends up in a file name.
+        self.id = _slug(profile_id)
+        self.timings = RequestTimings()
+        self._profiler = cProfile.Profile()
+        self._token: Any = None
+        self._wall = 0.0
+        self._cpu = 0.0
+
+    @classmethod
+    def start(cls, profile_id: str) -> "RequestProfile | None":
+        if not _active.acquire(blocking=False):
+            logger.debug("Profile %s skipped: another is running", profile_id)
+            return None
+        profile = cls(profile_id)
+        profile._token = _timings_var.set(profile.timings)
+        profile._wall = time.perf_counter()
+        profile._cpu = time.thread_time()
+        profile._profiler.enable()
+        return profile
+
+    def stop(self) -> dict[str, Any]:
+        """Stop profiling; returns the timing breakdown."""
+        try:
+            self._profiler.disable()
+            cpu = time.thread_time() - self._cpu
+            wall = time.perf_counter() - self._wall
+            _timings_var.reset(self._token)
+        finally:
+            _active.release()
+        t = self.timings
+        return {
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "mongo_seconds": t.mongo_seconds,
+            "mongo_commands": t.mongo_commands,
+            "redis_seconds": t.redis_seconds,
+            "redis_commands": t.redis_commands,
+        }
+
+    def save(self, summary: dict[str, Any]) -> Path:
+        """
+        Write `<id>.prof` (pstats, e.g. for snakeviz) and `<id>.json` with the
+        breakdown and top functions, then prune the oldest profiles. Blocking:
+        run it off the event loop.
+        """
+        directory = Path(settings.profiling_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        stem = f"{stamp}-{_slug(summary['route'])}-{self.id}"
+        path = directory / f"{stem}.prof"
+        self._profiler.dump_stats(path)
+
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_TOP_FUNCTIONS)
+        summary["top_functions"] = out.getvalue().splitlines()
+        (directory / f"{stem}.json").write_text(json.dumps(summary, indent=2))
+        _prune(directory, settings.profiling_max_files)
+        return path
+
+
+def _slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_")[:60] or "root"
+
+
+def _prune(directory: Path, keep: int) -> None:
+    profiles = sorted(directory.glob("*.prof"), key=os.path.getmtime)
+    for old in profiles[: max(0, len(profiles) - keep)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".json").unlink(missing_ok=True)
@@ -0,0 +1,64 @@
+import math
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+from app.core.context import user_var
+from app.core.logging import get_logger
+from app.core.metrics import Counter
+from app.core.redis import take_rate_limit_token
+
+logger = get_logger(__name__)
+
+RATE_LIMITED = Counter(
+    "http_rate_limited_total", "Requests rejected with 429.", ("route",)
+)
+RATE_LIMIT_ERRORS = Counter(
+    "http_rate_limit_errors_total",
+    "Rate limit checks that failed (Redis unavailable); the request was let through.",
+)
+
+
+def _client_ip(request: Request) -> str:
+    if settings.rate_limit_trust_forwarded:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",", 1)[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _limits(route: str) -> tuple[float, int]:
+    override = settings.rate_limit_route_overrides.get(route)
+    if override is not None:
+        return override
+    return settings.rate_limit_per_second, settings.rate_limit_burst
+
+
+async def rate_limit(request: Request) -> None:
+    """
+    Router dependency enforcing a token bucket per client and route. It runs
+    after routing, so requests are keyed by the route template rather than
+    the raw path (one bucket for /tasks/{id}, not one per id). Clients are
+    the bound user when authenticated, otherwise their IP. When Redis is
+    unavailable the request is let through: the limiter must not turn a
+    Redis outage into an API outage.
+    """
+    route = request.scope["route"].path
+    user = user_var.get()
+    client = f"user:{user}" if user else f"ip:{_client_ip(request)}"
+    rate, burst = _limits(route)
+    try:
+        allowed, _, retry_after = await take_rate_limit_token(
+            f"ratelimit:{client}:{request.method}:{route}", rate=rate, burst=burst
+        )
+    except Exception as e:
+        RATE_LIMIT_ERRORS.inc()
+        logger.warning("Rate limit check failed, allowing request: %s", e)
+        return
+    if not allowed:
+        RATE_LIMITED.inc((route,))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
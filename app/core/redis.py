@@ -1,14 +1,80 @@
 import asyncio
+import contextlib
 import ssl as _ssl
-from collections.abc import AsyncIterator, Mapping
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Sequence
 from contextlib import asynccontextmanager
-from typing import cast
+from typing import Any, cast
+from uuid import uuid4
 
 from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.commands.core import AsyncScript
 
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import Counter, Histogram
+from app.core.profiling import profiling_enabled, record_io
+from app.core.startup import wait_until_ready
 
-_redis: Redis | None = None
+_client: Redis | None = None
+_invalidation_listener: asyncio.Task[None] | None = None
+
+logger = get_logger(__name__)
+
+
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds",
+    "Redis command round trip time; pipelines are timed as one command.",
+    ("command",),
+)
+REDIS_COMMAND_ERRORS = Counter(
+    "redis_command_errors_total", "Redis commands that raised.", ("command",)
+)
+
+
+def _observe(command: str, seconds: float) -> None:
+    REDIS_COMMAND_SECONDS.observe(seconds, (command,))
+    record_io("redis", seconds)
+
+
+class _TimedPipeline(Pipeline):
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        name = "MULTI" if self.is_transaction else "PIPELINE"
+        start = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        except Exception:
+            REDIS_COMMAND_ERRORS.inc((name,))
+            raise
+        finally:
+            _observe(name, time.perf_counter() - start)
+
+
+class TimedRedis(Redis):
+    """
+    Redis client that records per-command latency and errors, and adds it to
+    the breakdown of the request being profiled, if any.
+    """
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        name = str(args[0]).upper()
+        start = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        except Exception:
+            REDIS_COMMAND_ERRORS.inc((name,))
+            raise
+        finally:
+            _observe(name, time.perf_counter() - start)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: str | None = None
+    ) -> Pipeline:
+        return _TimedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
 
 
 def _build_redis() -> Redis:
@@ -31,38 +97,15 @@ def _build_redis() -> Redis:
         )
 
     redis_url = str(settings.redis_url)
-    client = Redis.from_url(redis_url, **kwargs)
+    timed = settings.metrics_enabled or profiling_enabled()
+    client_class = TimedRedis if timed else Redis
+    client = client_class.from_url(redis_url, **kwargs)
     return client  # connection object  = client
 
 
 # READINESS PROBE
-async def _wait_for_redis(
-    client: Redis, *, attempts: int = 20, delay: float = 0.25
-) -> bool | None:
-    last_exc: Exception | None = None
-
-    """
-    attempt 1:
-            pong = True
-            redis = ready
-            return True  
-    """
-    for _ in range(attempts):
-        try:
-            # ping = you pushing the ball redis
-            pong = (
-                await client.ping()
-            )  # object tha represent redis db | connection object
-            # pong = redis pushing the bal back to you
-            # if pong is false = redis did no receive the ball or did nt push back the ball indicating redis is not ready
-            # if true = redis is alive and ready
-            if pong:  # True / "PONG"
-                return
-        except Exception as exc:  # pragma: no cover (startup path)
-            last_exc = exc
-            await asyncio.sleep(delay)
-            delay = min(delay * 1.5, 3.0)
-    raise RuntimeError("Redis not ready after retries") from last_exc
+async def _wait_for_redis(client: Redis, *, attempts: int | None = None) -> None:
+    await wait_until_ready("Redis", client.ping, attempts=attempts)
 
 
 # SINGLETON CONNECTION
@@ -89,12 +132,24 @@ async def redis_lifespan() -> AsyncIterator[None]:
             async with redis_lifespan():
                 yield
     """
-    global _client
+    global _client, _invalidation_listener
     _client = _build_redis()  # redis client or connection object
     await _wait_for_redis(_client)
+    await _load_scripts(_client)
+    if settings.session_cache_enabled:
+        _invalidation_listener = asyncio.create_task(
+            _listen_for_session_invalidations(_client)
+        )
     try:
         yield
     finally:
+        if _invalidation_listener is not None:
+            _invalidation_listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await _invalidation_listener
+            _invalidation_listener = None
+        _session_cache.clear()
+        _scripts.clear()
         if _client is not None:
             await _client.close()
             _client = None
@@ -103,6 +158,118 @@ async def redis_lifespan() -> AsyncIterator[None]:
 # Session utilities (username key)
 
 
+class _SessionCache:
+    """
+    In-process LRU of (kind, username) -> stored jti, in front of the session
+    hash. Entries live at most `session_cache_ttl_seconds` (the staleness bound
+    if an invalidation message is missed) and never past the session's own
+    expiry. Workers drop entries when another worker publishes a change.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple[str, str], tuple[Any, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, kind: str, username: str) -> tuple[bool, Any]:
+        entry = self._entries.get((kind, username))
+        if entry is None or entry[1] <= time.monotonic():
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end((kind, username))
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, kind: str, username: str, jti: Any, exp: Any) -> None:
+        if not settings.session_cache_enabled:
+            return
+        lifetime = settings.session_cache_ttl_seconds
+        if exp is not None:
+            lifetime = min(lifetime, float(exp) - time.time())
+        if lifetime <= 0:
+            return
+        self._entries[(kind, username)] = (jti, time.monotonic() + lifetime)
+        self._entries.move_to_end((kind, username))
+        while len(self._entries) > settings.session_cache_max_entries:
+            self._entries.popitem(last=False)
+
+    def drop(self, kind: str, username: str) -> None:
+        if self._entries.pop((kind, username), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_session_cache = _SessionCache()
+
+
+def session_cache_stats() -> dict[str, Any]:
+    """Hit/miss counters of the in-process session tier."""
+    return _session_cache.stats()
+
+
+def redis_pool_stats() -> dict[str, Any]:
+    """Connection pool usage of the client; empty outside redis_lifespan."""
+    if _client is None:
+        return {}
+    pool = _client.connection_pool
+    # redis-py keeps no public in-use counter; fall back to 0 if renamed.
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    return {
+        "in_use": in_use,
+        "available": len(getattr(pool, "_available_connections", ())),
+        "max_size": getattr(pool, "max_connections", None),
+    }
+
+
+async def _publish_session_change(r: Redis, kind: str, username: str) -> None:
+    _session_cache.drop(kind, username)
+    if settings.session_cache_enabled:
+        await r.publish(settings.session_cache_channel, f"{kind}:{username}")
+
+
+async def _listen_for_session_invalidations(client: Redis) -> None:
+    """
+    Drop local session entries named on the invalidation channel. After a
+    disconnect the whole tier is cleared, since messages may have been missed.
+    """
+    delay = 0.25
+    while True:
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(settings.session_cache_channel)
+            _session_cache.clear()
+            delay = 0.25
+            async for message in pubsub.listen():
+                data = message.get("data")
+                if isinstance(data, bytes):
+                    data = data.decode()
+                kind, _, username = str(data).partition(":")
+                _session_cache.drop(kind, username)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Session invalidation listener error: %s", exc)
+            _session_cache.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+        finally:
+            with contextlib.suppress(Exception):
+                await pubsub.aclose()
+
+
 def _session_key(kind: str, username: str) -> str:
     """
     Session key format: session:<kind>:<username>
@@ -111,6 +278,99 @@ def _session_key(kind: str, username: str) -> str:
     return f"session:{kind}:{username}"
 
 
+# Server-side scripts (sessions, rate limiting, locks). They are loaded once in redis_lifespan and run
+# with EVALSHA (redis-py falls back to EVAL if the script cache was flushed).
+
+# KEYS[1] session key
+# ARGV[1] expected current jti ("" = unconditional), ARGV[2] ttl seconds,
+# ARGV[3..] field/value pairs of the new session hash.
+# Returns 1 when written, 0 when the stored jti did not match.
+_STORE_SESSION_LUA = """
+if ARGV[1] ~= '' and redis.call('HGET', KEYS[1], 'jti') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+return 1
+"""
+
+# KEYS[1] session key; ARGV[1] presented jti, ARGV[2] unix time.
+# Returns 1 and records last_seen when the jti matches, otherwise 0.
+_CHECK_AND_TOUCH_LUA = """
+if redis.call('HGET', KEYS[1], 'jti') == ARGV[1] then
+    redis.call('HSET', KEYS[1], 'last_seen', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+# KEYS[1] session key; ARGV[1] jti to revoke ("" = whatever is stored).
+# Returns 1 when a session was deleted.
+_REVOKE_SESSION_LUA = """
+if ARGV[1] ~= '' and redis.call('HGET', KEYS[1], 'jti') ~= ARGV[1] then
+    return 0
+end
+return redis.call('DEL', KEYS[1])
+"""
+
+# Token bucket for rate limiting, on Redis' clock so app instances agree.
+# KEYS[1] bucket key; ARGV[1] refill rate (tokens/second), ARGV[2] bucket
+# size, ARGV[3] cost of this request.
+# Returns {allowed 0/1, whole tokens left, milliseconds until allowed}.
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local last = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - last) * rate / 1000)
+local allowed, wait = 0, 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    wait = math.ceil((cost - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return {allowed, math.floor(tokens), wait}
+"""
+
+# KEYS[1] lock key; ARGV[1] the holder's token.
+# Deletes the lock only while that token still holds it; returns 1 if so.
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_scripts: dict[str, AsyncScript] = {}
+
+
+async def _load_scripts(client: Redis) -> None:
+    for name, source in (
+        ("store", _STORE_SESSION_LUA),
+        ("check_and_touch", _CHECK_AND_TOUCH_LUA),
+        ("revoke", _REVOKE_SESSION_LUA),
+        ("token_bucket", _TOKEN_BUCKET_LUA),
+        ("release_lock", _RELEASE_LOCK_LUA),
+    ):
+        script = client.register_script(source)
+        await client.script_load(source)
+        _scripts[name] = script
+
+
+def _script(name: str) -> AsyncScript:
+    if name not in _scripts:
+        raise RuntimeError("Redis scripts not loaded. Use within app lifespan.")
+    return _scripts[name]
+
+
 async def store_session_for_user(
     username: str,
     jti: str,
@@ -118,19 +378,18 @@ async def store_session_for_user(
     *,
     kind: str = "access",
     meta: dict | None = None,
-) -> None:
+    expected_jti: str | None = None,
+) -> bool:
     """
     Store the current active token info for a user under their username key.
     Enforces ONE active token per <kind> per user.
+
+    With `expected_jti` the write only happens if that jti is still the stored
+    one (compare-and-set), so two concurrent rotations cannot both win.
+    Returns whether the session was written.
     """
     r = get_redis()
-    ttl = max(
-        1, exp_unix_ts - int(asyncio.get_running_loop().time() // 1 + 0)
-    )  # safe min TTL
-    # Better TTL calc (UTC now):
-    import time
-
-    ttl = max(1, exp_unix_ts - int(time.time()))
+    ttl = max(1, exp_unix_ts - int(time.time()))  # safe min TTL
 
     key = _session_key(kind, username)
     payload: dict[str, str] = {"jti": jti, "exp": str(exp_unix_ts)}
@@ -138,13 +397,30 @@ async def store_session_for_user(
         # Convert all meta values to strings for Redis
         payload.update({k: str(v) for k, v in meta.items()})
 
-    async with r.pipeline(transaction=True) as pipe:
-        # Cast to satisfy mypy's strict type checking for Redis hset
-        await pipe.hset(
-            key, mapping=cast(Mapping[str | bytes, bytes | float | int | str], payload)
-        )
-        await pipe.expire(key, ttl)
-        await pipe.execute()
+    args: list[str | int] = [expected_jti or "", ttl]
+    for field, value in payload.items():
+        args.extend((field, value))
+    written = await _script("store")(keys=[key], args=args, client=r)
+    if written:
+        await _publish_session_change(r, kind, username)
+    return bool(written)
+
+
+async def rotate_user_session(
+    username: str,
+    old_jti: str,
+    new_jti: str,
+    exp_unix_ts: int,
+    *,
+    kind: str = "access",
+    meta: dict | None = None,
+) -> bool:
+    """
+    Replace the session only if `old_jti` is still the active one.
+    """
+    return await store_session_for_user(
+        username, new_jti, exp_unix_ts, kind=kind, meta=meta, expected_jti=old_jti
+    )
 
 
 async def is_user_session_active(
@@ -152,16 +428,114 @@ async def is_user_session_active(
 ) -> bool:
     """
     Check if the stored JTI for this user/kind matches the presented token JTI.
+    Served from the in-process tier when enabled and fresh.
     """
+    if settings.session_cache_enabled:
+        found, stored_jti = _session_cache.get(kind, username)
+        if found:
+            return cast(bool, stored_jti == jti)
+
     r = get_redis()
     key = _session_key(kind, username)
-    stored_jti = await r.hget(key, "jti")
+    stored_jti, exp = await r.hmget(key, ["jti", "exp"])
+    if stored_jti is not None:
+        _session_cache.put(kind, username, stored_jti, exp)
     return cast(bool, stored_jti == jti)
 
 
-async def revoke_user_session(username: str, *, kind: str = "access") -> None:
+async def are_sessions_active(
+    sessions: Sequence[tuple[str, str]], *, kind: str = "access"
+) -> list[bool]:
+    """
+    Batched is_user_session_active for (username, jti) pairs.
+    Entries not in the in-process tier are fetched in a single pipeline.
+    """
+    results: list[bool] = [False] * len(sessions)
+    pending: list[int] = []
+    for i, (username, jti) in enumerate(sessions):
+        if settings.session_cache_enabled:
+            found, stored_jti = _session_cache.get(kind, username)
+            if found:
+                results[i] = stored_jti == jti
+                continue
+        pending.append(i)
+
+    if not pending:
+        return results
+
+    r = get_redis()
+    async with r.pipeline(transaction=False) as pipe:
+        for i in pending:
+            await pipe.hmget(_session_key(kind, sessions[i][0]), ["jti", "exp"])
+        replies = await pipe.execute()
+
+    for i, (stored_jti, exp) in zip(pending, replies, strict=True):
+        username, jti = sessions[i]
+        if stored_jti is not None:
+            _session_cache.put(kind, username, stored_jti, exp)
+        results[i] = stored_jti == jti
+    return results
+
+
+async def check_and_touch_session(
+    username: str, jti: str, *, kind: str = "access"
+) -> bool:
+    """
+    Atomically verify the presented jti and record `last_seen` on the session.
+    Always goes to Redis, since the write is the point.
+    """
+    r = get_redis()
+    matched = await _script("check_and_touch")(
+        keys=[_session_key(kind, username)], args=[jti, int(time.time())], client=r
+    )
+    return bool(matched)
+
+
+async def revoke_user_session(
+    username: str, *, kind: str = "access", jti: str | None = None
+) -> bool:
     """
     Delete the user's session record for the given kind (access/refresh).
+    With `jti`, only that session is revoked; a newer one is left alone.
+    Returns whether a session was deleted.
     """
     r = get_redis()
-    await r.delete(_session_key(kind, username))
+    deleted = await _script("revoke")(
+        keys=[_session_key(kind, username)], args=[jti or ""], client=r
+    )
+    if deleted:
+        await _publish_session_change(r, kind, username)
+    return bool(deleted)
+
+
+async def take_rate_limit_token(
+    key: str, *, rate: float, burst: int, cost: int = 1
+) -> tuple[bool, int, float]:
+    """
+    Take `cost` tokens from the bucket at `key`, refilled at `rate` per
+    second up to `burst`. Returns (allowed, tokens left, seconds until the
+    request would be allowed).
+    """
+    allowed, left, wait_ms = await _script("token_bucket")(
+        keys=[key], args=[rate, burst, cost], client=get_redis()
+    )
+    return bool(allowed), int(left), wait_ms / 1000
+
+
+async def acquire_lock(key: str, ttl_ms: int) -> str | None:
+    """
+    Take the lock at `key` (SET NX PX) for at most `ttl_ms`. Returns the token
+    to release it with, or None when someone else holds it.
+    """
+    token = uuid4().hex
+    if await get_redis().set(key, token, nx=True, px=ttl_ms):
+        return token
+    return None
+
+
+async def release_lock(key: str, token: str) -> bool:
+    """Release a lock taken with acquire_lock(), unless it expired meanwhile."""
+    released = await _script("release_lock")(
+        keys=[key], args=[token], client=get_redis()
+    )
+    return bool(released)
@@ -0,0 +1,62 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack
+from typing import Any
+
+from app.core.config import settings
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff: a random delay up to
+    STARTUP_BACKOFF_BASE_SECONDS * 2**attempt, capped at
+    STARTUP_BACKOFF_MAX_SECONDS. The jitter keeps a fleet of workers that
+    start together from retrying in lockstep.
+    """
+    ceiling = min(
+        settings.startup_backoff_max_seconds,
+        settings.startup_backoff_base_seconds * 2**attempt,
+    )
+    return random.uniform(0, ceiling)
+
+
+async def wait_until_ready(
+    name: str,
+    check: Callable[[], Awaitable[Any]],
+    *,
+    attempts: int | None = None,
+) -> None:
+    """
+    Call `check` until it returns a truthy value, sleeping with jittered
+    backoff in between. The first attempt is immediate, so a dependency that
+    is already up costs a single round trip.
+    """
+    attempts = attempts or settings.startup_wait_attempts
+    last_exc: Exception | None = None
+    for attempt in range(attempts):
+        try:
+            if await check():
+                return
+        except Exception as exc:
+            last_exc = exc
+        await asyncio.sleep(backoff_delay(attempt))
+    raise RuntimeError(f"{name} not ready after {attempts} attempts") from last_exc
+
+
+async def enter_concurrently(
+    stack: AsyncExitStack, *contexts: AbstractAsyncContextManager[Any]
+) -> None:
+    """
+    Enter independent async contexts at the same time, pushing each onto
+    `stack` as soon as it is up. A failure does not abandon the others:
+    all are awaited, so everything that did start is unwound by the stack,
+    then the first error is raised.
+    """
+    results = await asyncio.gather(
+        *(stack.enter_async_context(context) for context in contexts),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
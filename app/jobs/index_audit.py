@@ -0,0 +1,213 @@
+"""
+Check that every repository query is served by an index.
+
+Runs explain() on the query shapes the repositories issue and flags
+collection scans (and, as warnings, in-memory sorts). Also compares the
+indexes declared on the models with those present in the database.
+Exits non-zero on a collection scan or a missing index, so it can gate CI
+or a deploy.
+
+    python -m app.jobs.index_audit
+    python -m app.jobs.index_audit --drop-stale   # drop undeclared indexes
+"""
+
+import argparse
+import asyncio
+import sys
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, cast
+
+from beanie import PydanticObjectId, init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING
+
+from app.core.config import settings
+from app.models.audit import Audit
+from app.models.base import BaseDoc, utcnow
+from app.models.enums import TaskStatus
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.repositories.audit import range_filter
+from app.repositories.pagination import decode_cursor, encode_cursor
+
+MODELS: list[type[BaseDoc]] = [Task, Project, User, Audit]
+
+Sort = list[tuple[str, int]]
+
+
+@dataclass(slots=True)
+class QueryShape:
+    model: type[BaseDoc]
+    name: str
+    filter: dict[str, Any]
+    sort: Sort = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Finding:
+    shape: QueryShape
+    stages: list[str]
+
+    @property
+    def collscan(self) -> bool:
+        return "COLLSCAN" in self.stages
+
+    @property
+    def in_memory_sort(self) -> bool:
+        return "SORT" in self.stages
+
+
+def _after(model: type[BaseDoc], descending: bool = False) -> dict[str, Any]:
+    """Keyset continuation predicate for a page ordered by createdAt."""
+    doc = model.model_construct(id=PydanticObjectId(), created_at=utcnow())
+    token = encode_cursor("createdAt", doc, descending=descending)
+    return decode_cursor("createdAt", token, descending=descending)
+
+
+def _by_created(descending: bool = False) -> Sort:
+    direction = DESCENDING if descending else ASCENDING
+    return [("createdAt", direction), ("_id", direction)]
+
+
+def query_shapes() -> list[QueryShape]:
+    """
+    The queries the repositories issue, with placeholder values.
+    Keep in sync when a repository gains a new finder.
+    """
+    oid = PydanticObjectId()
+    now = utcnow()
+    day_ago = now - timedelta(days=1)
+    status = TaskStatus.PENDING.value
+    audit_window = range_filter(start=day_ago, end=now, actor=None, action=None)
+    audit_actor = range_filter(start=day_ago, end=now, actor=oid, action=None)
+    audit_action = range_filter(start=day_ago, end=now, actor=None, action="login")
+    shapes = [
+        QueryShape(Task, "get", {"_id": oid}),
+        QueryShape(Task, "list_page(createdAt)", _after(Task), _by_created()),
+        QueryShape(
+            Task,
+            "list_by_project",
+            {"$and": [{"project_id": 1}, _after(Task)]},
+            _by_created(),
+        ),
+        QueryShape(
+            Task,
+            "list_by_project(status)",
+            {"project_id": 1, "status": status},
+            _by_created(),
+        ),
+        QueryShape(
+            Task,
+            "list_by_assignee",
+            {"$and": [{"assigned_to": 1}, _after(Task)]},
+            _by_created(),
+        ),
+        QueryShape(
+            Task,
+            "list_by_assignee(status)",
+            {"assigned_to": 1, "status": status},
+            _by_created(),
+        ),
+        QueryShape(Task, "text search", {"$text": {"$search": "report"}}),
+        QueryShape(Project, "get", {"_id": oid}),
+        QueryShape(
+            Project,
+            "list_by_owner",
+            {"$and": [{"owner_id": 1}, _after(Project)]},
+            _by_created(),
+        ),
+        QueryShape(User, "get", {"_id": oid}),
+        QueryShape(User, "get_by_username", {"username": "alice"}),
+        QueryShape(User, "get_by_email", {"email": "alice@example.com"}),
+        QueryShape(Audit, "find_range", audit_window, _by_created(True)),
+        QueryShape(Audit, "find_range(actor)", audit_actor, _by_created(True)),
+        QueryShape(Audit, "find_range(action)", audit_action, _by_created(True)),
+    ]
+    return shapes
+
+
+def _stages(plan: dict[str, Any]) -> Iterator[str]:
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _stages(plan[key])
+    for key in ("inputStages", "shards"):
+        for child in plan.get(key, []):
+            yield from _stages(child.get("winningPlan", child))
+
+
+async def explain(db: AsyncIOMotorDatabase, shape: QueryShape) -> Finding:
+    cursor = db[shape.model.get_collection_name()].find(shape.filter).limit(100)
+    if shape.sort:
+        cursor = cursor.sort(shape.sort)
+    plan = await cursor.explain()
+    winning = plan["queryPlanner"]["winningPlan"]
+    return Finding(shape=shape, stages=list(_stages(winning)))
+
+
+def _declared_names(model: type[BaseDoc]) -> set[str]:
+    return {index.name for index in model.get_settings().indexes}
+
+
+async def index_drift(
+    db: AsyncIOMotorDatabase, model: type[BaseDoc]
+) -> tuple[set[str], set[str]]:
+    """(declared but missing, present but undeclared) index names."""
+    present = set(await db[model.get_collection_name()].index_information())
+    present.discard("_id_")
+    declared = _declared_names(model)
+    return declared - present, present - declared
+
+
+async def main(drop_stale: bool) -> int:
+    client: AsyncIOMotorClient = AsyncIOMotorClient(str(settings.mongodb_uri))
+    db = client[settings.database_name]
+    failed = False
+    try:
+        # Resolves the models' collection names and index declarations
+        # without creating or dropping any index.
+        await init_beanie(
+            database=cast(Any, db), document_models=MODELS, skip_indexes=True
+        )
+        for model in MODELS:
+            name = model.get_collection_name()
+            missing, stale = await index_drift(db, model)
+            for index in sorted(missing):
+                failed = True
+                print(f"MISSING  {name}: {index}")
+            for index in sorted(stale):
+                if drop_stale:
+                    await db[name].drop_index(index)
+                    print(f"DROPPED  {name}: {index}")
+                else:
+                    print(f"STALE    {name}: {index}")
+
+        for shape in query_shapes():
+            finding = await explain(db, shape)
+            label = f"{shape.model.get_collection_name()}.{shape.name}"
+            plan = " <- ".join(finding.stages)
+            if finding.collscan:
+                failed = True
+                print(f"COLLSCAN {label}: {plan}")
+            elif finding.in_memory_sort:
+                print(f"SORT     {label}: {plan}")
+            else:
+                print(f"ok       {label}: {plan}")
+    finally:
+        client.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--drop-stale",
+        action="store_true",
+        help="drop indexes that exist in the database but not on the models",
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.drop_stale)))
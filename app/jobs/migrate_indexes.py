@@ -0,0 +1,55 @@
+"""
+Create the indexes declared on the models.
+
+The deploy step for DATABASE_BUILD_INDEXES=false: app workers then start
+without creating or verifying indexes, and this runs once per release.
+A TTL declared on an index that already exists is applied with collMod.
+
+    python -m app.jobs.migrate_indexes
+    python -m app.jobs.migrate_indexes --drop-stale   # also drop undeclared ones
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, cast
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.mongo import DOCUMENT_MODELS, apply_ttl_changes
+
+logger = get_logger(__name__)
+
+
+async def main(drop_stale: bool) -> None:
+    client: AsyncIOMotorClient = AsyncIOMotorClient(str(settings.mongodb_uri))
+    try:
+        start = time.perf_counter()
+        database = client[settings.database_name]
+        await apply_ttl_changes(database)
+        await init_beanie(
+            database=cast(Any, database),
+            document_models=DOCUMENT_MODELS,
+            allow_index_dropping=drop_stale,
+        )
+        logger.info(
+            "Indexes of %d collections in place in %.2fs",
+            len(DOCUMENT_MODELS),
+            time.perf_counter() - start,
+        )
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--drop-stale",
+        action="store_true",
+        help="drop indexes that exist in the database but not on the models",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.drop_stale))
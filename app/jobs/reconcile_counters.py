@@ -0,0 +1,39 @@
+"""
+Rebuild the task report counters in Redis from the Mongo aggregation.
+
+    python -m app.jobs.reconcile_counters             # once (cron)
+    python -m app.jobs.reconcile_counters --every 3600
+"""
+
+import argparse
+import asyncio
+
+from app.core.logging import get_logger
+from app.core.mongo import beanie_lifespan
+from app.core.redis import redis_lifespan
+from app.repositories.reporting import reconcile_task_counters
+
+logger = get_logger(__name__)
+
+
+async def main(every: float | None) -> None:
+    async with redis_lifespan(), beanie_lifespan():
+        while True:
+            try:
+                await reconcile_task_counters()
+            except Exception as e:
+                if every is None:
+                    raise
+                logger.error("Task counter reconciliation failed: %s", e)
+            if every is None:
+                return
+            await asyncio.sleep(every)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--every", type=float, default=None, help="repeat every N seconds"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.every))
@@ -1,13 +1,35 @@
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import AsyncExitStack, asynccontextmanager
 
-import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 
+from app.api import (
+    export_router,
+    health_router,
+    metrics_router,
+    projects_router,
+    reports_router,
+    search_router,
+    tasks_router,
+)
 from app.core.config import settings
+from app.core.health import health_lifespan
 from app.core.logging import get_logger
+from app.core.metrics import snapshot_lifespan
+from app.core.middleware import (
+    AdmissionMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    RequestContextMiddleware,
+    count_in_flight,
+)
 from app.core.mongo import beanie_lifespan
+from app.core.profiling import profiling_enabled
+from app.core.ratelimit import rate_limit
 from app.core.redis import redis_lifespan
+from app.core.startup import enter_concurrently
+from app.repositories.audit_sink import audit_sink_lifespan
+from app.repositories.loader import request_loaders
 
 # Log configuration source on startup
 
@@ -18,9 +40,14 @@ logger.info(f"🔧 Configuration: {settings.config_source}")
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     try:
-        async with redis_lifespan(), beanie_lifespan():
+        async with AsyncExitStack() as stack:
+            await stack.enter_async_context(snapshot_lifespan())
+            # Redis and Mongo are independent; wait for both at once.
+            await enter_concurrently(stack, redis_lifespan(), beanie_lifespan())
+            # The audit sink flushes on exit, so it must close before Mongo does.
+            await stack.enter_async_context(audit_sink_lifespan())
+            await stack.enter_async_context(health_lifespan())
             yield
-        yield
 
     except Exception as e:
         print(f"Error in appliccation lifespan: {e}")
@@ -36,23 +63,35 @@ app = FastAPI(
     description=settings.app_description,
     debug=settings.app_debug,
     lifespan=lifespan,
+    dependencies=[
+        Depends(request_loaders),
+        *([Depends(count_in_flight)] if settings.metrics_enabled else []),
+    ],
 )
+if profiling_enabled():
+    # Added first so it runs inside RequestContextMiddleware.
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+if settings.admission_enabled:
+    app.add_middleware(AdmissionMiddleware)
 
+# Health and metrics stay unlimited, so probes and scrapes always get through.
+api_dependencies = [Depends(rate_limit)] if settings.rate_limit_enabled else []
+app.include_router(health_router)
+app.include_router(export_router, dependencies=api_dependencies)
+app.include_router(reports_router, dependencies=api_dependencies)
+app.include_router(search_router, dependencies=api_dependencies)
+app.include_router(tasks_router, dependencies=api_dependencies)
+app.include_router(projects_router, dependencies=api_dependencies)
 
-@app.get("/health")
-async def health() -> dict:
-    return {
-        "status": "healthy",
-        "config_source": settings.config_source,
-        "app_name": settings.app_name,
-        "version": settings.app_version,
-    }
+if settings.metrics_enabled:
+    app.include_router(metrics_router)
+    # Added last so it is outermost and times the whole middleware stack.
+    app.add_middleware(MetricsMiddleware)
 
 
 if __name__ == "__main__":
-    uvicorn.run(
-        app,
-        host=settings.app_host,
-        port=settings.app_port,
-        reload=settings.app_reload,
-    )
+    # `python -m app.server` is the entrypoint; kept for compatibility.
+    from app.server import main
+
+    main()
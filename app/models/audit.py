@@ -1,12 +1,54 @@
 from typing import ClassVar
 
-from beanie import Link
+from beanie import Granularity, Link, TimeSeriesConfig
 from pydantic import Field
 from pymongo import ASCENDING, IndexModel
 
+from app.core.config import settings
 from app.models.base import BaseDoc
 from app.models.user import User
 
+_RETENTION_SECONDS = (
+    settings.audit_retention_days * 86_400 if settings.audit_retention_days else None
+)
+
+
+def _audit_indexes() -> list[IndexModel]:
+    """
+    Indexes for the audit range queries: the (createdAt, _id) keyset the
+    repository pages on, alone for unfiltered ranges and after equality on
+    actor/action for filtered ones.
+    """
+    indexes = [IndexModel([("createdAt", ASCENDING), ("_id", ASCENDING)])]
+    if _RETENTION_SECONDS and settings.audit_storage_mode == "standard":
+        # TTL indexes must be single-field; time-series collections expire
+        # through their own option. An existing createdAt_1 index gets the
+        # TTL through collMod (apply_ttl_changes) before indexes are built.
+        indexes.append(
+            IndexModel(
+                [("createdAt", ASCENDING)], expireAfterSeconds=_RETENTION_SECONDS
+            )
+        )
+    return [
+        *indexes,
+        IndexModel(
+            [("actor.$id", ASCENDING), ("createdAt", ASCENDING), ("_id", ASCENDING)]
+        ),
+        IndexModel(
+            [("action", ASCENDING), ("createdAt", ASCENDING), ("_id", ASCENDING)]
+        ),
+    ]
+
+
+def _audit_timeseries() -> TimeSeriesConfig | None:
+    if settings.audit_storage_mode != "timeseries":
+        return None
+    return TimeSeriesConfig(
+        time_field="createdAt",
+        granularity=Granularity.seconds,
+        expire_after_seconds=_RETENTION_SECONDS,
+    )
+
 
 class Audit(BaseDoc):
     actor: Link[User] = Field(..., alias="actor")  # who did it
@@ -17,4 +59,5 @@ class Audit(BaseDoc):
 
     class Settings:
         name: ClassVar[str] = "audit"
-        indexes: ClassVar[list[IndexModel]] = [IndexModel([("createdAt", ASCENDING)])]
+        indexes: ClassVar[list[IndexModel]] = _audit_indexes()
+        timeseries: ClassVar[TimeSeriesConfig | None] = _audit_timeseries()
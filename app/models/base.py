@@ -1,10 +1,12 @@
-from datetime import datetime
-from time import timezone
+from datetime import UTC, datetime
+from typing import ClassVar
 
 from beanie import Document, Insert, Replace, Save, before_event
 from pydantic import Field
 
-utcnow = lambda: datetime.now(timezone.utc)
+
+def utcnow() -> datetime:
+    return datetime.now(UTC)
 
 
 class BaseDoc(Document):
@@ -12,9 +14,13 @@ class BaseDoc(Document):
     updated_at: datetime = Field(default_factory=utcnow, alias="updatedAt")
     is_active: bool = Field(default=True, alias="isActive")
 
+    # False keeps the model out of the shared Redis document cache, e.g.
+    # because it holds secrets.
+    cacheable: ClassVar[bool] = True
+
     @before_event([Insert, Save, Replace])
     def _update_timestamp(self) -> None:
-        self.updated_at = utcnow
+        self.updated_at = utcnow()
 
     class Settings:
         validate_on_save = True
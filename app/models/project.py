@@ -1,4 +1,3 @@
-from datetime import datetime
 from typing import ClassVar
 
 from pymongo import ASCENDING, TEXT, IndexModel
@@ -10,12 +9,13 @@ class Project(BaseDoc):
     name: str
     description: str
     owner_id: int
-    created_at: datetime
-    update_at: datetime
-    is_active: bool
 
     class Settings:
         name: ClassVar[str] = "projects"
+        use_revision: ClassVar[bool] = True
         indexes: ClassVar[list[IndexModel]] = [
-            IndexModel([("description", TEXT), ("created_at", ASCENDING)])
+            IndexModel([("name", TEXT), ("description", TEXT)]),
+            IndexModel([("createdAt", ASCENDING), ("_id", ASCENDING)]),
+            # projects of an owner
+            IndexModel([("owner_id", ASCENDING), ("createdAt", ASCENDING)]),
         ]
@@ -0,0 +1,53 @@
+"""
+Slim read models for list and reference reads.
+
+Used with Beanie's `project()`: only the declared fields are fetched from
+Mongo and validated, so callers that need a few fields skip the cost of a
+full document (and `UserPublic` never loads the password hash). Every read
+model carries `id` and `created_at` so keyset cursors can be built from it.
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.models.enums import Role, TaskStatus
+
+
+class ReadModel(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    created_at: datetime = Field(alias="createdAt")
+
+
+class TaskSummary(ReadModel):
+    description: str
+    project_id: int
+    assigned_to: int
+    status: TaskStatus
+
+
+class ProjectSummary(ReadModel):
+    name: str
+    owner_id: int
+
+
+class UserPublic(ReadModel):
+    username: str
+    email: str
+    roles: Role
+    is_active: bool = Field(alias="isActive")
+
+
+class UserRef(ReadModel):
+    username: str
+
+
+class DocVersion(ReadModel):
+    """Only what conditional reads need to build a document's validators."""
+
+    updated_at: datetime = Field(alias="updatedAt")
+    revision_id: UUID | None = None
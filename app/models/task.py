@@ -1,4 +1,3 @@
-from datetime import datetime
 from typing import ClassVar
 
 from pymongo import ASCENDING, TEXT, IndexModel
@@ -12,12 +11,48 @@ class Task(BaseDoc):
     project_id: int
     assigned_to: int
     status: TaskStatus
-    created_at: datetime
-    update_at: datetime
-    is_active: bool
 
     class Settings:
         name: ClassVar[str] = "tasks"
+        # Opt-in optimistic concurrency: see atomic_update(expected_revision=).
+        use_revision: ClassVar[bool] = True
         indexes: ClassVar[list[IndexModel]] = [
-            IndexModel([("description", TEXT), ("created_at", ASCENDING)])
+            IndexModel([("description", TEXT)]),
+            # keyset pagination ordered by creation time
+            IndexModel([("createdAt", ASCENDING), ("_id", ASCENDING)]),
+            # tasks of a project; the status index cannot serve the
+            # createdAt sort when no status is given
+            IndexModel(
+                [
+                    ("project_id", ASCENDING),
+                    ("createdAt", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
+            # tasks of a project by status
+            IndexModel(
+                [
+                    ("project_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("createdAt", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
+            # tasks of an assignee
+            IndexModel(
+                [
+                    ("assigned_to", ASCENDING),
+                    ("createdAt", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
+            # tasks of an assignee by status
+            IndexModel(
+                [
+                    ("assigned_to", ASCENDING),
+                    ("status", ASCENDING),
+                    ("createdAt", ASCENDING),
+                    ("_id", ASCENDING),
+                ]
+            ),
         ]
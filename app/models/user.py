@@ -1,7 +1,6 @@
-from datetime import datetime
 from typing import ClassVar
 
-from pymongo import ASCENDING, TEXT, IndexModel
+from pymongo import ASCENDING, IndexModel
 
 from app.models.base import BaseDoc
 from app.models.enums import Role
@@ -12,12 +11,15 @@ class User(BaseDoc):
     email: str
     password: str
     roles: Role
-    created_at: datetime
-    updated_at: datetime
-    is_active: bool
+
+    # The password hash must not be copied into Redis.
+    cacheable: ClassVar[bool] = False
 
     class Settings:
         name: ClassVar[str] = "users"
+        use_revision: ClassVar[bool] = True
         indexes: ClassVar[list[IndexModel]] = [
-            IndexModel([("name", TEXT), ("created_at", ASCENDING)])
+            IndexModel([("username", ASCENDING)], unique=True),
+            IndexModel([("email", ASCENDING)], unique=True),
+            IndexModel([("createdAt", ASCENDING), ("_id", ASCENDING)]),
         ]
@@ -1,11 +1,21 @@
 from .audit import AuditRepository
+from .audit_sink import AuditSink, audit_sink_lifespan, get_audit_sink
+from .loader import DocumentLoader, get_loader, load_link, loader_scope, request_loaders
 from .project import ProjectRepository
 from .task import TaskRepository
 from .user import UserRepository
 
 __all__ = [
     "AuditRepository",
+    "AuditSink",
+    "DocumentLoader",
     "ProjectRepository",
     "TaskRepository",
     "UserRepository",
+    "audit_sink_lifespan",
+    "get_audit_sink",
+    "get_loader",
+    "load_link",
+    "loader_scope",
+    "request_loaders",
 ]
@@ -1,9 +1,45 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from datetime import datetime
 from typing import Any
 
 from beanie import PydanticObjectId
 
+from app.core.mongo import list_collection
 from app.models.audit import Audit
+from app.repositories.audit_sink import get_audit_sink
+from app.repositories.bulk import BulkResult, bulk_delete, bulk_insert, bulk_upsert
+from app.repositories.loader import fetch_many
+from app.repositories.pagination import (
+    CursorPage,
+    ReadT,
+    SortKey,
+    iter_keyset_batches,
+    keyset_page,
+    keyset_page_raw,
+)
+from app.repositories.updates import atomic_update
+
+
+def range_filter(
+    *,
+    start: datetime | None,
+    end: datetime | None,
+    actor: PydanticObjectId | str | None,
+    action: str | None,
+) -> dict[str, Any]:
+    query: dict[str, Any] = {}
+    if actor is not None:
+        query["actor.$id"] = PydanticObjectId(actor)
+    if action is not None:
+        query["action"] = action
+    created: dict[str, datetime] = {}
+    if start is not None:
+        created["$gte"] = start
+    if end is not None:
+        created["$lt"] = end
+    if created:
+        query["createdAt"] = created
+    return query
 
 
 class AuditRepository:
@@ -13,24 +49,136 @@ class AuditRepository:
         await audit.insert()
         return audit
 
+    async def create_buffered(self, audit: Audit) -> None:
+        """
+        Hand `audit` to the batched audit sink instead of waiting for its
+        insert. Falls back to a direct insert when no sink is running.
+        """
+        sink = get_audit_sink()
+        if sink is None:
+            await self.create(audit)
+            return
+        await sink.emit(audit)
+
     async def get(self, id: PydanticObjectId | str) -> Audit | None:
         doc: Audit | None = await Audit.get(id)
         return doc
 
+    async def list_page(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[Audit]:
+        """Keyset-paginated listing; pass `next_cursor` back to get the next page."""
+        return await keyset_page(Audit, cursor=cursor, limit=limit, order_by=order_by)
+
+    async def find_range(
+        self,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        actor: PydanticObjectId | str | None = None,
+        action: str | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        descending: bool = True,
+    ) -> CursorPage[Audit]:
+        """
+        Audit events with `start <= createdAt < end`, optionally for one actor
+        and/or action, newest first by default. Keyset-paginated on
+        (createdAt, _id), which the audit indexes cover with or without the
+        actor/action filters.
+        """
+        filters = range_filter(start=start, end=end, actor=actor, action=action)
+        return await keyset_page(
+            Audit,
+            cursor=cursor,
+            limit=limit,
+            order_by="createdAt",
+            descending=descending,
+            filters=filters,
+        )
+
+    async def count_range(
+        self,
+        *,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        actor: PydanticObjectId | str | None = None,
+        action: str | None = None,
+    ) -> int:
+        filters = range_filter(start=start, end=end, actor=actor, action=action)
+        return await list_collection(Audit).count_documents(filters)
+
+    async def get_projected(
+        self, id: PydanticObjectId | str, projection: type[ReadT]
+    ) -> ReadT | None:
+        """Load only the fields of a slim read model for one audit."""
+        query = Audit.find_one({"_id": PydanticObjectId(id)})
+        doc: ReadT | None = await query.project(projection)
+        return doc
+
+    async def list_projected(
+        self,
+        projection: type[ReadT],
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[ReadT]:
+        """Like list_page(), fetching and validating only `projection`'s fields."""
+        return await keyset_page(
+            Audit,
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+            projection=projection,
+        )
+
+    async def list_raw(
+        self,
+        *,
+        fields: Sequence[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[dict[str, Any]]:
+        """
+        Like list_page(), returning raw Mongo documents without validation.
+        Trusted internal reads only (see keyset_page_raw).
+        """
+        return await keyset_page_raw(
+            Audit, fields=fields, cursor=cursor, limit=limit, order_by=order_by
+        )
+
+    def iter_batches(
+        self, *, batch_size: int = 500, order_by: SortKey = "_id"
+    ) -> AsyncIterator[list[Audit]]:
+        """Stream the whole collection in batches with constant memory."""
+        return iter_keyset_batches(Audit, batch_size=batch_size, order_by=order_by)
+
+    async def get_many(
+        self, ids: Iterable[PydanticObjectId | str]
+    ) -> dict[PydanticObjectId, Audit]:
+        """One $in query for many audit rows; missing ids are left out."""
+        return await fetch_many(Audit, ids)
+
     async def list(self, *, skip: int = 0, limit: int = 100) -> list[Audit]:
         items: list[Audit] = await Audit.find_all().skip(skip).limit(limit).to_list()
         return items
 
     async def update(
-        self, id: PydanticObjectId | str, patch: Mapping[str, Any]
+        self,
+        id: PydanticObjectId | str,
+        patch: Mapping[str, Any],
     ) -> Audit | None:
-        doc: Audit | None = await Audit.get(id)
-        if doc is None:
-            return None
-        for k, v in patch.items():
-            setattr(doc, k, v)
-        await doc.save()
-        return doc
+        """
+        Apply `patch` atomically in one round trip (see `atomic_update`).
+        Returns None when the document does not exist.
+        """
+        return await atomic_update(Audit, id, patch)
 
     async def delete(self, id: PydanticObjectId | str) -> bool:
         doc = await Audit.get(id)
@@ -38,3 +186,33 @@ class AuditRepository:
             return False
         await doc.delete()
         return True
+
+    async def create_many(
+        self,
+        audits: Iterable[Audit],
+        *,
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        return await bulk_insert(Audit, audits, chunk_size=chunk_size, ordered=ordered)
+
+    async def upsert_many(
+        self,
+        audits: Iterable[Audit],
+        *,
+        key_fields: Sequence[str] = ("_id",),
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        return await bulk_upsert(
+            Audit,
+            audits,
+            key_fields=key_fields,
+            chunk_size=chunk_size,
+            ordered=ordered,
+        )
+
+    async def delete_many(
+        self, ids: Iterable[PydanticObjectId | str], *, chunk_size: int | None = None
+    ) -> BulkResult:
+        return await bulk_delete(Audit, ids, chunk_size=chunk_size)
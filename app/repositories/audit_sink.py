@@ -0,0 +1,210 @@
+import asyncio
+import contextlib
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TextIO, cast
+
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.parsing import parse_obj
+from bson import json_util
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.models.audit import Audit
+from app.repositories.bulk import bulk_insert
+
+logger = get_logger(__name__)
+
+
+class AuditSink:
+    """
+    Buffers Audit events in memory and writes them with insert_many.
+
+    A batch is flushed once it reaches `batch_size` events or `flush_interval`
+    seconds after its first event. The buffer is bounded: emit() waits for
+    room (backpressure) unless a spill file is configured, in which case
+    overflow and batches that fail to insert are appended to that file as
+    Extended JSON and replayed after the next successful flush. Delivery of
+    spilled events is at-least-once.
+    """
+
+    def __init__(
+        self,
+        *,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        max_queue: int | None = None,
+        spill_path: str | None = None,
+    ) -> None:
+        self.batch_size = batch_size or settings.audit_batch_size
+        self.flush_interval = flush_interval or settings.audit_flush_interval_seconds
+        self.spill_path = spill_path or settings.audit_spill_path
+        self._queue: asyncio.Queue[Audit] = asyncio.Queue(
+            maxsize=max_queue or settings.audit_queue_max
+        )
+        self._task: asyncio.Task[None] | None = None
+        self._pending: list[Audit] = []
+        self._inflight: asyncio.Future[bool] | None = None
+        self._spill_lock = asyncio.Lock()
+        self.written = 0
+        self.spilled = 0
+        self.failed = 0
+
+    async def emit(self, audit: Audit) -> None:
+        if self.spill_path and self._queue.full():
+            await self._spill([audit])
+            return
+        await self._queue.put(audit)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="audit-sink")
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out everything still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+        batch, self._pending = self._pending, []
+        flushed = await self._flush(batch)
+        while not self._queue.empty():
+            flushed = await self._flush(self._drain(self.batch_size))
+        if flushed:
+            await self._replay_spill()
+
+    def _drain(self, limit: int) -> list[Audit]:
+        batch: list[Audit] = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        await self._replay_spill()
+        while True:
+            self._pending.append(await self._queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._pending) < self.batch_size:
+                self._pending.extend(self._drain(self.batch_size - len(self._pending)))
+                remaining = deadline - loop.time()
+                if len(self._pending) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                self._pending.append(event)
+
+            batch, self._pending = self._pending, []
+            # Shielded so stop() cancelling the loop never abandons a write
+            # half way; stop() waits for it instead.
+            self._inflight = asyncio.ensure_future(self._flush(batch))
+            flushed = await asyncio.shield(self._inflight)
+            self._inflight = None
+            if flushed:
+                await self._replay_spill()
+
+    async def _flush(self, batch: list[Audit]) -> bool:
+        if not batch:
+            return True
+        try:
+            result = await bulk_insert(Audit, batch)
+        except Exception as e:
+            logger.warning("Audit flush of %d events failed: %s", len(batch), e)
+            if self.spill_path:
+                await self._spill(batch)
+            else:
+                self.failed += len(batch)
+            return False
+        for item in result.errors:
+            logger.error("Audit event %s rejected: %s", item.id, item.error)
+        self.failed += len(result.errors)
+        self.written += len(batch) - len(result.errors)
+        return True
+
+    async def _spill(self, batch: list[Audit]) -> None:
+        lines = "".join(
+            json_util.dumps(get_dict(audit, to_db=True)) + "\n" for audit in batch
+        )
+        path = cast(str, self.spill_path)
+        async with self._spill_lock:
+            await asyncio.to_thread(_append, path, lines)
+        self.spilled += len(batch)
+
+    async def _replay_spill(self) -> None:
+        if not self.spill_path:
+            return
+        replay = f"{self.spill_path}.replay"
+        # A leftover replay file means a previous replay was interrupted; finish
+        # it first (delivery is at-least-once).
+        if not os.path.exists(replay):
+            if not os.path.exists(self.spill_path):
+                return
+            async with self._spill_lock:
+                # Take the file over atomically so new spills start a fresh one.
+                await asyncio.to_thread(os.replace, self.spill_path, replay)
+        # Streamed a batch at a time: the spill can have grown through a
+        # long outage and must not be loaded into memory whole.
+        replayed = 0
+        f = await asyncio.to_thread(open, replay, encoding="utf-8")
+        try:
+            while lines := await asyncio.to_thread(_read_batch, f, self.batch_size):
+                await self._flush(
+                    [
+                        cast(Audit, parse_obj(Audit, json_util.loads(line)))
+                        for line in lines
+                    ]
+                )
+                replayed += len(lines)
+        finally:
+            await asyncio.to_thread(f.close)
+        logger.info("Replayed %d spilled audit events", replayed)
+        await asyncio.to_thread(os.remove, replay)
+
+
+def _append(path: str, lines: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_batch(f: TextIO, size: int) -> list[str]:
+    """The next `size` non-blank lines of `f`; fewer at the end of the file."""
+    lines: list[str] = []
+    for line in f:
+        if line.strip():
+            lines.append(line)
+            if len(lines) == size:
+                break
+    return lines
+
+
+_sink: AuditSink | None = None
+
+
+def get_audit_sink() -> AuditSink | None:
+    """The running audit sink, or None outside the app lifespan."""
+    return _sink
+
+
+@asynccontextmanager
+async def audit_sink_lifespan() -> AsyncIterator[None]:
+    """
+    Start the audit sink on startup; flush and stop it on shutdown.
+    Must run inside beanie_lifespan.
+    """
+    global _sink
+    _sink = AuditSink()
+    _sink.start()
+    try:
+        yield
+    finally:
+        await _sink.stop()
+        _sink = None
@@ -0,0 +1,342 @@
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+from uuid import uuid4
+
+import bson
+from beanie import PydanticObjectId
+from beanie.odm.utils.dump import get_dict
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.models.base import BaseDoc, utcnow
+
+DocT = TypeVar("DocT", bound=BaseDoc)
+
+_NOT_EXECUTED = "not executed: an earlier write in the ordered batch failed"
+
+
+@dataclass(slots=True)
+class BulkItemResult:
+    """Outcome of a single item of a bulk call, addressed by its input index."""
+
+    index: int
+    id: PydanticObjectId | None = None
+    ok: bool = True
+    # "inserted", "updated", "deleted" or "missing" when ok, None otherwise.
+    status: str | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class BulkResult:
+    items: list[BulkItemResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(item.ok for item in self.items)
+
+    @property
+    def errors(self) -> list[BulkItemResult]:
+        return [item for item in self.items if not item.ok]
+
+    def count(self, status: str) -> int:
+        return sum(1 for item in self.items if item.status == status)
+
+
+def _chunks(
+    items: Sequence[Any], size: int | None
+) -> Iterator[tuple[int, Sequence[Any]]]:
+    size = size or settings.database_bulk_chunk_size
+    if size < 1:
+        raise ValueError("chunk_size must be >= 1")
+    for start in range(0, len(items), size):
+        yield start, items[start : start + size]
+
+
+def _write_errors(exc: BulkWriteError) -> dict[int, str]:
+    return {
+        err["index"]: f"{err.get('code')}: {err.get('errmsg')}"
+        for err in exc.details.get("writeErrors", [])
+    }
+
+
+async def _prepare(doc: BaseDoc) -> dict[str, Any]:
+    """
+    Validate and stamp a document the way insert()/save() would.
+
+    Collection-level writes bypass Beanie's before_event hooks, so the BaseDoc
+    timestamps and revision ids are set here and every document gets its _id
+    client-side, which is what lets us report ids per item.
+    """
+    if doc.id is None:
+        doc.id = PydanticObjectId(ObjectId())
+    if doc.get_settings().use_revision:
+        doc.revision_id = uuid4()
+    doc.updated_at = utcnow()
+    await doc.validate_self()
+    body: dict[str, Any] = get_dict(
+        doc, to_db=True, keep_nulls=doc.get_settings().keep_nulls
+    )
+    return body
+
+
+def _apply_ordered_failure(
+    result: BulkResult, positions: Sequence[int], errors: dict[int, str]
+) -> None:
+    # With ordered=True the server stops at the first failing op; everything
+    # after it in the chunk was never attempted.
+    for position in positions[min(errors) + 1 :]:
+        item = result.items[position]
+        item.ok, item.status, item.error = False, None, _NOT_EXECUTED
+
+
+def _apply_write_errors(
+    result: BulkResult, positions: Sequence[int], errors: dict[int, str]
+) -> None:
+    # Write error indexes count the ops sent, not the input items.
+    for offset, message in errors.items():
+        item = result.items[positions[offset]]
+        item.ok, item.status, item.error = False, None, message
+
+
+def _reject(result: BulkResult, doc: BaseDoc, error: ValueError) -> None:
+    """Record a document that failed validation; it is never sent."""
+    result.items.append(
+        BulkItemResult(index=len(result.items), id=doc.id, ok=False, error=str(error))
+    )
+
+
+async def bulk_insert(
+    model: type[DocT],
+    docs: Iterable[DocT],
+    *,
+    chunk_size: int | None = None,
+    ordered: bool = False,
+) -> BulkResult:
+    """
+    Insert documents with one insert_many per chunk.
+
+    Documents that fail validation are reported as failed items and skipped;
+    with ordered=True nothing after them is written.
+    """
+    pending = list(docs)
+    result = BulkResult()
+    collection = model.get_pymongo_collection()
+
+    for _, chunk in _chunks(pending, chunk_size):
+        payload = []
+        # Index in result.items of each document in payload.
+        positions: list[int] = []
+        stopped = False
+        for doc in chunk:
+            try:
+                body = await _prepare(doc)
+            except ValueError as e:
+                _reject(result, doc, e)
+                if ordered:
+                    stopped = True
+                    break
+                continue
+            payload.append(body)
+            positions.append(len(result.items))
+            result.items.append(
+                BulkItemResult(index=len(result.items), id=doc.id, status="inserted")
+            )
+        if payload:
+            try:
+                await collection.insert_many(payload, ordered=ordered)
+            except BulkWriteError as e:
+                errors = _write_errors(e)
+                _apply_write_errors(result, positions, errors)
+                if ordered:
+                    _apply_ordered_failure(result, positions, errors)
+                    stopped = True
+        if stopped:
+            _skip_rest(result, pending, len(result.items))
+            break
+    return result
+
+
+def _upsert_op(
+    body: dict[str, Any], key_fields: Sequence[str]
+) -> tuple[dict[str, Any], UpdateOne]:
+    doc_id = body.pop("_id")
+    created_at = body.pop("createdAt")
+    missing = [k for k in key_fields if k != "_id" and k not in body]
+    if missing:
+        raise ValueError(f"upsert key fields not on document: {missing}")
+    key = {k: (doc_id if k == "_id" else body[k]) for k in key_fields}
+    on_insert = {"createdAt": created_at}
+    if "_id" not in key:
+        on_insert["_id"] = doc_id
+    return key, UpdateOne(key, {"$set": body, "$setOnInsert": on_insert}, upsert=True)
+
+
+async def bulk_upsert(
+    model: type[DocT],
+    docs: Iterable[DocT],
+    *,
+    key_fields: Sequence[str] = ("_id",),
+    chunk_size: int | None = None,
+    ordered: bool = False,
+) -> BulkResult:
+    """
+    Insert-or-update documents matched on `key_fields` with bulk_write.
+
+    createdAt is only written when the document is inserted; updatedAt is
+    always refreshed. When matching on fields other than _id, the stored _id
+    of each updated document is looked up after the write, so every item
+    reports the id it touched. Documents that fail validation or lack a key
+    field are reported as failed items and skipped; with ordered=True
+    nothing after them is written.
+    """
+    pending = list(docs)
+    result = BulkResult()
+    collection = model.get_pymongo_collection()
+
+    for _, chunk in _chunks(pending, chunk_size):
+        ops = []
+        keys = []
+        # Index in result.items of each document in ops.
+        positions: list[int] = []
+        stopped = False
+        for doc in chunk:
+            try:
+                key, op = _upsert_op(await _prepare(doc), key_fields)
+            except ValueError as e:
+                _reject(result, doc, e)
+                if ordered:
+                    stopped = True
+                    break
+                continue
+            ops.append(op)
+            keys.append(key)
+            positions.append(len(result.items))
+            # Updates matched on other fields get their stored _id below.
+            result.items.append(
+                BulkItemResult(
+                    index=len(result.items),
+                    id=doc.id if "_id" in key else None,
+                    status="updated",
+                )
+            )
+        if not ops:
+            if stopped:
+                _skip_rest(result, pending, len(result.items))
+                break
+            continue
+
+        upserted: dict[int, Any]
+        errors: dict[int, str] = {}
+        try:
+            write = await collection.bulk_write(ops, ordered=ordered)
+            upserted = write.upserted_ids or {}
+        except BulkWriteError as e:
+            errors = _write_errors(e)
+            upserted = {u["index"]: u["_id"] for u in e.details.get("upserted", [])}
+
+        for offset, upserted_id in upserted.items():
+            item = result.items[positions[offset]]
+            item.status, item.id = "inserted", PydanticObjectId(upserted_id)
+        _apply_write_errors(result, positions, errors)
+        if errors and ordered:
+            _apply_ordered_failure(result, positions, errors)
+            stopped = True
+        if "_id" not in key_fields:
+            await _resolve_updated_ids(
+                collection, [result.items[i] for i in positions], keys
+            )
+        if stopped:
+            _skip_rest(result, pending, len(result.items))
+            break
+    return result
+
+
+def _key_bytes(key: Mapping[str, Any]) -> bytes:
+    # BSON-encoded, so key values compare the way Mongo matches them
+    # (ObjectIds, datetimes, nested documents) and are hashable.
+    return bson.encode(dict(key))
+
+
+async def _resolve_updated_ids(
+    collection: Any, items: Sequence[BulkItemResult], keys: Sequence[dict[str, Any]]
+) -> None:
+    """
+    Fill in the _id of documents updated through a non-_id key, with one
+    projected lookup of the chunk's keys.
+    """
+    wanted: dict[bytes, list[BulkItemResult]] = {}
+    lookups = []
+    for item, key in zip(items, keys, strict=True):
+        if item.ok and item.status == "updated":
+            wanted.setdefault(_key_bytes(key), []).append(item)
+            lookups.append(key)
+    if not lookups:
+        return
+    fields = list(lookups[0])
+    async for doc in collection.find({"$or": lookups}, dict.fromkeys(fields, 1)):
+        for item in wanted.get(_key_bytes({f: doc.get(f) for f in fields}), []):
+            item.id = PydanticObjectId(doc["_id"])
+
+
+async def bulk_delete(
+    model: type[DocT],
+    ids: Iterable[PydanticObjectId | str],
+    *,
+    chunk_size: int | None = None,
+) -> BulkResult:
+    """
+    Delete documents by id with one delete_many per chunk.
+
+    A projected lookup of the chunk's ids runs first so each item can be
+    reported as "deleted" or "missing". Malformed ids fail their own item
+    only.
+    """
+    pending = list(ids)
+    result = BulkResult()
+    collection = model.get_pymongo_collection()
+
+    for _, chunk in _chunks(pending, chunk_size):
+        parsed = [_object_id(i) for i in chunk]
+        valid = [i for i in parsed if i is not None]
+        found = {
+            d["_id"] async for d in collection.find({"_id": {"$in": valid}}, {"_id": 1})
+        }
+        if found:
+            await collection.delete_many({"_id": {"$in": list(found)}})
+        for raw, doc_id in zip(chunk, parsed, strict=True):
+            if doc_id is None:
+                result.items.append(
+                    BulkItemResult(
+                        index=len(result.items), ok=False, error=f"invalid id {raw!r}"
+                    )
+                )
+                continue
+            result.items.append(
+                BulkItemResult(
+                    index=len(result.items),
+                    id=doc_id,
+                    status="deleted" if doc_id in found else "missing",
+                )
+            )
+    return result
+
+
+def _object_id(value: PydanticObjectId | str) -> PydanticObjectId | None:
+    try:
+        return PydanticObjectId(value)
+    except (InvalidId, TypeError):
+        return None
+
+
+def _skip_rest(result: BulkResult, docs: Sequence[BaseDoc], start: int) -> None:
+    for doc in docs[start:]:
+        result.items.append(
+            BulkItemResult(
+                index=len(result.items), id=doc.id, ok=False, error=_NOT_EXECUTED
+            )
+        )
@@ -0,0 +1,149 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime
+from enum import Enum
+from typing import Any, Literal
+
+from bson import DBRef, ObjectId
+
+from app.core.config import settings
+from app.core.mongo import list_collection
+from app.models.base import BaseDoc
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+# Never leave the database through an export.
+_EXCLUDED = {"revision_id", "password"}
+
+
+def export_columns(model: type[BaseDoc]) -> list[str]:
+    """Stored field names of `model` in declaration order, `_id` first."""
+    return ["_id"] + [
+        info.alias or name
+        for name, info in model.model_fields.items()
+        if name != "id" and name not in _EXCLUDED
+    ]
+
+
+def _plain(value: Any) -> Any:
+    """Map BSON-only types to JSON/CSV friendly scalars."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, DBRef):
+        return str(value.id)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+_json_encoder = json.JSONEncoder(
+    default=_plain, ensure_ascii=False, separators=(",", ":")
+)
+
+
+async def iter_raw(
+    model: type[BaseDoc],
+    *,
+    columns: list[str],
+    filters: Mapping[str, Any] | None = None,
+    batch_size: int | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Yield raw documents of `model` in batches straight off the driver cursor,
+    without building Beanie models. Only `columns` are fetched.
+    """
+    size = batch_size or settings.export_batch_size
+    projection = dict.fromkeys(columns, 1)
+    cursor = list_collection(model).find(
+        dict(filters or {}), projection, batch_size=size
+    )
+    batch: list[dict[str, Any]] = []
+    async for raw in cursor:
+        batch.append(raw)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def ndjson_chunks(
+    batches: AsyncIterator[list[dict[str, Any]]], columns: list[str]
+) -> AsyncIterator[bytes]:
+    """One NDJSON chunk per batch; every line carries all `columns`."""
+    encode = _json_encoder.encode
+    async for batch in batches:
+        lines = [encode({c: raw.get(c) for c in columns}) for raw in batch]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def csv_chunks(
+    batches: AsyncIterator[list[dict[str, Any]]], columns: list[str]
+) -> AsyncIterator[bytes]:
+    """A header row, then one CSV chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for batch in batches:
+        for raw in batch:
+            writer.writerow(_csv_cell(raw.get(c)) for c in columns)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: the collection was empty.
+        yield buffer.getvalue().encode()
+
+
+def _csv_cell(value: Any) -> Any:
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, list | dict):
+        return _json_encoder.encode(value)
+    return _plain(value)
+
+
+async def gzip_chunks(
+    chunks: AsyncIterator[bytes], *, level: int = 6
+) -> AsyncIterator[bytes]:
+    """Compress a chunk stream into one gzip member, chunk by chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(
+    model: type[BaseDoc],
+    fmt: ExportFormat,
+    *,
+    filters: Mapping[str, Any] | None = None,
+    gzip: bool = False,
+    batch_size: int | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Serialized export of `model` as an async byte stream for StreamingResponse.
+
+    Documents flow cursor -> batch -> encoded chunk -> (gzip) -> client, so at
+    most one batch is held in memory regardless of collection size.
+    """
+    columns = export_columns(model)
+    batches = iter_raw(model, columns=columns, filters=filters, batch_size=batch_size)
+    chunks = (
+        ndjson_chunks(batches, columns)
+        if fmt == "ndjson"
+        else csv_chunks(batches, columns)
+    )
+    return gzip_chunks(chunks) if gzip else chunks
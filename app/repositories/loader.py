@@ -0,0 +1,167 @@
+"""
+Batched reference loading (the DataLoader pattern).
+
+Rendering a page of audit rows with their actors, one `get()` per row costs
+one query per row. A DocumentLoader instead collects every `load()` made in
+the same event-loop tick and resolves them with one `_id: {$in: [...]}`
+query (one MGET first when CACHE_ENABLED is set), and memoizes the results,
+so each id is fetched at most once per request:
+
+    actors = await asyncio.gather(*(load_link(audit.actor) for audit in page))
+    owners = await get_loader(User).load_many(ids)
+
+Loaders are scoped to the request by the `request_loaders` dependency; a
+memo that outlived the request would serve stale documents.
+"""
+
+import asyncio
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Generic, TypeVar
+
+from beanie import Link, PydanticObjectId
+
+from app.core.cache import DocumentCache, get_document_cache
+from app.models.base import BaseDoc
+
+DocT = TypeVar("DocT", bound=BaseDoc)
+
+
+async def fetch_many(
+    model: type[DocT],
+    ids: Iterable[PydanticObjectId | str],
+    *,
+    cache: DocumentCache[DocT] | None = None,
+) -> dict[PydanticObjectId, DocT]:
+    """
+    Documents of `model` by id with one `$in` query, going through `cache`
+    when given. Ids that do not exist are left out of the result.
+    """
+    unique = list(dict.fromkeys(PydanticObjectId(i) for i in ids))
+    if not unique:
+        return {}
+
+    async def load(batch: list[PydanticObjectId]) -> dict[PydanticObjectId, DocT]:
+        docs: list[DocT] = await model.find({"_id": {"$in": batch}}).to_list()
+        return {doc.id: doc for doc in docs if doc.id is not None}
+
+    if cache is None:
+        return await load(unique)
+    return await cache.get_many(unique, load)
+
+
+class DocumentLoader(Generic[DocT]):
+    """
+    Coalesces `load()` calls made within one event-loop tick into a single
+    fetch_many() and memoizes each id's result (None when it does not exist).
+    Event-loop-only; not thread-safe.
+    """
+
+    def __init__(
+        self, model: type[DocT], *, cache: DocumentCache[DocT] | None = None
+    ) -> None:
+        self.model = model
+        self._cache = cache
+        self._memo: dict[PydanticObjectId, asyncio.Future[DocT | None]] = {}
+        self._queue: list[PydanticObjectId] = []
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, id: PydanticObjectId | str) -> DocT | None:
+        # Shielded: one caller giving up must not cancel the shared result.
+        return await asyncio.shield(self._future(PydanticObjectId(id)))
+
+    async def load_many(
+        self, ids: Iterable[PydanticObjectId | str]
+    ) -> list[DocT | None]:
+        """Results in the order of `ids`, None for ids that do not exist."""
+        futures = [self._future(PydanticObjectId(i)) for i in ids]
+        return list(await asyncio.shield(asyncio.gather(*futures)))
+
+    def prime(self, doc: DocT) -> None:
+        """Memoize a document the caller already holds."""
+        if doc.id is not None and doc.id not in self._memo:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(doc)
+            self._memo[doc.id] = future
+
+    def _future(self, id: PydanticObjectId) -> "asyncio.Future[DocT | None]":
+        future = self._memo.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._memo[id] = loop.create_future()
+            if not self._queue:
+                # Runs after every callback already scheduled for this tick,
+                # so loads from sibling tasks join the same batch.
+                loop.call_soon(self._dispatch)
+            self._queue.append(id)
+        return future
+
+    def _dispatch(self) -> None:
+        batch, self._queue = self._queue, []
+        task = asyncio.create_task(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: list[PydanticObjectId]) -> None:
+        try:
+            docs = await fetch_many(self.model, batch, cache=self._cache)
+        except asyncio.CancelledError:
+            for id in batch:
+                self._memo.pop(id).cancel()
+            raise
+        except Exception as e:
+            # Forget the failed ids so a later load() retries them.
+            for id in batch:
+                future = self._memo.pop(id)
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+            return
+        for id in batch:
+            self._memo[id].set_result(docs.get(id))
+
+
+_loaders_var: ContextVar[dict[type[BaseDoc], DocumentLoader[Any]] | None] = ContextVar(
+    "loaders", default=None
+)
+
+
+def get_loader(model: type[DocT]) -> DocumentLoader[DocT]:
+    """
+    The current request's loader for `model`, using the shared document
+    cache when CACHE_ENABLED is set. Outside a request or loader_scope() a
+    fresh loader is returned on every call (batching still applies to loads
+    made through it, memoizing only for as long as it is kept).
+    """
+    loaders = _loaders_var.get()
+    if loaders is None:
+        return DocumentLoader(model, cache=get_document_cache(model))
+    loader = loaders.get(model)
+    if loader is None:
+        loader = loaders[model] = DocumentLoader(model, cache=get_document_cache(model))
+    return loader
+
+
+async def load_link(link: Link[DocT] | DocT) -> DocT | None:
+    """Resolve a Link field through the current request's loader."""
+    if not isinstance(link, Link):
+        return link  # already fetched
+    return await get_loader(link.document_class).load(link.ref.id)
+
+
+async def request_loaders() -> None:
+    """
+    App dependency giving each request its own loaders. Async, so the
+    context variable is set in the task that runs the endpoint.
+    """
+    _loaders_var.set({})
+
+
+@contextmanager
+def loader_scope() -> Iterator[None]:
+    """Share loaders (and their memo) across a block, e.g. in a job."""
+    token = _loaders_var.set({})
+    try:
+        yield
+    finally:
+        _loaders_var.reset(token)
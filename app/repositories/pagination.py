@@ -0,0 +1,242 @@
+import base64
+import json
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, Literal, TypeVar, cast, overload
+
+from beanie import PydanticObjectId
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from bson.errors import InvalidId
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING
+
+from app.core.mongo import list_collection
+from app.models.base import BaseDoc
+from app.models.projections import ReadModel
+
+DocT = TypeVar("DocT", bound=BaseDoc)
+ReadT = TypeVar("ReadT", bound=BaseModel)
+ItemT = TypeVar("ItemT")
+
+# Keyset orderings supported by the repositories. "_id" is the cheapest (it
+# rides the default _id index); "createdAt" pages in creation order and uses
+# _id as the tie-breaker so the ordering is total.
+SortKey = Literal["_id", "createdAt"]
+
+
+@dataclass(slots=True)
+class CursorPage(Generic[ItemT]):
+    """One page of a keyset-paginated listing.
+
+    `next_cursor` is an opaque token to pass back for the following page,
+    or None when the collection has been exhausted.
+    """
+
+    items: list[ItemT] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+def encode_cursor(
+    order_by: SortKey,
+    doc: BaseDoc | ReadModel | Mapping[str, Any],
+    *,
+    descending: bool = False,
+) -> str:
+    """
+    Build an opaque continuation token from the last document of a page,
+    given as a model, a read model or a raw Mongo document.
+    """
+    if isinstance(doc, Mapping):
+        # Typed as a plain mapping: mypy otherwise resolves .get() against
+        # Document.get for BaseDoc subclasses that are also mappings.
+        fields: Mapping[str, Any] = doc
+        doc_id, created_at = fields["_id"], fields.get("createdAt")
+    else:
+        doc_id, created_at = doc.id, doc.created_at
+    payload: dict[str, Any] = {"k": order_by, "id": str(doc_id)}
+    if descending:
+        payload["d"] = 1
+    if order_by == "createdAt":
+        if created_at is None:
+            raise ValueError("createdAt cursor needs the document's createdAt")
+        payload["ts"] = created_at.isoformat()
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(
+    order_by: SortKey, token: str, *, descending: bool = False
+) -> dict[str, Any]:
+    """Turn a continuation token back into the keyset filter for the next page."""
+    op = "$lt" if descending else "$gt"
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        if payload["k"] != order_by or bool(payload.get("d")) != descending:
+            raise ValueError("cursor was issued for a different ordering")
+        last_id = PydanticObjectId(payload["id"])
+        if order_by == "_id":
+            return {"_id": {op: last_id}}
+        last_ts = datetime.fromisoformat(payload["ts"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid pagination cursor: {e}")
+
+    return {
+        "$or": [
+            {"createdAt": {op: last_ts}},
+            {"createdAt": last_ts, "_id": {op: last_id}},
+        ]
+    }
+
+
+def _sort_spec(order_by: SortKey, descending: bool) -> list[tuple[str, int]]:
+    direction = DESCENDING if descending else ASCENDING
+    if order_by == "_id":
+        return [("_id", direction)]
+    return [("createdAt", direction), ("_id", direction)]
+
+
+def _page_query(
+    order_by: SortKey,
+    cursor: str | None,
+    descending: bool,
+    filters: Mapping[str, Any] | None,
+) -> dict[str, Any]:
+    clauses = [dict(filters)] if filters else []
+    if cursor:
+        clauses.append(decode_cursor(order_by, cursor, descending=descending))
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses} if clauses else {}
+
+
+def _cut(items: list[Any], limit: int, order_by: SortKey, descending: bool) -> Any:
+    # One extra item was fetched to learn whether another page exists
+    # without issuing a count.
+    if len(items) <= limit:
+        return CursorPage(items=items)
+    items = items[:limit]
+    next_cursor = encode_cursor(order_by, items[-1], descending=descending)
+    return CursorPage(items=items, next_cursor=next_cursor)
+
+
+@overload
+async def keyset_page(
+    model: type[DocT],
+    *,
+    cursor: str | None = ...,
+    limit: int = ...,
+    order_by: SortKey = ...,
+    descending: bool = ...,
+    filters: Mapping[str, Any] | None = ...,
+    projection: None = ...,
+) -> CursorPage[DocT]: ...
+
+
+@overload
+async def keyset_page(
+    model: type[DocT],
+    *,
+    cursor: str | None = ...,
+    limit: int = ...,
+    order_by: SortKey = ...,
+    descending: bool = ...,
+    filters: Mapping[str, Any] | None = ...,
+    projection: type[ReadT],
+) -> CursorPage[ReadT]: ...
+
+
+async def keyset_page(
+    model: type[DocT],
+    *,
+    cursor: str | None = None,
+    limit: int = 100,
+    order_by: SortKey = "_id",
+    descending: bool = False,
+    filters: Mapping[str, Any] | None = None,
+    projection: type[BaseModel] | None = None,
+) -> CursorPage[Any]:
+    """
+    Fetch one page of `model` after `cursor` using a range predicate on the
+    sort key instead of skip(), so page N costs the same as page 1.
+    `filters` is an extra Mongo query ANDed with the keyset predicate.
+    With `projection` (a read model such as TaskSummary) only its fields are
+    fetched and validated.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+
+    query = _page_query(order_by, cursor, descending, filters)
+    fields = get_projection(projection) if projection else None
+    # Raw find on the list collection (see list_collection) so the page can be
+    # served by a secondary; rows are then parsed exactly as Beanie would.
+    rows = (
+        await list_collection(model)
+        .find(query, fields)
+        .sort(_sort_spec(order_by, descending))
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    target = projection or model
+    items = [parse_obj(target, row) for row in rows]
+    return cast(CursorPage[Any], _cut(items, limit, order_by, descending))
+
+
+async def keyset_page_raw(
+    model: type[BaseDoc],
+    *,
+    fields: Sequence[str] | None = None,
+    cursor: str | None = None,
+    limit: int = 100,
+    order_by: SortKey = "_id",
+    descending: bool = False,
+    filters: Mapping[str, Any] | None = None,
+) -> CursorPage[dict[str, Any]]:
+    """
+    keyset_page() returning the driver's raw documents, without validation.
+
+    For trusted internal reads only: values keep their stored BSON types and
+    stored (aliased) field names. `fields` limits the stored fields fetched;
+    `_id` and the sort key are always included.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+
+    projection = None
+    if fields is not None:
+        projection = dict.fromkeys([*fields, "_id", "createdAt"], 1)
+    query = _page_query(order_by, cursor, descending, filters)
+    rows = (
+        await list_collection(model)
+        .find(query, projection)
+        .sort(_sort_spec(order_by, descending))
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    return cast(CursorPage[dict[str, Any]], _cut(rows, limit, order_by, descending))
+
+
+async def iter_keyset_batches(
+    model: type[DocT],
+    *,
+    batch_size: int = 500,
+    order_by: SortKey = "_id",
+    cursor: str | None = None,
+) -> AsyncIterator[list[DocT]]:
+    """
+    Walk the whole collection in `batch_size` chunks.
+
+    Each batch is an independent keyset query, so at most one batch is held in
+    memory and no server-side cursor is kept open between batches.
+    """
+    while True:
+        page = await keyset_page(
+            model, cursor=cursor, limit=batch_size, order_by=order_by
+        )
+        if page.items:
+            yield page.items
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
@@ -1,35 +1,176 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
 from typing import Any
+from uuid import UUID
 
 from beanie import PydanticObjectId
 
+from app.core.cache import DocumentCache, get_document_cache
 from app.models.project import Project
+from app.models.projections import DocVersion
+from app.repositories.bulk import BulkResult, bulk_delete, bulk_insert, bulk_upsert
+from app.repositories.loader import fetch_many
+from app.repositories.pagination import (
+    CursorPage,
+    ReadT,
+    SortKey,
+    iter_keyset_batches,
+    keyset_page,
+    keyset_page_raw,
+)
+from app.repositories.search import SearchPage, text_search
+from app.repositories.updates import atomic_update
 
 
 class ProjectRepository:
     """Repository for Project documents."""
 
+    def __init__(self, *, cache: DocumentCache[Project] | None = None) -> None:
+        # Falls back to the shared cache when CACHE_ENABLED is set.
+        self._cache = cache or get_document_cache(Project)
+
     async def create(self, project: Project) -> Project:
         await project.insert()
         return project
 
     async def get(self, id: PydanticObjectId | str) -> Project | None:
+        if self._cache is not None:
+            return await self._cache.get(id, lambda: Project.get(id))
         doc: Project | None = await Project.get(id)
         return doc
 
+    async def list_page(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[Project]:
+        """Keyset-paginated listing; pass `next_cursor` back to get the next page."""
+        return await keyset_page(Project, cursor=cursor, limit=limit, order_by=order_by)
+
+    async def list_by_owner(
+        self, owner_id: int, *, cursor: str | None = None, limit: int = 100
+    ) -> CursorPage[Project]:
+        """Projects of one owner in creation order."""
+        return await keyset_page(
+            Project,
+            cursor=cursor,
+            limit=limit,
+            order_by="createdAt",
+            filters={"owner_id": owner_id},
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        owner_id: int | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> SearchPage[Project]:
+        """Full-text search over project names and descriptions, best match first."""
+        filters = {"owner_id": owner_id} if owner_id is not None else None
+        return await text_search(
+            Project, query, filters=filters, cursor=cursor, limit=limit
+        )
+
+    async def get_projected(
+        self, id: PydanticObjectId | str, projection: type[ReadT]
+    ) -> ReadT | None:
+        """Load only the fields of a slim read model for one project."""
+        query = Project.find_one({"_id": PydanticObjectId(id)})
+        doc: ReadT | None = await query.project(projection)
+        return doc
+
+    async def list_projected(
+        self,
+        projection: type[ReadT],
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[ReadT]:
+        """Like list_page(), fetching and validating only `projection`'s fields."""
+        return await keyset_page(
+            Project,
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+            projection=projection,
+        )
+
+    async def list_raw(
+        self,
+        *,
+        fields: Sequence[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[dict[str, Any]]:
+        """
+        Like list_page(), returning raw Mongo documents without validation.
+        Trusted internal reads only (see keyset_page_raw).
+        """
+        return await keyset_page_raw(
+            Project, fields=fields, cursor=cursor, limit=limit, order_by=order_by
+        )
+
+    def iter_batches(
+        self, *, batch_size: int = 500, order_by: SortKey = "_id"
+    ) -> AsyncIterator[list[Project]]:
+        """Stream the whole collection in batches with constant memory."""
+        return iter_keyset_batches(Project, batch_size=batch_size, order_by=order_by)
+
+    async def get_version(self, id: PydanticObjectId | str) -> DocVersion | None:
+        """
+        Just enough of one project to answer a conditional read: taken from the
+        cache when it holds the project, otherwise a projection of its revision
+        id and updatedAt.
+        """
+        if self._cache is not None:
+            found, doc = await self._cache.peek(id)
+            if found:
+                if doc is None:
+                    return None
+                return DocVersion.model_validate(
+                    {
+                        "_id": doc.id,
+                        "createdAt": doc.created_at,
+                        "updatedAt": doc.updated_at,
+                        "revision_id": doc.revision_id,
+                    }
+                )
+        return await self.get_projected(id, DocVersion)
+
+    async def get_many(
+        self, ids: Iterable[PydanticObjectId | str]
+    ) -> dict[PydanticObjectId, Project]:
+        """
+        Many projects by id in one $in query, cached ones read from the cache in
+        one MGET. Missing ids are left out; see also get_loader().
+        """
+        return await fetch_many(Project, ids, cache=self._cache)
+
     async def list(self, *, skip: int = 0, limit: int = 100) -> list[Project]:
         item: list[Project] = await Project.find_all().skip(skip).limit(limit).to_list()
         return item
 
     async def update(
-        self, id: PydanticObjectId | str, patch: Mapping[str, Any]
+        self,
+        id: PydanticObjectId | str,
+        patch: Mapping[str, Any],
+        *,
+        expected_revision: UUID | None = None,
     ) -> Project | None:
-        doc: Project | None = await Project.get(id)
-        if doc is None:
-            return None
-        for k, v in patch.items():
-            setattr(doc, k, v)
-        await doc.save()
+        """
+        Apply `patch` atomically in one round trip (see `atomic_update`).
+        Returns None when the document does not exist.
+        """
+        doc = await atomic_update(
+            Project, id, patch, expected_revision=expected_revision
+        )
+        if self._cache is not None:
+            await self._cache.invalidate(id)
         return doc
 
     async def delete(self, id: PydanticObjectId | str) -> bool:
@@ -37,4 +178,44 @@ class ProjectRepository:
         if doc is None:
             return False
         await doc.delete()
+        if self._cache is not None:
+            await self._cache.invalidate(id)
         return True
+
+    async def create_many(
+        self,
+        projects: Iterable[Project],
+        *,
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        return await bulk_insert(
+            Project, projects, chunk_size=chunk_size, ordered=ordered
+        )
+
+    async def upsert_many(
+        self,
+        projects: Iterable[Project],
+        *,
+        key_fields: Sequence[str] = ("_id",),
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        result = await bulk_upsert(
+            Project,
+            projects,
+            key_fields=key_fields,
+            chunk_size=chunk_size,
+            ordered=ordered,
+        )
+        if self._cache is not None:
+            await self._cache.invalidate(*(item.id for item in result.items))
+        return result
+
+    async def delete_many(
+        self, ids: Iterable[PydanticObjectId | str], *, chunk_size: int | None = None
+    ) -> BulkResult:
+        result = await bulk_delete(Project, ids, chunk_size=chunk_size)
+        if self._cache is not None:
+            await self._cache.invalidate(*(item.id for item in result.items))
+        return result
@@ -0,0 +1,308 @@
+import asyncio
+import time
+from collections.abc import Iterable, Mapping
+from typing import Any, cast
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
+
+from app.core.logging import get_logger
+from app.core.redis import acquire_lock, get_redis, release_lock
+from app.models.enums import TaskStatus
+from app.models.task import Task
+
+logger = get_logger(__name__)
+
+# Stored fields the task counters are derived from.
+COUNTED_FIELDS = ("project_id", "assigned_to", "status")
+OPEN_STATUSES = (TaskStatus.ASSIGNED.value, TaskStatus.PENDING.value)
+
+# Hash of "<project_id>:<status>" -> number of tasks.
+BY_PROJECT_STATUS_KEY = "stats:tasks:by_project_status"
+# Hash of "<assigned_to>" -> number of open (not completed) tasks.
+OPEN_BY_ASSIGNEE_KEY = "stats:tasks:open_by_assignee"
+# Present while the hashes are known to be in sync with the collection.
+# Cleared when a write could not be counted exactly; the next read rebuilds.
+BUILT_KEY = "stats:tasks:built"
+# Bumped with every counted write and stale mark. A rebuild only sets
+# BUILT_KEY when it did not move while the aggregation ran.
+EPOCH_KEY = "stats:tasks:epoch"
+# Held by the one process rebuilding stale counters.
+REBUILD_LOCK_KEY = "stats:tasks:rebuild_lock"
+_REBUILD_LOCK_MS = 30_000
+# How long a reader that lost the rebuild race waits for the winner.
+_REBUILD_WAIT_SECONDS = 5.0
+_REBUILD_POLL_SECONDS = 0.05
+
+_REPORT_PIPELINE: list[dict[str, Any]] = [
+    {
+        "$facet": {
+            "byProjectStatus": [
+                {
+                    "$group": {
+                        "_id": {"project": "$project_id", "status": "$status"},
+                        "count": {"$sum": 1},
+                    }
+                }
+            ],
+            "openByAssignee": [
+                {"$match": {"status": {"$in": list(OPEN_STATUSES)}}},
+                {"$group": {"_id": "$assigned_to", "count": {"$sum": 1}}},
+            ],
+        }
+    }
+]
+
+
+def _status(value: Any) -> str:
+    return value.value if isinstance(value, TaskStatus) else str(value)
+
+
+def counted_fields(task: Task) -> dict[str, Any]:
+    """The counted fields of a task in their stored form."""
+    return {
+        "project_id": task.project_id,
+        "assigned_to": task.assigned_to,
+        "status": _status(task.status),
+    }
+
+
+def _deltas(
+    changes: Iterable[tuple[Mapping[str, Any] | None, Mapping[str, Any] | None]],
+) -> tuple[dict[str, int], dict[str, int]]:
+    by_project: dict[str, int] = {}
+    by_assignee: dict[str, int] = {}
+    for before, after in changes:
+        for fields, step in ((before, -1), (after, 1)):
+            if fields is None:
+                continue
+            status = _status(fields["status"])
+            key = f"{fields['project_id']}:{status}"
+            by_project[key] = by_project.get(key, 0) + step
+            if status in OPEN_STATUSES:
+                assignee = str(fields["assigned_to"])
+                by_assignee[assignee] = by_assignee.get(assignee, 0) + step
+    return by_project, by_assignee
+
+
+async def apply_task_changes(
+    changes: Iterable[tuple[Mapping[str, Any] | None, Mapping[str, Any] | None]],
+) -> None:
+    """
+    Move the counters for a set of (before, after) task states; None stands for
+    "did not exist". Runs as one MULTI so both hashes and the epoch move
+    together. Counter failures never fail the write: the counters are marked
+    stale instead.
+    """
+    by_project, by_assignee = _deltas(changes)
+    by_project = {k: v for k, v in by_project.items() if v}
+    by_assignee = {k: v for k, v in by_assignee.items() if v}
+    if not by_project and not by_assignee:
+        return
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            for field, step in by_project.items():
+                pipe.hincrby(BY_PROJECT_STATUS_KEY, field, step)
+            for field, step in by_assignee.items():
+                pipe.hincrby(OPEN_BY_ASSIGNEE_KEY, field, step)
+            pipe.incr(EPOCH_KEY)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning("Task counter update failed, marking stale: %s", e)
+        await mark_counters_stale()
+
+
+async def mark_counters_stale() -> None:
+    """Force the next counter read to rebuild from the aggregation."""
+    try:
+        async with get_redis().pipeline(transaction=True) as pipe:
+            pipe.delete(BUILT_KEY)
+            pipe.incr(EPOCH_KEY)
+            await pipe.execute()
+    except Exception as e:
+        logger.error("Could not mark task counters stale: %s", e)
+
+
+async def aggregate_task_report() -> dict[str, dict[str, int]]:
+    """
+    Compute both reports server-side in one $facet aggregation.
+    Returns the same field layout the counter hashes use.
+
+    Reads from the primary, not list_collection(): a rebuild marks the
+    counters exact, so it must see every write the primary acknowledged.
+    """
+    # Beanie types the handle as pymongo's; it is a Motor collection.
+    collection = cast(AsyncIOMotorCollection, Task.get_pymongo_collection())
+    cursor = collection.aggregate(_REPORT_PIPELINE)
+    facets = (await cursor.to_list(length=1))[0]
+    return {
+        BY_PROJECT_STATUS_KEY: {
+            f"{row['_id']['project']}:{_status(row['_id']['status'])}": row["count"]
+            for row in facets["byProjectStatus"]
+        },
+        OPEN_BY_ASSIGNEE_KEY: {
+            str(row["_id"]): row["count"] for row in facets["openByAssignee"]
+        },
+    }
+
+
+async def reconcile_task_counters() -> dict[str, dict[str, int]]:
+    """
+    Rebuild the counter hashes from the aggregation and swap them in
+    atomically (RENAME); this also heals any drift. The counters are only
+    marked built when no counted write happened while the aggregation ran
+    (EPOCH_KEY unchanged, checked under WATCH): such a write may be missing
+    from the aggregate or counted twice. Otherwise the aggregate is still
+    swapped in, but the next read rebuilds again.
+
+    A write that committed to Mongo before the rebuild started but moves its
+    counters only after the swap is counted twice without moving the epoch
+    in time; the scheduled reconcile job heals that.
+    """
+    epoch = await get_redis().get(EPOCH_KEY)
+    report = await aggregate_task_report()
+    exact = await _swap_in(report, epoch)
+    logger.info(
+        "Rebuilt task counters: %d project/status, %d assignee entries%s",
+        len(report[BY_PROJECT_STATUS_KEY]),
+        len(report[OPEN_BY_ASSIGNEE_KEY]),
+        "" if exact else " (writes raced the rebuild, left stale)",
+    )
+    return report
+
+
+async def _swap_in(report: dict[str, dict[str, int]], epoch: Any) -> bool:
+    """Swap `report` in; marks it built when EPOCH_KEY still reads `epoch`."""
+    async with get_redis().pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(EPOCH_KEY)
+            exact = bool(await pipe.get(EPOCH_KEY) == epoch)
+            pipe.multi()
+            _queue_swap(pipe, report, exact=exact)
+            await pipe.execute()
+            return exact
+        except WatchError:
+            pass
+    # A counted write landed between WATCH and EXEC.
+    async with get_redis().pipeline(transaction=True) as pipe:
+        _queue_swap(pipe, report, exact=False)
+        await pipe.execute()
+    return False
+
+
+def _queue_swap(
+    pipe: Pipeline, report: dict[str, dict[str, int]], *, exact: bool
+) -> None:
+    for key, counts in report.items():
+        if counts:
+            pipe.delete(f"{key}:rebuild")
+            pipe.hset(f"{key}:rebuild", mapping=cast(Mapping[Any, Any], counts))
+            pipe.rename(f"{key}:rebuild", key)
+        else:
+            pipe.delete(key)
+    if exact:
+        pipe.set(BUILT_KEY, 1)
+    else:
+        pipe.delete(BUILT_KEY)
+
+
+# This process's rebuild in progress; concurrent readers share it.
+_rebuild: "asyncio.Future[dict[str, dict[str, int]] | None] | None" = None
+
+
+async def _rebuild_counters() -> dict[str, dict[str, int]] | None:
+    """
+    Rebuild stale counters at most once at a time across all processes.
+    Returns the aggregate when this process rebuilt them, or None when
+    another process held REBUILD_LOCK_KEY; by then it has finished (or the
+    wait timed out) and the caller reads the hashes it swapped in.
+    """
+    global _rebuild
+    if _rebuild is None or _rebuild.done():
+        _rebuild = asyncio.ensure_future(_rebuild_once())
+    return await asyncio.shield(_rebuild)
+
+
+async def _rebuild_once() -> dict[str, dict[str, int]] | None:
+    token = await acquire_lock(REBUILD_LOCK_KEY, _REBUILD_LOCK_MS)
+    if token is None:
+        deadline = time.monotonic() + _REBUILD_WAIT_SECONDS
+        while time.monotonic() < deadline and await get_redis().exists(
+            REBUILD_LOCK_KEY
+        ):
+            await asyncio.sleep(_REBUILD_POLL_SECONDS)
+        return None
+    try:
+        return await reconcile_task_counters()
+    finally:
+        await release_lock(REBUILD_LOCK_KEY, token)
+
+
+async def _fetch_counters(key: str, fields: list[str] | None) -> tuple[bool, Any]:
+    async with get_redis().pipeline(transaction=False) as pipe:
+        pipe.exists(BUILT_KEY)
+        if fields:
+            pipe.hmget(key, fields)
+        else:
+            pipe.hgetall(key)
+        built, raw = await pipe.execute()
+    if fields:
+        raw = {f: v for f, v in zip(fields, raw, strict=True) if v is not None}
+    return bool(built), raw
+
+
+def _select(counts: dict[str, int], fields: list[str] | None) -> dict[str, int]:
+    return {f: counts[f] for f in fields if f in counts} if fields else counts
+
+
+async def _read_counters(key: str, fields: list[str] | None = None) -> dict[str, int]:
+    """
+    HGETALL (or HMGET of `fields`) on a counter hash. Stale counters are
+    rebuilt first (see _rebuild_counters) rather than by every reader.
+    """
+    try:
+        built, raw = await _fetch_counters(key, fields)
+        if not built:
+            report = await _rebuild_counters()
+            if report is not None:
+                return _select(report[key], fields)
+            _, raw = await _fetch_counters(key, fields)
+    except Exception as e:
+        # Redis is down: answer from Mongo directly.
+        logger.warning("Task counters unavailable, aggregating: %s", e)
+        return _select((await aggregate_task_report())[key], fields)
+    return {_text(k): int(v) for k, v in raw.items() if int(v)}
+
+
+def _text(value: str | bytes) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def tasks_by_project_status(
+    project_id: int | None = None,
+) -> dict[int, dict[str, int]]:
+    """
+    Task counts per project and status, from the counters. A single project
+    is one HMGET; omitting `project_id` reads the whole hash.
+    """
+    fields = (
+        [f"{project_id}:{status.value}" for status in TaskStatus]
+        if project_id is not None
+        else None
+    )
+    counts = await _read_counters(BY_PROJECT_STATUS_KEY, fields)
+    report: dict[int, dict[str, int]] = {}
+    for field, count in counts.items():
+        project, status = field.rsplit(":", 1)
+        report.setdefault(int(project), {})[status] = count
+    return report
+
+
+async def open_tasks_by_assignee(
+    assigned_to: int | None = None,
+) -> dict[int, int]:
+    """Open (assigned or pending) task counts per assignee, from the counters."""
+    fields = [str(assigned_to)] if assigned_to is not None else None
+    counts = await _read_counters(OPEN_BY_ASSIGNEE_KEY, fields)
+    return {int(assignee): count for assignee, count in counts.items()}
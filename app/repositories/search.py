@@ -0,0 +1,211 @@
+import base64
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar, overload
+
+from beanie import PydanticObjectId
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from bson.errors import InvalidId
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.mongo import list_collection
+from app.models.base import BaseDoc
+
+DocT = TypeVar("DocT", bound=BaseDoc)
+ReadT = TypeVar("ReadT", bound=BaseModel)
+# A document or a read model.
+ItemT = TypeVar("ItemT", bound=BaseModel)
+
+_SCORE = "_score"
+
+
+@dataclass(slots=True)
+class SearchHit(Generic[ItemT]):
+    doc: ItemT
+    score: float
+
+
+@dataclass(slots=True)
+class SearchPage(Generic[ItemT]):
+    """One page of ranked search results, best match first."""
+
+    hits: list[SearchHit[ItemT]] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+class _ResultCache:
+    """
+    Small in-process LRU of raw result pages for repeated hot queries.
+    Entries expire after SEARCH_CACHE_TTL_SECONDS, so a write becomes
+    visible in search within that window. Raw documents are cached and
+    parsed per hit, so callers never share model instances.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[
+            tuple[Any, ...], tuple[float, list[dict[str, Any]], str | None]
+        ] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, key: tuple[Any, ...]
+    ) -> tuple[list[dict[str, Any]], str | None] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    def put(
+        self,
+        key: tuple[Any, ...],
+        rows: list[dict[str, Any]],
+        next_cursor: str | None,
+    ) -> None:
+        ttl = settings.search_cache_ttl_seconds
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, rows, next_cursor)
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.search_cache_max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_cache = _ResultCache()
+
+
+def search_cache_stats() -> dict[str, Any]:
+    """Hit/miss counters of the in-process search result cache."""
+    return _cache.stats()
+
+
+def _encode_cursor(row: Mapping[str, Any]) -> str:
+    payload = {"s": row[_SCORE], "id": str(row["_id"])}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(token: str) -> dict[str, Any]:
+    """Predicate for results ranked after the cursor: lower score, then higher _id."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+        score = float(payload["s"])
+        last_id = PydanticObjectId(payload["id"])
+    except (ValueError, KeyError, TypeError, InvalidId) as e:
+        raise ValueError(f"Invalid search cursor: {e}")
+    return {
+        "$or": [
+            {_SCORE: {"$lt": score}},
+            {_SCORE: score, "_id": {"$gt": last_id}},
+        ]
+    }
+
+
+@overload
+async def text_search(
+    model: type[DocT],
+    query: str,
+    *,
+    filters: Mapping[str, Any] | None = ...,
+    cursor: str | None = ...,
+    limit: int = ...,
+    projection: None = ...,
+) -> SearchPage[DocT]: ...
+
+
+@overload
+async def text_search(
+    model: type[DocT],
+    query: str,
+    *,
+    filters: Mapping[str, Any] | None = ...,
+    cursor: str | None = ...,
+    limit: int = ...,
+    projection: type[ReadT],
+) -> SearchPage[ReadT]: ...
+
+
+async def text_search(
+    model: type[DocT],
+    query: str,
+    *,
+    filters: Mapping[str, Any] | None = None,
+    cursor: str | None = None,
+    limit: int = 20,
+    projection: type[BaseModel] | None = None,
+) -> SearchPage[Any]:
+    """
+    Run a `$text` search on `model`'s text index, ranked by textScore.
+
+    `filters` are equality conditions (stored field names) applied together
+    with the text match. Paging is keyset on (score desc, _id asc); pass
+    `next_cursor` back for the following page. With `projection` (a read
+    model such as TaskSummary) only its fields are fetched, and hits are
+    instances of it rather than of `model`.
+    """
+    if limit < 1:
+        raise ValueError("limit must be >= 1")
+    if not query.strip():
+        raise ValueError("Empty search query")
+
+    filters = dict(filters or {})
+    fields = get_projection(projection) if projection else None
+    key = (
+        model.get_collection_name(),
+        query,
+        json.dumps([filters, fields], sort_keys=True, default=str),
+        cursor,
+        limit,
+    )
+    cached = _cache.get(key)
+    if cached is not None:
+        rows, next_cursor = cached
+    else:
+        pipeline: list[dict[str, Any]] = [
+            {"$match": {"$text": {"$search": query}, **filters}},
+            {"$addFields": {_SCORE: {"$meta": "textScore"}}},
+        ]
+        if cursor:
+            pipeline.append({"$match": _decode_cursor(cursor)})
+        pipeline += [
+            {"$sort": {_SCORE: -1, "_id": 1}},
+            # One extra row tells whether another page exists.
+            {"$limit": limit + 1},
+        ]
+        if fields:
+            pipeline.append({"$project": {**fields, _SCORE: 1}})
+        found = list_collection(model).aggregate(pipeline)
+        rows = await found.to_list(length=limit + 1)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1])
+        _cache.put(key, rows, next_cursor)
+
+    target = projection or model
+    hits = []
+    for row in rows:
+        doc = {k: v for k, v in row.items() if k != _SCORE}
+        hits.append(SearchHit(doc=parse_obj(target, doc), score=row[_SCORE]))
+    return SearchPage(hits=hits, next_cursor=next_cursor)
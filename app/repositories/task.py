@@ -1,40 +1,311 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
 from typing import Any
+from uuid import UUID
 
 from beanie import PydanticObjectId
 
+from app.core.cache import DocumentCache, get_document_cache
+from app.models.enums import TaskStatus
+from app.models.projections import DocVersion
 from app.models.task import Task
+from app.repositories.bulk import BulkResult, bulk_delete, bulk_insert, bulk_upsert
+from app.repositories.loader import fetch_many
+from app.repositories.pagination import (
+    CursorPage,
+    ReadT,
+    SortKey,
+    iter_keyset_batches,
+    keyset_page,
+    keyset_page_raw,
+)
+from app.repositories.reporting import (
+    COUNTED_FIELDS,
+    apply_task_changes,
+    counted_fields,
+    mark_counters_stale,
+)
+from app.repositories.search import SearchPage, text_search
+from app.repositories.updates import atomic_update
+
+# Attempts at a counted update before giving up on exact counter deltas.
+_COUNTER_CAS_ATTEMPTS = 3
+
+
+def _touches_counters(patch: Mapping[str, Any]) -> bool:
+    for key, value in patch.items():
+        names = value.keys() if key.startswith("$") else (key,)
+        if any(name in COUNTED_FIELDS for name in names):
+            return True
+    return False
 
 
 class TaskRepository:
     """Repository for Task documents."""
 
+    def __init__(self, *, cache: DocumentCache[Task] | None = None) -> None:
+        # Falls back to the shared cache when CACHE_ENABLED is set.
+        self._cache = cache or get_document_cache(Task)
+
     async def create(self, task: Task) -> Task:
         await task.insert()
+        await apply_task_changes([(None, counted_fields(task))])
         return task
 
     async def get(self, id: PydanticObjectId | str) -> Task | None:
+        if self._cache is not None:
+            return await self._cache.get(id, lambda: Task.get(id))
         doc: Task | None = await Task.get(id)
         return doc
 
+    async def list_page(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[Task]:
+        """Keyset-paginated listing; pass `next_cursor` back to get the next page."""
+        return await keyset_page(Task, cursor=cursor, limit=limit, order_by=order_by)
+
+    async def list_by_project(
+        self,
+        project_id: int,
+        *,
+        status: TaskStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> CursorPage[Task]:
+        """Tasks of one project in creation order, optionally of one status."""
+        filters: dict[str, Any] = {"project_id": project_id}
+        if status is not None:
+            filters["status"] = status.value
+        return await keyset_page(
+            Task, cursor=cursor, limit=limit, order_by="createdAt", filters=filters
+        )
+
+    async def list_by_assignee(
+        self,
+        assigned_to: int,
+        *,
+        status: TaskStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> CursorPage[Task]:
+        """Tasks assigned to one user in creation order, optionally of one status."""
+        filters: dict[str, Any] = {"assigned_to": assigned_to}
+        if status is not None:
+            filters["status"] = status.value
+        return await keyset_page(
+            Task, cursor=cursor, limit=limit, order_by="createdAt", filters=filters
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        status: TaskStatus | None = None,
+        project_id: int | None = None,
+        assigned_to: int | None = None,
+        cursor: str | None = None,
+        limit: int = 20,
+    ) -> SearchPage[Task]:
+        """Full-text search over task descriptions, best match first."""
+        filters: dict[str, Any] = {}
+        if status is not None:
+            filters["status"] = status.value
+        if project_id is not None:
+            filters["project_id"] = project_id
+        if assigned_to is not None:
+            filters["assigned_to"] = assigned_to
+        return await text_search(
+            Task, query, filters=filters, cursor=cursor, limit=limit
+        )
+
+    async def get_projected(
+        self, id: PydanticObjectId | str, projection: type[ReadT]
+    ) -> ReadT | None:
+        """Load only the fields of a slim read model for one task."""
+        query = Task.find_one({"_id": PydanticObjectId(id)})
+        doc: ReadT | None = await query.project(projection)
+        return doc
+
+    async def list_projected(
+        self,
+        projection: type[ReadT],
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[ReadT]:
+        """Like list_page(), fetching and validating only `projection`'s fields."""
+        return await keyset_page(
+            Task,
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+            projection=projection,
+        )
+
+    async def list_raw(
+        self,
+        *,
+        fields: Sequence[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[dict[str, Any]]:
+        """
+        Like list_page(), returning raw Mongo documents without validation.
+        Trusted internal reads only (see keyset_page_raw).
+        """
+        return await keyset_page_raw(
+            Task, fields=fields, cursor=cursor, limit=limit, order_by=order_by
+        )
+
+    def iter_batches(
+        self, *, batch_size: int = 500, order_by: SortKey = "_id"
+    ) -> AsyncIterator[list[Task]]:
+        """Stream the whole collection in batches with constant memory."""
+        return iter_keyset_batches(Task, batch_size=batch_size, order_by=order_by)
+
+    async def get_version(self, id: PydanticObjectId | str) -> DocVersion | None:
+        """
+        Just enough of one task to answer a conditional read: taken from the
+        cache when it holds the task, otherwise a projection of its revision
+        id and updatedAt.
+        """
+        if self._cache is not None:
+            found, doc = await self._cache.peek(id)
+            if found:
+                if doc is None:
+                    return None
+                return DocVersion.model_validate(
+                    {
+                        "_id": doc.id,
+                        "createdAt": doc.created_at,
+                        "updatedAt": doc.updated_at,
+                        "revision_id": doc.revision_id,
+                    }
+                )
+        return await self.get_projected(id, DocVersion)
+
+    async def get_many(
+        self, ids: Iterable[PydanticObjectId | str]
+    ) -> dict[PydanticObjectId, Task]:
+        """
+        Many tasks by id in one $in query, cached ones read from the cache in
+        one MGET. Missing ids are left out; see also get_loader().
+        """
+        return await fetch_many(Task, ids, cache=self._cache)
+
     async def list(self, *, skip: int = 0, limit: int = 100) -> list[Task]:
         item: list[Task] = await Task.find_all().skip(skip).limit(limit).to_list()
         return item
 
     async def update(
-        self, id: PydanticObjectId | str, patch: Mapping[str, Any]
+        self,
+        id: PydanticObjectId | str,
+        patch: Mapping[str, Any],
+        *,
+        expected_revision: UUID | None = None,
     ) -> Task | None:
-        doc: Task | None = await Task.get(id)
-        if doc is None:
-            return None
-        for k, v in patch.items():
-            setattr(doc, k, v)
-        await doc.save()
+        """
+        Apply `patch` atomically in one round trip (see `atomic_update`).
+        Returns None when the document does not exist.
+        """
+        if _touches_counters(patch):
+            doc = await self._update_counted(id, patch, expected_revision)
+        else:
+            doc = await atomic_update(
+                Task, id, patch, expected_revision=expected_revision
+            )
+        if self._cache is not None:
+            await self._cache.invalidate(id)
+        return doc
+
+    async def _update_counted(
+        self,
+        id: PydanticObjectId | str,
+        patch: Mapping[str, Any],
+        expected_revision: UUID | None,
+    ) -> Task | None:
+        """
+        Update a task's counted fields and move the report counters by the
+        exact delta: the update only applies while the counted fields still
+        hold the values read just before it, and is retried otherwise.
+        """
+        collection = Task.get_pymongo_collection()
+        projection = dict.fromkeys(COUNTED_FIELDS, 1)
+        for _ in range(_COUNTER_CAS_ATTEMPTS):
+            before = await collection.find_one(
+                {"_id": PydanticObjectId(id)}, projection
+            )
+            if before is None:
+                return None
+            where = {name: before.get(name) for name in COUNTED_FIELDS}
+            doc = await atomic_update(
+                Task, id, patch, expected_revision=expected_revision, where=where
+            )
+            if doc is not None:
+                await apply_task_changes([(before, counted_fields(doc))])
+                return doc
+        # Persistent contention: write anyway and let the next read rebuild.
+        doc = await atomic_update(Task, id, patch, expected_revision=expected_revision)
+        await mark_counters_stale()
         return doc
 
     async def delete(self, id: PydanticObjectId | str) -> bool:
-        doc = await Task.get(id)
-        if doc is None:
+        before = await Task.get_pymongo_collection().find_one_and_delete(
+            {"_id": PydanticObjectId(id)}, dict.fromkeys(COUNTED_FIELDS, 1)
+        )
+        if before is None:
             return False
-        await doc.delete()
+        await apply_task_changes([(before, None)])
+        if self._cache is not None:
+            await self._cache.invalidate(id)
         return True
+
+    async def create_many(
+        self,
+        tasks: Iterable[Task],
+        *,
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        docs = list(tasks)
+        result = await bulk_insert(Task, docs, chunk_size=chunk_size, ordered=ordered)
+        await apply_task_changes(
+            (None, counted_fields(docs[item.index])) for item in result.items if item.ok
+        )
+        return result
+
+    async def upsert_many(
+        self,
+        tasks: Iterable[Task],
+        *,
+        key_fields: Sequence[str] = ("_id",),
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        result = await bulk_upsert(
+            Task,
+            tasks,
+            key_fields=key_fields,
+            chunk_size=chunk_size,
+            ordered=ordered,
+        )
+        # The replaced documents' previous state is unknown; rebuild on read.
+        await mark_counters_stale()
+        if self._cache is not None:
+            await self._cache.invalidate(*(item.id for item in result.items))
+        return result
+
+    async def delete_many(
+        self, ids: Iterable[PydanticObjectId | str], *, chunk_size: int | None = None
+    ) -> BulkResult:
+        result = await bulk_delete(Task, ids, chunk_size=chunk_size)
+        if result.count("deleted"):
+            await mark_counters_stale()
+        if self._cache is not None:
+            await self._cache.invalidate(*(item.id for item in result.items))
+        return result
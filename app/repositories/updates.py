@@ -0,0 +1,145 @@
+import types
+import typing
+from collections.abc import Mapping
+from typing import Any, TypeVar, cast, get_args, get_origin
+from uuid import UUID, uuid4
+
+from beanie import PydanticObjectId
+from beanie.exceptions import RevisionIdWasChanged
+from beanie.odm.utils.encoder import Encoder
+from beanie.odm.utils.parsing import parse_obj
+from pymongo import ReturnDocument
+
+from app.models.base import BaseDoc
+
+DocT = TypeVar("DocT", bound=BaseDoc)
+
+# Update operators accepted in a patch besides plain field assignments.
+OPERATORS = ("$set", "$inc", "$push")
+
+# Managed by the update itself; a patch may not write them directly.
+_PROTECTED = {"id", "revision_id", "created_at", "updated_at"}
+
+_encoder = Encoder(to_db=True)
+
+_UNIONS = (typing.Union, types.UnionType)
+
+
+def _db_name(model: type[BaseDoc], name: str) -> str:
+    info = model.model_fields.get(name)
+    if info is None or name in _PROTECTED:
+        raise ValueError(f"{model.__name__} has no patchable field {name!r}")
+    return info.alias or name
+
+
+def _field_types(model: type[BaseDoc], name: str) -> list[Any]:
+    """The field's annotation, split into its members when it is a union."""
+    annotation = model.model_fields[name].annotation
+    members = get_args(annotation) if get_origin(annotation) in _UNIONS else ()
+    return [t for t in members or (annotation,) if t is not type(None)]
+
+
+def _check_operator(model: type[BaseDoc], operator: str, name: str) -> None:
+    members = _field_types(model, name)
+    if operator == "$inc":
+        numeric = all(
+            isinstance(t, type) and issubclass(t, int | float) and t is not bool
+            for t in members
+        )
+        if not (members and numeric):
+            raise ValueError(f"$inc needs a numeric field, {name!r} is not")
+    elif operator == "$push":
+        if not (members and all(get_origin(t) is list for t in members)):
+            raise ValueError(f"$push needs a list field, {name!r} is not")
+
+
+def _step(model: type[BaseDoc], name: str, step: Any) -> int | float:
+    """An `$inc` operand: a number, and a whole one for integer fields."""
+    whole = all(issubclass(t, int) for t in _field_types(model, name))
+    if isinstance(step, bool) or not isinstance(step, int if whole else int | float):
+        raise ValueError(f"$inc on {name!r} needs a number, got {step!r}")
+    return cast(int | float, step)
+
+
+def _validated(model: type[BaseDoc], name: str, value: Any) -> Any:
+    """Run the field's pydantic validation for one value and encode it for Mongo."""
+    holder = model.model_construct()
+    model.__pydantic_validator__.validate_assignment(holder, name, value)
+    return _encoder.encode(getattr(holder, name))
+
+
+def build_update(model: type[BaseDoc], patch: Mapping[str, Any]) -> dict[str, Any]:
+    """
+    Translate a repository patch into a Mongo update document.
+
+    Plain `{field: value}` entries become `$set`; the `$set`, `$inc` and
+    `$push` keys may also be given explicitly with `{field: value}` mappings.
+    Field names are the model attribute names, as with setattr(). `$inc`
+    only applies to numeric fields and `$push` to list fields; the operands
+    are validated against the field like `$set` values.
+    """
+    update: dict[str, dict[str, Any]] = {}
+    for key, value in patch.items():
+        if key.startswith("$"):
+            if key not in OPERATORS:
+                raise ValueError(f"Unsupported update operator {key!r}")
+            for name, operand in cast(Mapping[str, Any], value).items():
+                field = _db_name(model, name)
+                _check_operator(model, key, name)
+                if key == "$push":
+                    # Validated as a one-item list of the field's type.
+                    encoded = _validated(model, name, [operand])[0]
+                elif key == "$inc":
+                    encoded = _step(model, name, operand)
+                else:
+                    encoded = _validated(model, name, operand)
+                update.setdefault(key, {})[field] = encoded
+        else:
+            field = _db_name(model, key)
+            update.setdefault("$set", {})[field] = _validated(model, key, value)
+
+    if not update:
+        raise ValueError("Empty patch")
+    update["$currentDate"] = {"updatedAt": True}
+    return update
+
+
+async def atomic_update(
+    model: type[DocT],
+    id: PydanticObjectId | str,
+    patch: Mapping[str, Any],
+    *,
+    expected_revision: UUID | None = None,
+    where: Mapping[str, Any] | None = None,
+) -> DocT | None:
+    """
+    Apply `patch` with a single find_one_and_update and return the new document.
+
+    For models with `use_revision = True` every update sets a fresh
+    revision_id. Passing `expected_revision` turns on optimistic concurrency:
+    the write only matches while the stored revision_id is unchanged, and a
+    mismatch raises RevisionIdWasChanged.
+
+    `where` adds raw match conditions (stored field names); when they do not
+    hold the update is skipped and None is returned, as for a missing id.
+    """
+    update = build_update(model, patch)
+    query: dict[str, Any] = {**(where or {}), "_id": PydanticObjectId(id)}
+    if model.get_settings().use_revision:
+        update.setdefault("$set", {})["revision_id"] = _encoder.encode(uuid4())
+    if expected_revision is not None:
+        if not model.get_settings().use_revision:
+            raise ValueError(f"{model.__name__} does not store revision ids")
+        query["revision_id"] = _encoder.encode(expected_revision)
+
+    collection = model.get_pymongo_collection()
+    raw = await collection.find_one_and_update(
+        query, update, return_document=ReturnDocument.AFTER
+    )
+    if raw is None:
+        if expected_revision is not None and await collection.find_one(
+            {"_id": query["_id"]}, {"_id": 1}
+        ):
+            raise RevisionIdWasChanged
+        return None
+    return cast(DocT, parse_obj(model, raw))
@@ -1,9 +1,22 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
 from typing import Any
+from uuid import UUID
 
 from beanie import PydanticObjectId
 
+from app.core.cache import DocumentCache, get_document_cache
 from app.models.user import User
+from app.repositories.bulk import BulkResult, bulk_delete, bulk_insert, bulk_upsert
+from app.repositories.loader import fetch_many
+from app.repositories.pagination import (
+    CursorPage,
+    ReadT,
+    SortKey,
+    iter_keyset_batches,
+    keyset_page,
+    keyset_page_raw,
+)
+from app.repositories.updates import atomic_update
 
 
 class UserRepository:
@@ -13,27 +26,112 @@ class UserRepository:
     Intended to be consumed by services/routers.
     """
 
+    def __init__(self, *, cache: DocumentCache[User] | None = None) -> None:
+        # No shared cache: User is not cacheable (it holds the password hash).
+        self._cache = cache or get_document_cache(User)
+
     async def create(self, user: User) -> User:
         await user.insert()
         return user
 
     async def get(self, id: PydanticObjectId | str) -> User | None:
+        if self._cache is not None:
+            return await self._cache.get(id, lambda: User.get(id))
         doc: User | None = await User.get(id)
         return doc
 
+    async def get_by_username(self, username: str) -> User | None:
+        doc: User | None = await User.find_one(User.username == username)
+        return doc
+
+    async def get_by_email(self, email: str) -> User | None:
+        doc: User | None = await User.find_one(User.email == email)
+        return doc
+
+    async def list_page(
+        self,
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[User]:
+        """Keyset-paginated listing; pass `next_cursor` back to get the next page."""
+        return await keyset_page(User, cursor=cursor, limit=limit, order_by=order_by)
+
+    async def get_projected(
+        self, id: PydanticObjectId | str, projection: type[ReadT]
+    ) -> ReadT | None:
+        """Load only the fields of a slim read model for one user."""
+        query = User.find_one({"_id": PydanticObjectId(id)})
+        doc: ReadT | None = await query.project(projection)
+        return doc
+
+    async def list_projected(
+        self,
+        projection: type[ReadT],
+        *,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[ReadT]:
+        """Like list_page(), fetching and validating only `projection`'s fields."""
+        return await keyset_page(
+            User,
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+            projection=projection,
+        )
+
+    async def list_raw(
+        self,
+        *,
+        fields: Sequence[str] | None = None,
+        cursor: str | None = None,
+        limit: int = 100,
+        order_by: SortKey = "_id",
+    ) -> CursorPage[dict[str, Any]]:
+        """
+        Like list_page(), returning raw Mongo documents without validation.
+        Trusted internal reads only (see keyset_page_raw).
+        """
+        return await keyset_page_raw(
+            User, fields=fields, cursor=cursor, limit=limit, order_by=order_by
+        )
+
+    def iter_batches(
+        self, *, batch_size: int = 500, order_by: SortKey = "_id"
+    ) -> AsyncIterator[list[User]]:
+        """Stream the whole collection in batches with constant memory."""
+        return iter_keyset_batches(User, batch_size=batch_size, order_by=order_by)
+
+    async def get_many(
+        self, ids: Iterable[PydanticObjectId | str]
+    ) -> dict[PydanticObjectId, User]:
+        """
+        Many users by id in one $in query, cached ones read from the cache in
+        one MGET. Missing ids are left out; see also get_loader().
+        """
+        return await fetch_many(User, ids, cache=self._cache)
+
     async def list(self, *, skip: int = 0, limit: int = 100) -> list[User]:
         item: list[User] = await User.find_all().skip(skip).limit(limit).to_list()
         return item
 
     async def update(
-        self, id: PydanticObjectId | str, patch: Mapping[str, Any]
+        self,
+        id: PydanticObjectId | str,
+        patch: Mapping[str, Any],
+        *,
+        expected_revision: UUID | None = None,
     ) -> User | None:
-        doc: User | None = await User.get(id)
-        if doc is None:
-            return None
-        for k, v in patch.items():
-            setattr(doc, k, v)
-        await doc.save()
+        """
+        Apply `patch` atomically in one round trip (see `atomic_update`).
+        Returns None when the document does not exist.
+        """
+        doc = await atomic_update(User, id, patch, expected_revision=expected_revision)
+        if self._cache is not None:
+            await self._cache.invalidate(id)
         return doc
 
     async def delete(self, id: PydanticObjectId | str) -> bool:
@@ -41,4 +139,42 @@ class UserRepository:
         if doc is None:
             return False
         await doc.delete()
+        if self._cache is not None:
+            await self._cache.invalidate(id)
         return True
+
+    async def create_many(
+        self,
+        users: Iterable[User],
+        *,
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        return await bulk_insert(User, users, chunk_size=chunk_size, ordered=ordered)
+
+    async def upsert_many(
+        self,
+        users: Iterable[User],
+        *,
+        key_fields: Sequence[str] = ("_id",),
+        chunk_size: int | None = None,
+        ordered: bool = False,
+    ) -> BulkResult:
+        result = await bulk_upsert(
+            User,
+            users,
+            key_fields=key_fields,
+            chunk_size=chunk_size,
+            ordered=ordered,
+        )
+        if self._cache is not None:
+            await self._cache.invalidate(*(item.id for item in result.items))
+        return result
+
+    async def delete_many(
+        self, ids: Iterable[PydanticObjectId | str], *, chunk_size: int | None = None
+    ) -> BulkResult:
+        result = await bulk_delete(User, ids, chunk_size=chunk_size)
+        if self._cache is not None:
+            await self._cache.invalidate(*(item.id for item in result.items))
+        return result
@@ -0,0 +1,113 @@
+"""
+Serve the app: `python -m app.server`.
+
+SERVER_MODE=development runs a single uvicorn process, reloading on code
+changes when APP_RELOAD is set. SERVER_MODE=production runs gunicorn as the
+process manager over uvicorn workers (install the `server` extra):
+
+- one worker per CPU core by default (SERVER_WORKERS),
+- uvloop and httptools (SERVER_LOOP, SERVER_HTTP),
+- listen backlog and keep-alive tuned for running behind a load balancer,
+- each worker recycled gracefully after SERVER_MAX_REQUESTS requests, with
+  jitter, to cap slow memory growth,
+- the app imported once in the master (SERVER_PRELOAD), so workers share
+  its memory copy-on-write.
+
+Each worker keeps its own metrics; they are summed across workers through
+METRICS_MULTIPROCESS_DIR (see app/core/metrics.py), so any worker answers a
+/metrics scrape with totals for the whole server. Log files are shared by
+the workers and never rotated in process (see LOG_HANDLERS in
+.env.example); in a container, log to the console only.
+
+Connections are opened per worker in the app lifespan, never in the
+master, so nothing created before the fork is shared between processes.
+"""
+
+import os
+import tempfile
+from typing import Any, ClassVar
+
+from app.core.config import settings
+from app.core.metrics import reset_snapshots
+
+APP = "app.main:app"
+
+
+def worker_count() -> int:
+    if settings.server_workers > 0:
+        return settings.server_workers
+    return os.process_cpu_count() or 1
+
+
+def gunicorn_options(worker_class: type) -> dict[str, Any]:
+    return {
+        "bind": f"{settings.app_host}:{settings.app_port}",
+        "workers": worker_count(),
+        "worker_class": worker_class,
+        "backlog": settings.server_backlog,
+        "keepalive": settings.server_keepalive_seconds,
+        "max_requests": settings.server_max_requests,
+        "max_requests_jitter": settings.server_max_requests_jitter,
+        "graceful_timeout": settings.server_graceful_timeout_seconds,
+        "timeout": settings.server_worker_timeout_seconds,
+        "preload_app": settings.server_preload,
+        # Heartbeat files in RAM rather than on a possibly slow disk.
+        "worker_tmp_dir": "/dev/shm" if os.path.isdir("/dev/shm") else None,
+        "accesslog": None,
+    }
+
+
+def run_development() -> None:
+    import uvicorn
+
+    uvicorn.run(
+        APP,
+        host=settings.app_host,
+        port=settings.app_port,
+        reload=settings.app_reload,
+    )
+
+
+def run_production() -> None:
+    try:
+        from gunicorn.app.base import BaseApplication
+        from uvicorn_worker import UvicornWorker
+    except ImportError as e:
+        raise SystemExit(
+            f"SERVER_MODE=production needs the `server` extra ({e.name} is missing)"
+        )
+
+    class Worker(UvicornWorker):
+        CONFIG_KWARGS: ClassVar[dict[str, Any]] = {
+            **UvicornWorker.CONFIG_KWARGS,
+            "loop": settings.server_loop,
+            "http": settings.server_http,
+        }
+
+    class Server(BaseApplication):
+        def load_config(self) -> None:
+            for key, value in gunicorn_options(Worker).items():
+                self.cfg.set(key, value)
+
+        def load(self) -> Any:
+            from app.main import app
+
+            return app
+
+    if settings.metrics_enabled:
+        # Before any worker forks, so all of them write to the same place.
+        if not settings.metrics_multiprocess_dir:
+            settings.metrics_multiprocess_dir = tempfile.mkdtemp(prefix="app-metrics-")
+        reset_snapshots(settings.metrics_multiprocess_dir)
+    Server().run()
+
+
+def main() -> None:
+    if settings.server_mode == "production":
+        run_production()
+    else:
+        run_development()
+
+
+if __name__ == "__main__":
+    main()
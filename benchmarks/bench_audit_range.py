@@ -0,0 +1,126 @@
+"""
+Latency of audit range queries (time window, optionally per actor/action) and
+the plan Mongo picks for them, on a large synthetic audit collection.
+
+Requires a reachable MongoDB configured through the usual settings/.env.
+Run once with AUDIT_STORAGE_MODE=standard and once with =timeseries against
+separate databases to compare the two layouts.
+
+    python -m benchmarks.bench_audit_range --docs 5000000 --days 30
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from functools import partial
+from typing import Any
+
+from beanie import PydanticObjectId
+from bson import DBRef
+
+from app.core.config import settings
+from app.core.mongo import beanie_lifespan
+from app.models.audit import Audit
+from app.models.base import utcnow
+from app.repositories import AuditRepository
+
+ACTIONS = ["login", "logout", "create_task", "update_task", "delete_task"]
+
+
+async def _seed(total: int, days: int, actors: list[PydanticObjectId]) -> None:
+    # Raw insert_many: building millions of Audit models would dominate the run.
+    collection = Audit.get_pymongo_collection()
+    existing = await collection.estimated_document_count()
+    now = utcnow()
+    span = days * 86_400
+    batch = []
+    for _ in range(existing, total):
+        created = now - timedelta(seconds=random.uniform(0, span))
+        batch.append(
+            {
+                "actor": DBRef("users", random.choice(actors)),
+                "action": random.choice(ACTIONS),
+                "detail": None,
+                "createdAt": created,
+                "updatedAt": created,
+            }
+        )
+        if len(batch) == 50_000:
+            await collection.insert_many(batch, ordered=False)
+            batch.clear()
+    if batch:
+        await collection.insert_many(batch, ordered=False)
+
+
+async def _time(fn: Callable[[], Awaitable[object]], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def _explain(query: dict[str, object]) -> str:
+    plan = (
+        await Audit.get_pymongo_collection()
+        .find(query)
+        .sort([("createdAt", -1), ("_id", -1)])
+        .limit(101)
+        .explain()
+    )
+    stats = plan.get("executionStats", {})
+    return (
+        f"keys {stats.get('totalKeysExamined', '?')} "
+        f"docs {stats.get('totalDocsExamined', '?')} "
+        f"returned {stats.get('nReturned', '?')}"
+    )
+
+
+async def main(docs: int, days: int, n_actors: int, limit: int, repeat: int) -> None:
+    repo = AuditRepository()
+    actors = [PydanticObjectId() for _ in range(n_actors)]
+    async with beanie_lifespan():
+        await _seed(docs, days, actors)
+        # Reuse actors already in the collection when it was seeded earlier.
+        stored = await Audit.get_pymongo_collection().find_one({}, {"actor": 1})
+        actor = stored["actor"].id if stored else actors[0]
+        end = utcnow()
+        print(f"storage mode: {settings.audit_storage_mode}")
+        for hours in (1, 24, 24 * 7):
+            start = end - timedelta(hours=hours)
+            cases: dict[str, dict[str, Any]] = {
+                "window": {},
+                "actor": {"actor": actor},
+                "action": {"action": ACTIONS[0]},
+            }
+            for name, extra in cases.items():
+                ms = await _time(
+                    partial(
+                        repo.find_range, start=start, end=end, limit=limit, **extra
+                    ),
+                    repeat,
+                )
+                query: dict[str, object] = {"createdAt": {"$gte": start, "$lt": end}}
+                if "actor" in extra:
+                    query["actor.$id"] = extra["actor"]
+                if "action" in extra:
+                    query["action"] = extra["action"]
+                print(
+                    f"last {hours:>4}h {name:<7} {ms:8.2f} ms   {await _explain(query)}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=5_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--actors", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.days, args.actors, args.limit, args.repeat))
@@ -0,0 +1,71 @@
+"""
+Throughput and peak RSS of the streaming export against materialising the
+collection through TaskRepository.list().
+
+Peak RSS only ever grows within a process, so run each mode separately.
+Requires a reachable MongoDB configured through the usual settings/.env.
+
+    python -m benchmarks.bench_export --docs 1000000 --mode stream --gzip
+    python -m benchmarks.bench_export --docs 1000000 --mode list
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+
+from app.core.mongo import beanie_lifespan
+from app.models.task import Task
+from app.repositories import TaskRepository
+from app.repositories.export import export_stream
+from benchmarks.bench_pagination import _seed
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _stream(fmt: str, gzip: bool) -> tuple[int, int]:
+    chunks = size = 0
+    async for chunk in export_stream(Task, fmt, gzip=gzip):  # type: ignore[arg-type]
+        chunks += 1
+        size += len(chunk)
+    return chunks, size
+
+
+async def _list(page_size: int) -> tuple[int, int]:
+    repo = TaskRepository()
+    items: list[Task] = []
+    while page := await repo.list(skip=len(items), limit=page_size):
+        items.extend(page)
+    return len(items), 0
+
+
+async def main(docs: int, mode: str, fmt: str, gzip: bool) -> None:
+    async with beanie_lifespan():
+        await _seed(docs)
+        before = _peak_rss_mb()
+        start = time.perf_counter()
+        if mode == "stream":
+            chunks, size = await _stream(fmt, gzip)
+            detail = f"{chunks} chunks, {size / 2**20:.1f} MiB {fmt}"
+            detail += " (gzip)" if gzip else ""
+        else:
+            count, _ = await _list(10_000)
+            detail = f"{count} documents materialised"
+        elapsed = time.perf_counter() - start
+        print(
+            f"{mode:<6} {elapsed:8.2f} s   peak RSS {_peak_rss_mb():8.1f} MiB "
+            f"(+{_peak_rss_mb() - before:.1f} over seeded baseline)   {detail}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--mode", choices=["stream", "list"], default="stream")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.mode, args.format, args.gzip))
@@ -0,0 +1,84 @@
+"""
+Documents/sec read from the tasks collection as full Beanie models, as the
+TaskSummary projection and as raw driver documents.
+
+Two numbers per mode: end-to-end (query + transfer + hydration) and
+hydration alone (validating already-fetched documents, no I/O).
+Requires a reachable MongoDB configured through the usual settings/.env.
+
+    python -m benchmarks.bench_hydration --docs 200000 --repeat 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+from beanie.odm.utils.parsing import parse_obj
+
+from app.core.mongo import beanie_lifespan
+from app.models.projections import TaskSummary
+from app.models.task import Task
+from benchmarks.bench_pagination import _seed
+
+
+async def _rate(fn: Callable[[], Awaitable[int]], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = await fn()
+        samples.append(count / (time.perf_counter() - start))
+    return statistics.median(samples)
+
+
+async def main(docs: int, repeat: int) -> None:
+    async with beanie_lifespan():
+        await _seed(docs)
+        collection = Task.get_pymongo_collection()
+        summary_fields = dict.fromkeys(
+            [f.alias or name for name, f in TaskSummary.model_fields.items()], 1
+        )
+
+        async def full() -> int:
+            return len(await Task.find_all().limit(docs).to_list())
+
+        async def projected() -> int:
+            return len(await Task.find_all().limit(docs).project(TaskSummary).to_list())
+
+        async def raw() -> int:
+            return len(await collection.find({}).limit(docs).to_list(length=None))
+
+        print("end-to-end (docs/sec)")
+        for name, fn in (("full", full), ("projection", projected), ("raw", raw)):
+            print(f"  {name:<11} {await _rate(fn, repeat):>12,.0f}")
+
+        full_rows = await collection.find({}).limit(docs).to_list(length=None)
+        slim_rows = await (
+            collection.find({}, summary_fields).limit(docs).to_list(length=None)
+        )
+
+        async def hydrate(rows: list[dict[str, Any]], parse: Callable) -> int:
+            for row in rows:
+                parse(row)
+            return len(rows)
+
+        print("hydration only (docs/sec)")
+        cases = (
+            ("full", full_rows, lambda row: parse_obj(Task, row)),
+            ("projection", slim_rows, TaskSummary.model_validate),
+            ("raw", full_rows, dict),
+        )
+        for name, rows, parse in cases:
+            rate = await _rate(partial(hydrate, rows, parse), repeat)
+            print(f"  {name:<11} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.repeat))
@@ -0,0 +1,93 @@
+"""
+Page latency of skip/limit vs keyset pagination on the tasks collection.
+
+Requires a reachable MongoDB configured through the usual settings/.env.
+
+    python -m benchmarks.bench_pagination --docs 1000000 --page-size 100
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from functools import partial
+
+from app.core.mongo import beanie_lifespan
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories import TaskRepository
+from app.repositories.pagination import encode_cursor
+
+
+async def _seed(total: int) -> None:
+    existing = await Task.find_all().count()
+    batch: list[Task] = []
+    for i in range(existing, total):
+        batch.append(
+            Task(
+                description=f"bench task {i}",
+                project_id=i % 100,
+                assigned_to=i % 1000,
+                status=TaskStatus.PENDING,
+            )
+        )
+        if len(batch) == 10_000:
+            await Task.insert_many(batch)
+            batch.clear()
+    if batch:
+        await Task.insert_many(batch)
+
+
+async def _time(fn: Callable[[], Awaitable[object]], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+async def main(docs: int, page_size: int, pages: list[int], repeat: int) -> None:
+    repo = TaskRepository()
+    async with beanie_lifespan():
+        await _seed(docs)
+        for page in pages:
+            offset = (page - 1) * page_size
+            if offset >= docs:
+                continue
+
+            skip_ms = await _time(
+                partial(repo.list, skip=offset, limit=page_size), repeat
+            )
+
+            # Position the keyset cursor on the last row of the previous page
+            # (untimed), then time only the page fetch itself.
+            cursor = None
+            if offset:
+                prev = (
+                    await Task.find_all()
+                    .sort("_id")
+                    .skip(offset - 1)
+                    .limit(1)
+                    .to_list()
+                )
+                cursor = encode_cursor("_id", prev[0])
+            keyset_ms = await _time(
+                partial(repo.list_page, cursor=cursor, limit=page_size),
+                repeat,
+            )
+            print(
+                f"page {page:>6}: skip/limit {skip_ms:8.2f} ms   "
+                f"keyset {keyset_ms:8.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.docs, args.page_size, args.pages, args.repeat))
@@ -0,0 +1,80 @@
+"""
+Cold-start time of the app: interpreter + `import app.main`, and entering
+the lifespan (waiting for Mongo/Redis, Beanie init, audit sink, health
+prober). Every sample is a fresh subprocess, so nothing is cached in-process.
+
+The import phase runs offline. `--live` also enters the lifespan against
+the Mongo/Redis configured through the usual settings/.env, once with index
+creation at boot and once with DATABASE_BUILD_INDEXES=false.
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --runs 5 --live
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+_MARKER = "STARTUP"
+
+_CHILD = """
+import asyncio, time
+t0 = time.perf_counter()
+from app.main import app, lifespan
+t1 = time.perf_counter()
+
+async def boot():
+    async with lifespan(app):
+        return time.perf_counter()
+
+t2 = asyncio.run(boot()) if {live} else t1
+print("{marker}", t1 - t0, t2 - t1, flush=True)
+"""
+
+
+def _sample(live: bool, env: dict[str, str]) -> tuple[float, float, float]:
+    """(import seconds, lifespan seconds, process wall seconds)"""
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD.format(live=live, marker=_MARKER)],
+        env={**os.environ, "LOG_LEVEL": "warning", **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    wall = time.perf_counter() - start
+    line = next(x for x in out.splitlines() if x.startswith(_MARKER))
+    imported, booted = map(float, line.split()[1:])
+    return imported, booted, wall
+
+
+def _report(name: str, samples: list[tuple[float, float, float]]) -> None:
+    columns = zip(*samples, strict=True)
+    medians = [statistics.median(c) * 1000 for c in columns]
+    print(f"{name:<22}" + "".join(f"{m:>12.1f}" for m in medians))
+
+
+def main(runs: int, live: bool) -> None:
+    scenarios: list[tuple[str, bool, dict[str, str]]] = [("import only", False, {})]
+    if live:
+        scenarios += [
+            ("boot, build indexes", True, {"DATABASE_BUILD_INDEXES": "true"}),
+            ("boot, skip indexes", True, {"DATABASE_BUILD_INDEXES": "false"}),
+        ]
+    print(f"median of {runs} runs (ms)")
+    print(f"{'':<22}{'import':>12}{'lifespan':>12}{'wall':>12}")
+    for name, boot, env in scenarios:
+        _report(name, [_sample(boot, env) for _ in range(runs)])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument(
+        "--live", action="store_true", help="also boot against Mongo/Redis"
+    )
+    args = parser.parse_args()
+    main(args.runs, args.live)
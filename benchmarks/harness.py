@@ -0,0 +1,163 @@
+"""
+Timing, reporting and baselines for the benchmark suite.
+
+Every operation is timed on its own, so a result carries throughput
+(operations per second of wall time) and per-operation p50/p99 latency.
+Baselines are JSON files under benchmarks/baselines/; comparing a run
+against one flags operations whose throughput fell or whose p99 rose by
+more than a threshold.
+"""
+
+import asyncio
+import json
+import platform
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    name: str
+    ops: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def throughput(self) -> float:
+        return self.ops / self.seconds if self.seconds else 0.0
+
+
+def _percentile(sorted_ns: list[int], q: float) -> float:
+    """Nearest-rank percentile of `sorted_ns`, in milliseconds."""
+    index = min(len(sorted_ns) - 1, max(0, round(q * len(sorted_ns)) - 1))
+    return sorted_ns[index] / 1e6
+
+
+def _result(name: str, latencies_ns: list[int], seconds: float) -> Result:
+    latencies_ns.sort()
+    return Result(
+        name=name,
+        ops=len(latencies_ns),
+        seconds=seconds,
+        p50_ms=_percentile(latencies_ns, 0.50),
+        p99_ms=_percentile(latencies_ns, 0.99),
+    )
+
+
+def measure(
+    name: str, op: Callable[[int], Any], *, iterations: int, warmup: int = 0
+) -> Result:
+    """Time `op(i)` for i in range(iterations), after `warmup` untimed calls."""
+    for i in range(warmup):
+        op(i)
+    latencies: list[int] = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for i in range(iterations):
+        t = clock()
+        op(i)
+        latencies.append(clock() - t)
+    return _result(name, latencies, (clock() - start) / 1e9)
+
+
+async def measure_async(
+    name: str,
+    op: Callable[[int], Awaitable[Any]],
+    *,
+    iterations: int,
+    warmup: int = 0,
+    concurrency: int = 1,
+) -> Result:
+    """
+    Time `await op(i)` for i in range(iterations), spread over `concurrency`
+    tasks. Latency includes any time an operation waits on the event loop,
+    as a request would.
+    """
+    for i in range(warmup):
+        await op(i)
+    latencies: list[int] = []
+    clock = time.perf_counter_ns
+    indices = iter(range(iterations))
+
+    async def worker() -> None:
+        for i in indices:
+            t = clock()
+            await op(i)
+            latencies.append(clock() - t)
+
+    start = clock()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return _result(name, latencies, (clock() - start) / 1e9)
+
+
+def print_results(results: list[Result]) -> None:
+    width = max([len(r.name) for r in results] + [9])
+    print(f"{'operation':<{width}}{'ops/s':>14}{'p50 ms':>11}{'p99 ms':>11}")
+    for r in results:
+        print(
+            f"{r.name:<{width}}{r.throughput:>14,.0f}{r.p50_ms:>11.3f}{r.p99_ms:>11.3f}"
+        )
+
+
+def baseline_path(label: str) -> Path:
+    return BASELINE_DIR / f"{label}.json"
+
+
+def save_baseline(label: str, results: list[Result], meta: dict[str, Any]) -> Path:
+    path = baseline_path(label)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "created": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "machine": platform.platform(),
+            **meta,
+        },
+        "results": {r.name: {**asdict(r), "throughput": r.throughput} for r in results},
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+    return path
+
+
+def load_baseline(label: str) -> dict[str, Any]:
+    path = baseline_path(label)
+    if not path.exists():
+        raise FileNotFoundError(f"No baseline {label!r} at {path}")
+    data: dict[str, Any] = json.loads(path.read_text())
+    return data
+
+
+def compare(
+    results: list[Result], baseline: dict[str, Any], *, threshold: float
+) -> list[str]:
+    """
+    Print each operation against the baseline and return the names of those
+    that regressed: throughput down or p99 up by more than `threshold`
+    (a fraction, 0.15 = 15%). Operations missing from the baseline are shown
+    but never fail.
+    """
+    previous = baseline["results"]
+    regressions = []
+    width = max([len(r.name) for r in results] + [9])
+    print(f"{'operation':<{width}}{'ops/s Δ':>12}{'p99 Δ':>12}")
+    for r in results:
+        old = previous.get(r.name)
+        if old is None:
+            print(f"{r.name:<{width}}{'new':>12}{'new':>12}")
+            continue
+        speed = r.throughput / old["throughput"] - 1 if old["throughput"] else 0.0
+        tail = r.p99_ms / old["p99_ms"] - 1 if old["p99_ms"] else 0.0
+        regressed = speed < -threshold or tail > threshold
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{r.name:<{width}}{speed:>+12.1%}{tail:>+12.1%}{flag}")
+        if regressed:
+            regressions.append(r.name)
+    return regressions
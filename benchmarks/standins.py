@@ -0,0 +1,169 @@
+"""
+Local Mongo and Redis for the benchmark suite; nothing leaves the machine.
+
+    memory  mongomock-motor and fakeredis, inside the process
+    local   `mongod` and `redis-server` from PATH, started on free loopback
+            ports with throwaway data directories
+
+The stand-ins are plugged in underneath the app's own lifespans (the Motor
+client class and the Redis client builder are swapped), so benchmarks run
+the real startup path: ping, Beanie init, script loading, collection options.
+"""
+
+import shutil
+import socket
+import subprocess
+import tempfile
+import time
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from typing import Any, Literal, cast
+from unittest import mock
+
+from app.core import mongo, redis as redis_core
+from app.core.config import settings
+
+Backend = Literal["memory", "local"]
+
+
+def _mongomock_compat() -> ExitStack:
+    """
+    mongomock 4.x predates the pymongo 4 signatures Beanie 2 uses:
+    list_collection_names() rejects `authorizedCollections`, and
+    with_options() hands back a synchronous collection.
+    """
+    from mongomock.database import Database
+    from mongomock_motor import AsyncMongoMockCollection
+
+    list_names = Database.list_collection_names
+
+    def list_collection_names(self: Any, filter: Any = None, **_: Any) -> Any:
+        return list_names(self, filter=filter)
+
+    def with_options(self: Any, **kwargs: Any) -> Any:
+        inner = self._AsyncMongoMockCollection__collection
+        return AsyncMongoMockCollection(self.database, inner.with_options(**kwargs))
+
+    stack = ExitStack()
+    stack.enter_context(
+        mock.patch.object(
+            Database,
+            "list_collection_names",
+            list_collection_names,
+        )
+    )
+    stack.enter_context(
+        mock.patch.object(
+            AsyncMongoMockCollection, "with_options", with_options, create=True
+        )
+    )
+    return stack
+
+
+@contextmanager
+def _memory() -> Iterator[None]:
+    import fakeredis
+    from mongomock_motor import AsyncMongoMockClient
+
+    server = fakeredis.FakeServer()
+
+    def motor_client(*_: Any, **__: Any) -> AsyncMongoMockClient:
+        return AsyncMongoMockClient()
+
+    def build_redis() -> Any:
+        return fakeredis.aioredis.FakeRedis(
+            server=server,
+            decode_responses=settings.redis_decode_responses,
+            max_connections=settings.redis_connection_pool_max_connections,
+        )
+
+    with ExitStack() as stack:
+        stack.enter_context(_mongomock_compat())
+        stack.enter_context(
+            mock.patch.object(mongo, "AsyncIOMotorClient", motor_client)
+        )
+        stack.enter_context(mock.patch.object(redis_core, "_build_redis", build_redis))
+        yield
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return int(s.getsockname()[1])
+
+
+def _binary(name: str) -> str:
+    path = shutil.which(name)
+    if path is None:
+        raise RuntimeError(f"`{name}` not found on PATH; use --backend memory")
+    return path
+
+
+def _wait_for_port(port: int, process: subprocess.Popen[bytes]) -> None:
+    name = cast(list[str], process.args)[0]
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{name} exited with {process.returncode}")
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(0.05)
+    raise RuntimeError(f"{name} did not listen on {port}")
+
+
+@contextmanager
+def _local() -> Iterator[None]:
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from redis.asyncio import Redis
+
+    mongo_port, redis_port = _free_port(), _free_port()
+    with ExitStack() as stack:
+        data_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        processes = [
+            subprocess.Popen(
+                [
+                    _binary("mongod"),
+                    *("--port", str(mongo_port), "--bind_ip", "127.0.0.1"),
+                    *("--dbpath", data_dir, "--quiet"),
+                ],
+                stdout=subprocess.DEVNULL,
+            ),
+            subprocess.Popen(
+                [
+                    _binary("redis-server"),
+                    *("--port", str(redis_port), "--bind", "127.0.0.1"),
+                    *("--save", "", "--appendonly", "no"),
+                ],
+                stdout=subprocess.DEVNULL,
+            ),
+        ]
+        for process in processes:
+            stack.callback(process.wait, 10)
+            stack.callback(process.terminate)
+        _wait_for_port(mongo_port, processes[0])
+        _wait_for_port(redis_port, processes[1])
+
+        # The configured URI carries credentials a fresh mongod does not have.
+        def motor_client(*_: Any, **options: Any) -> AsyncIOMotorClient:
+            return AsyncIOMotorClient(f"mongodb://127.0.0.1:{mongo_port}", **options)
+
+        def build_redis() -> Redis:
+            return Redis(
+                port=redis_port,
+                decode_responses=settings.redis_decode_responses,
+                max_connections=settings.redis_connection_pool_max_connections,
+            )
+
+        stack.enter_context(
+            mock.patch.object(mongo, "AsyncIOMotorClient", motor_client)
+        )
+        stack.enter_context(mock.patch.object(redis_core, "_build_redis", build_redis))
+        yield
+
+
+@contextmanager
+def standins(backend: Backend) -> Iterator[None]:
+    """Route the app's Mongo and Redis clients to `backend` while active."""
+    with _memory() if backend == "memory" else _local():
+        yield
@@ -0,0 +1,281 @@
+"""
+Offline benchmark suite: repository CRUD, Redis session functions, log
+formatters and the HTTP app through an in-process ASGI client, all against
+local stand-ins for Mongo and Redis (see benchmarks/standins.py).
+
+Reports throughput and p50/p99 latency per operation. Save a run as a
+baseline, then compare later runs against it; the comparison exits 1 when
+an operation regressed by more than --threshold.
+
+    LOG_LEVEL=warning python -m benchmarks.suite --save main
+    LOG_LEVEL=warning python -m benchmarks.suite --compare main
+    python -m benchmarks.suite --backend local --only crud,http --iterations 5000
+
+Numbers from different backends or machines are not comparable; keep one
+baseline per environment.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from functools import partial
+from uuid import uuid4
+
+import httpx
+from beanie import PydanticObjectId
+
+from app.core import redis as sessions
+from app.core.config import settings
+from app.core.logging import CSVFormatter, JSONFormatter, StructuredFormatter
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories.task import TaskRepository
+from benchmarks.bench_log_formatters import DATEFMT, _records
+from benchmarks.harness import (
+    Result,
+    compare,
+    load_baseline,
+    measure,
+    measure_async,
+    print_results,
+    save_baseline,
+)
+from benchmarks.standins import Backend, standins
+
+GROUPS = ("crud", "sessions", "logging", "http")
+
+_STATUSES = list(TaskStatus)
+
+
+def _task(i: int) -> Task:
+    return Task(
+        description=f"benchmark task {i}",
+        project_id=i % 50,
+        assigned_to=i % 200,
+        status=_STATUSES[i % len(_STATUSES)],
+    )
+
+
+async def bench_crud(iterations: int, concurrency: int) -> list[Result]:
+    repo = TaskRepository()
+    ids: list[PydanticObjectId] = []
+
+    async def create(i: int) -> None:
+        task = await repo.create(_task(i))
+        ids.append(task.id)  # type: ignore[arg-type]
+
+    async def get(i: int) -> None:
+        await repo.get(ids[i % len(ids)])
+
+    async def update(i: int) -> None:
+        await repo.update(ids[i % len(ids)], {"description": f"edited {i}"})
+
+    async def update_counted(i: int) -> None:
+        status = _STATUSES[(i + 1) % len(_STATUSES)]
+        await repo.update(ids[i % len(ids)], {"status": status})
+
+    cursor: str | None = None
+
+    async def list_page(i: int) -> None:
+        nonlocal cursor
+        page = await repo.list_page(cursor=cursor, limit=50)
+        cursor = page.next_cursor
+
+    async def delete(i: int) -> None:
+        await repo.delete(ids.pop())
+
+    run = _runner(iterations, concurrency)
+    return [
+        await run("task.create", create),
+        await run("task.get", get),
+        await run("task.update", update),
+        await run("task.update_counted", update_counted),
+        await run("task.list_page", list_page, concurrency=1),
+        await run("task.delete", delete, iterations=iterations // 2),
+    ]
+
+
+async def bench_sessions(iterations: int, concurrency: int) -> list[Result]:
+    users = max(1, iterations // 10)
+    jtis = {f"user{u}": uuid4().hex for u in range(users)}
+    names = list(jtis)
+    expires = int(time.time()) + 3600
+
+    async def store(i: int) -> None:
+        name = names[i % users]
+        await sessions.store_session_for_user(name, jtis[name], expires)
+
+    async def is_active(i: int) -> None:
+        name = names[i % users]
+        await sessions.is_user_session_active(name, jtis[name])
+
+    batch = [(name, jtis[name]) for name in names[:50]]
+
+    async def are_active(i: int) -> None:
+        await sessions.are_sessions_active(batch)
+
+    async def check_and_touch(i: int) -> None:
+        name = names[i % users]
+        await sessions.check_and_touch_session(name, jtis[name])
+
+    async def rotate(i: int) -> None:
+        name = names[i % users]
+        new = uuid4().hex
+        if await sessions.rotate_user_session(name, jtis[name], new, expires):
+            jtis[name] = new
+
+    async def revoke(i: int) -> None:
+        await sessions.revoke_user_session(names[i % users])
+
+    run = _runner(iterations, concurrency)
+    return [
+        await run("session.store", store),
+        await run("session.is_active", is_active),
+        await run("session.are_active[50]", are_active, iterations=iterations // 10),
+        await run("session.check_and_touch", check_and_touch),
+        await run("session.rotate", rotate, concurrency=1),
+        await run("session.revoke", revoke, iterations=users),
+    ]
+
+
+def _format(
+    formatter: logging.Formatter, records: Sequence[logging.LogRecord], i: int
+) -> str:
+    return formatter.format(records[i])
+
+
+def bench_logging(iterations: int) -> list[Result]:
+    records = _records(iterations)
+    formatters = {
+        "log.text": logging.Formatter(
+            "%(asctime)s - %(levelname)s - %(message)s", DATEFMT
+        ),
+        "log.csv": CSVFormatter(datefmt=DATEFMT),
+        "log.json": JSONFormatter(datefmt=DATEFMT),
+        "log.structured": StructuredFormatter(datefmt=DATEFMT),
+    }
+    return [
+        measure(name, partial(_format, f, records), iterations=iterations)
+        for name, f in formatters.items()
+    ]
+
+
+async def bench_http(iterations: int, concurrency: int) -> list[Result]:
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+        await TaskRepository().create_many([_task(i) for i in range(200)])
+
+        def get(path: str) -> Callable[[int], Awaitable[None]]:
+            async def call(i: int) -> None:
+                response = await c.get(path)
+                response.raise_for_status()
+
+            return call
+
+        run = _runner(iterations, concurrency)
+        return [
+            await run("http.livez", get("/livez")),
+            await run("http.health", get("/health")),
+            await run("http.readyz", get("/readyz")),
+            await run("http.report_by_project", get("/reports/tasks/by-project")),
+            await run(
+                "http.export_tasks_ndjson",
+                get("/export/tasks?format=ndjson"),
+                iterations=max(1, iterations // 20),
+            ),
+        ]
+
+
+def _runner(iterations: int, concurrency: int) -> Callable[..., Awaitable[Result]]:
+    async def run(
+        name: str,
+        op: Callable[[int], Awaitable[None]],
+        *,
+        iterations: int = iterations,
+        concurrency: int = concurrency,
+    ) -> Result:
+        return await measure_async(
+            name, op, iterations=iterations, concurrency=concurrency
+        )
+
+    return run
+
+
+async def run_suite(
+    groups: list[str], iterations: int, concurrency: int
+) -> list[Result]:
+    from app.main import app, lifespan
+
+    results: list[Result] = []
+    if "logging" in groups:
+        results += bench_logging(iterations)
+    async with lifespan(app):
+        if "crud" in groups:
+            results += await bench_crud(iterations, concurrency)
+        if "sessions" in groups:
+            results += await bench_sessions(iterations, concurrency)
+        if "http" in groups:
+            results += await bench_http(iterations, concurrency)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--backend", choices=["memory", "local"], default="memory")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument(
+        "--only", default=",".join(GROUPS), help=f"comma separated: {GROUPS}"
+    )
+    parser.add_argument("--save", metavar="LABEL", help="save results as a baseline")
+    parser.add_argument("--compare", metavar="LABEL", help="compare to a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="allowed throughput drop / p99 rise before a regression (0.15 = 15%%)",
+    )
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.only.split(",") if g.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"unknown groups: {sorted(unknown)}")
+    backend: Backend = args.backend
+
+    # Read through the stand-ins, not a document cache.
+    settings.cache_enabled = False
+    with standins(backend):
+        results = asyncio.run(run_suite(groups, args.iterations, args.concurrency))
+    print_results(results)
+
+    meta = {
+        "backend": backend,
+        "iterations": args.iterations,
+        "concurrency": args.concurrency,
+        "log_level": settings.log_level,
+    }
+    if args.save:
+        print(f"baseline saved to {save_baseline(args.save, results, meta)}")
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        for key in ("backend", "concurrency", "log_level"):
+            if baseline["meta"].get(key) != meta[key]:
+                print(f"warning: baseline {key} was {baseline['meta'].get(key)!r}")
+        print()
+        regressions = compare(results, baseline, threshold=args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
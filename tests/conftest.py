@@ -0,0 +1,28 @@
+from collections.abc import AsyncIterator
+
+import pytest
+
+from app.core import cache
+from app.core.mongo import beanie_lifespan
+from app.core.redis import redis_lifespan
+from app.repositories import reporting
+from benchmarks.standins import standins
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def backends() -> AsyncIterator[None]:
+    """
+    In-memory Mongo (mongomock-motor) and Redis (fakeredis) behind the app's
+    own lifespans (needs the `bench` extra); every test starts from empty
+    stores.
+    """
+    with standins("memory"):
+        async with redis_lifespan(), beanie_lifespan():
+            yield
+    cache._caches.clear()
+    reporting._rebuild = None
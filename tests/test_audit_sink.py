@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import pytest
+
+from app.models.audit import Audit
+from app.models.enums import Role
+from app.models.user import User
+from app.repositories.audit_sink import AuditSink
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+async def test_spill_is_replayed_in_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    actor = await User(
+        username="u", email="u@example.com", password="x", roles=Role.USER
+    ).insert()
+    sink = AuditSink(batch_size=2, spill_path=str(tmp_path / "audit.spill"))
+    await sink._spill([Audit(actor=actor, action=f"a{i}") for i in range(5)])
+
+    batches: list[int] = []
+    flush = sink._flush
+
+    async def counted(batch: list[Audit]) -> bool:
+        batches.append(len(batch))
+        return await flush(batch)
+
+    monkeypatch.setattr(sink, "_flush", counted)
+    await sink._replay_spill()
+
+    assert batches == [2, 2, 1]
+    assert sink.written == 5
+    assert await Audit.count() == 5
+    assert list(tmp_path.iterdir()) == []
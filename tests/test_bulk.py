@@ -0,0 +1,87 @@
+import pytest
+from beanie import PydanticObjectId
+
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories.bulk import bulk_delete, bulk_insert, bulk_upsert
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+async def test_bulk_delete_fails_malformed_ids_per_item() -> None:
+    task = await Task(
+        description="task", project_id=1, assigned_to=10, status=TaskStatus.ASSIGNED
+    ).insert()
+    absent = PydanticObjectId()
+
+    result = await bulk_delete(Task, [str(task.id), "not-an-id", absent])
+
+    assert [(item.index, item.status) for item in result.items] == [
+        (0, "deleted"),
+        (1, None),
+        (2, "missing"),
+    ]
+    assert [item.index for item in result.errors] == [1]
+    assert result.items[1].error == "invalid id 'not-an-id'"
+    assert await Task.count() == 0
+
+
+def _task(description: str) -> Task:
+    return Task(
+        description=description,
+        project_id=1,
+        assigned_to=10,
+        status=TaskStatus.ASSIGNED,
+    )
+
+
+@pytest.fixture
+def validate_on_save(backends: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    # The models' own Settings classes leave Beanie's default (off).
+    monkeypatch.setattr(Task.get_settings(), "validate_on_save", True)
+
+
+def _invalid_task() -> Task:
+    task = _task("invalid")
+    task.project_id = "not a number"  # type: ignore[assignment]
+    return task
+
+
+@pytest.mark.usefixtures("validate_on_save")
+async def test_bulk_insert_skips_invalid_documents_per_item() -> None:
+    docs = [_task("a"), _invalid_task(), _task("b")]
+
+    result = await bulk_insert(Task, docs, chunk_size=2)
+
+    assert [(item.index, item.status) for item in result.items] == [
+        (0, "inserted"),
+        (1, None),
+        (2, "inserted"),
+    ]
+    assert result.items[1].error is not None
+    assert "project_id" in result.items[1].error
+    assert sorted(t.description for t in await Task.find_all().to_list()) == [
+        "a",
+        "b",
+    ]
+
+
+@pytest.mark.usefixtures("validate_on_save")
+async def test_ordered_bulk_insert_stops_at_an_invalid_document() -> None:
+    docs = [_task("a"), _invalid_task(), _task("b"), _task("c")]
+
+    result = await bulk_insert(Task, docs, chunk_size=2, ordered=True)
+
+    assert [item.index for item in result.errors] == [1, 2, 3]
+    assert result.items[2].error == result.items[3].error
+    assert [t.description for t in await Task.find_all().to_list()] == ["a"]
+
+
+async def test_bulk_upsert_reports_missing_key_fields_per_item() -> None:
+    result = await bulk_upsert(Task, [_task("a")], key_fields=("externalId",))
+
+    assert not result.ok
+    assert result.items[0].error == (
+        "upsert key fields not on document: ['externalId']"
+    )
+    assert await Task.count() == 0
@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.core.cache import DocumentCache, get_document_cache
+from app.core.config import settings
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.models.user import User
+from app.repositories.bulk import BulkItemResult, _resolve_updated_ids
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+def _task(description: str = "task") -> Task:
+    return Task(
+        description=description,
+        project_id=1,
+        assigned_to=10,
+        status=TaskStatus.ASSIGNED,
+    )
+
+
+async def _insert(description: str = "task") -> PydanticObjectId:
+    task = await _task(description).insert()
+    assert task.id is not None
+    return task.id
+
+
+class CountingLoader:
+    """Loads through Mongo, then pauses so concurrent callers overlap."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[PydanticObjectId]] = []
+
+    async def one(self, id: PydanticObjectId) -> Task | None:
+        self.calls.append([id])
+        doc: Task | None = await Task.get(id)
+        await asyncio.sleep(0.01)
+        return doc
+
+    async def many(self, ids: list[PydanticObjectId]) -> dict[PydanticObjectId, Task]:
+        self.calls.append(ids)
+        docs = await Task.find({"_id": {"$in": ids}}).to_list()
+        await asyncio.sleep(0.01)
+        return {doc.id: doc for doc in docs if doc.id is not None}
+
+
+async def test_concurrent_misses_share_one_load() -> None:
+    task_id = await _insert()
+    cache = DocumentCache(Task)
+    loader = CountingLoader()
+
+    results = await asyncio.gather(
+        *(cache.get(task_id, lambda: loader.one(task_id)) for _ in range(10))
+    )
+
+    assert [doc.id for doc in results if doc is not None] == [task_id] * 10
+    assert len(loader.calls) == 1
+    assert cache.coalesced == 9
+    # Followers get copies, not the leader's instance.
+    assert len({id(doc) for doc in results}) == 10
+    assert await cache.peek(task_id) == (True, results[0])
+
+
+async def test_get_many_waits_for_loads_already_in_flight() -> None:
+    first, second = await _insert("a"), await _insert("b")
+    cache = DocumentCache(Task)
+    loader = CountingLoader()
+
+    single, batch = await asyncio.gather(
+        cache.get(first, lambda: loader.one(first)),
+        cache.get_many([first, second], loader.many),
+    )
+
+    assert single is not None
+    assert single.id == first
+    assert set(batch) == {first, second}
+    assert loader.calls == [[first], [second]]
+    assert cache.coalesced == 1
+
+
+async def test_invalidation_during_a_load_is_not_overwritten() -> None:
+    task_id = await _insert()
+    cache = DocumentCache(Task)
+    loader = CountingLoader()
+
+    async def write_during_load() -> None:
+        await asyncio.sleep(0.005)
+        await Task.find_one({"_id": task_id}).update({"$set": {"description": "new"}})
+        await cache.invalidate(task_id)
+
+    stale, _ = await asyncio.gather(
+        cache.get(task_id, lambda: loader.one(task_id)), write_during_load()
+    )
+
+    assert stale is not None
+    assert stale.description == "task"
+    assert await cache.peek(task_id) == (False, None)
+
+
+async def test_upserts_on_a_field_key_report_the_updated_ids() -> None:
+    # mongomock cannot run upserting bulk_writes, so the lookup bulk_upsert
+    # runs after its write is exercised on its own.
+    task = await _task("unique").insert()
+    updated = BulkItemResult(index=0, status="updated")
+    inserted_id = PydanticObjectId()
+    inserted = BulkItemResult(index=1, id=inserted_id, status="inserted")
+
+    await _resolve_updated_ids(
+        Task.get_pymongo_collection(),
+        [updated, inserted],
+        [{"description": "unique"}, {"description": "other"}],
+    )
+
+    assert updated.id == task.id
+    assert inserted.id == inserted_id
+
+
+async def test_users_are_never_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "cache_enabled", True)
+
+    assert get_document_cache(Task) is not None
+    assert get_document_cache(User) is None
@@ -0,0 +1,32 @@
+import pytest
+
+from app.core.conditional import document_validators
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories.task import TaskRepository
+from app.repositories.updates import atomic_update
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+async def test_etags_follow_the_revision_not_the_timestamp() -> None:
+    repo = TaskRepository()
+    task = await repo.create(
+        Task(
+            description="task",
+            project_id=1,
+            assigned_to=10,
+            status=TaskStatus.ASSIGNED,
+        )
+    )
+    assert task.id is not None
+    version = await repo.get_version(task.id)
+    assert version is not None
+    assert document_validators(version) == document_validators(task)
+
+    updated = await atomic_update(Task, task.id, {"status": "PENDING"})
+    assert updated is not None
+    # A write within the same millisecond still changes the ETag.
+    updated.updated_at = task.updated_at
+
+    assert document_validators(updated)["ETag"] != document_validators(task)["ETag"]
@@ -0,0 +1,39 @@
+from typing import Any
+
+import pytest
+from pymongo import ASCENDING, IndexModel
+
+from app.core.config import settings
+from app.core.mongo import apply_ttl_changes, get_client
+from app.models.audit import Audit
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+async def test_ttl_added_to_an_existing_index_goes_through_collmod(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = get_client()
+    assert client is not None
+    db = client[settings.database_name]
+    collection = db[Audit.get_collection_name()]
+    await collection.create_index([("createdAt", ASCENDING)])
+    monkeypatch.setattr(
+        Audit.Settings,
+        "indexes",
+        [IndexModel([("createdAt", ASCENDING)], expireAfterSeconds=60)],
+    )
+    commands: list[dict[str, Any]] = []
+
+    async def command(cmd: dict[str, Any]) -> None:
+        commands.append(cmd)
+
+    monkeypatch.setattr(db, "command", command)
+    await apply_ttl_changes(db)
+
+    assert commands == [
+        {
+            "collMod": "audit",
+            "index": {"keyPattern": {"createdAt": 1}, "expireAfterSeconds": 60},
+        }
+    ]
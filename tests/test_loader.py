@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.core.cache import DocumentCache
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories import loader
+from app.repositories.loader import DocumentLoader, get_loader, loader_scope
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+async def _insert(n: int) -> list[PydanticObjectId]:
+    ids = []
+    for i in range(n):
+        task = await Task(
+            description=f"task {i}",
+            project_id=1,
+            assigned_to=10,
+            status=TaskStatus.ASSIGNED,
+        ).insert()
+        assert task.id is not None
+        ids.append(task.id)
+    return ids
+
+
+@pytest.fixture
+def fetches(monkeypatch: pytest.MonkeyPatch) -> list[list[PydanticObjectId]]:
+    calls: list[list[PydanticObjectId]] = []
+    fetch_many = loader.fetch_many
+
+    async def counted(model: Any, ids: Any, *, cache: Any = None) -> Any:
+        ids = list(ids)
+        calls.append(ids)
+        return await fetch_many(model, ids, cache=cache)
+
+    monkeypatch.setattr(loader, "fetch_many", counted)
+    return calls
+
+
+async def test_loads_in_one_tick_share_one_query(
+    fetches: list[list[PydanticObjectId]],
+) -> None:
+    ids = await _insert(3)
+    missing = PydanticObjectId()
+    tasks_loader = DocumentLoader(Task)
+
+    results = await asyncio.gather(
+        *(tasks_loader.load(id) for id in ids),
+        tasks_loader.load(missing),
+        tasks_loader.load(str(ids[0])),
+    )
+
+    assert [doc.id if doc else None for doc in results] == [*ids, None, ids[0]]
+    assert fetches == [[*ids, missing]]
+
+    # Memoized, including the miss.
+    assert await tasks_loader.load_many([ids[1], missing]) == [
+        results[1],
+        None,
+    ]
+    assert len(fetches) == 1
+
+
+async def test_batches_go_through_the_cache() -> None:
+    ids = await _insert(2)
+    cache = DocumentCache(Task)
+
+    await DocumentLoader(Task, cache=cache).load_many(ids)
+
+    assert all([(await cache.peek(id))[0] for id in ids])
+    assert cache.misses == 2
+
+
+async def test_a_failed_batch_is_retried_by_later_loads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    (task_id,) = await _insert(1)
+    tasks_loader = DocumentLoader(Task)
+
+    async def broken(*_: object, **__: object) -> None:
+        raise ConnectionError("down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(loader, "fetch_many", broken)
+        with pytest.raises(ConnectionError):
+            await tasks_loader.load(task_id)
+
+    loaded = await tasks_loader.load(task_id)
+    assert loaded is not None
+
+
+async def test_loaders_are_scoped() -> None:
+    assert get_loader(Task) is not get_loader(Task)
+    with loader_scope():
+        scoped = get_loader(Task)
+        assert get_loader(Task) is scoped
+        with loader_scope():
+            assert get_loader(Task) is not scoped
+        assert get_loader(Task) is scoped
@@ -0,0 +1,77 @@
+import gzip
+import logging
+import os
+import subprocess
+import sys
+import textwrap
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from app.core.logging import _gzip_namer, _gzip_rotator
+
+FORK_SCRIPT = textwrap.dedent(
+    """
+    import logging
+    import os
+
+    from app.core import logging as app_logging
+
+    app_logging.configure_logging()
+    captured = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            captured.append(record)
+
+    listener = app_logging._listener
+    listener.handlers = (*listener.handlers, Capture())
+
+    pid = os.fork()
+    if pid == 0:
+        same_queue = app_logging._queue_handler.queue is app_logging._listener.queue
+        for i in range(15):
+            logging.getLogger("child").warning("record %d", i)
+        app_logging.shutdown_logging()
+        os._exit(0 if same_queue and len(captured) == 15 else 1)
+    _, status = os.waitpid(pid, 0)
+    raise SystemExit(os.waitstatus_to_exitcode(status))
+    """
+)
+
+
+def test_forked_workers_log_through_their_own_listener() -> None:
+    # A preloaded gunicorn master configures logging before forking workers;
+    # each worker must enqueue onto the queue its restarted listener drains.
+    env = {**os.environ, "LOG_HANDLERS": "console", "LOG_LEVEL": "warning"}
+    result = subprocess.run(
+        [sys.executable, "-c", FORK_SCRIPT],
+        env=env,
+        capture_output=True,
+        timeout=30,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr.decode()
+
+
+def test_compressed_rollovers_keep_every_backup(tmp_path: Path) -> None:
+    handler = RotatingFileHandler(tmp_path / "app.log", maxBytes=1, backupCount=2)
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    for message in ("first", "second", "third"):
+        handler.emit(logging.makeLogRecord({"msg": message}))
+        handler.doRollover()
+    handler.close()
+
+    backups = {
+        path.name: gzip.decompress(path.read_bytes()).decode()
+        for path in tmp_path.glob("*.gz")
+    }
+    assert backups == {"app.log.1.gz": "third\n", "app.log.2.gz": "second\n"}
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "app.log",
+        "app.log.1.gz",
+        "app.log.2.gz",
+    ]
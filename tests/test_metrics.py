@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.core.metrics import Counter, Gauge, Histogram, aggregate, write_snapshot
+
+requests = Counter("test_requests_total", "Requests.", ("route",))
+in_flight = Gauge("test_in_flight", "In flight.")
+latency = Histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+
+def _exited_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _worker_snapshot(directory: Path, pid: int, requests_total: float) -> None:
+    rows = {
+        requests.name: [[["/tasks"], requests_total]],
+        in_flight.name: [[[], 3]],
+        latency.name: [[[], [1, 0, 0, 0.05]]],
+    }
+    (directory / f"{pid}-test.json").write_text(json.dumps(rows))
+
+
+def test_aggregate_sums_workers_and_keeps_exited_counters(tmp_path: Path) -> None:
+    requests.inc(("/tasks",), 2)
+    in_flight.inc()
+    latency.observe(0.5)
+    _worker_snapshot(tmp_path, os.getppid(), 5)  # a live worker
+    _worker_snapshot(tmp_path, _exited_pid(), 7)
+
+    totals = aggregate(str(tmp_path))
+
+    assert totals[requests.name] == {("/tasks",): 14}
+    assert totals[in_flight.name] == {(): 4}  # the exited worker's gauge is dropped
+    assert totals[latency.name] == {(): [2, 1, 0, pytest.approx(0.6)]}
+    # The exited worker was folded into the archive, so nothing is lost
+    # when its snapshot is gone.
+    remaining = {path.name for path in tmp_path.glob("*-test.json")}
+    assert remaining == {f"{os.getppid()}-test.json"}
+    assert aggregate(str(tmp_path))[requests.name] == {("/tasks",): 14}
+
+
+def test_write_snapshot_replaces_own_file(tmp_path: Path) -> None:
+    write_snapshot(str(tmp_path))
+    write_snapshot(str(tmp_path))
+
+    (snapshot,) = tmp_path.glob(f"{os.getpid()}-*.json")
+    assert requests.name in json.loads(snapshot.read_text())
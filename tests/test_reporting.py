@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.redis import acquire_lock, get_redis, release_lock
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories import reporting
+from app.repositories.reporting import (
+    BUILT_KEY,
+    REBUILD_LOCK_KEY,
+    aggregate_task_report,
+    apply_task_changes,
+    mark_counters_stale,
+    open_tasks_by_assignee,
+    reconcile_task_counters,
+    tasks_by_project_status,
+)
+from app.repositories.task import TaskRepository
+
+pytestmark = [pytest.mark.anyio, pytest.mark.usefixtures("backends")]
+
+
+def _task(project_id: int, assigned_to: int, status: TaskStatus) -> Task:
+    return Task(
+        description="task",
+        project_id=project_id,
+        assigned_to=assigned_to,
+        status=status,
+    )
+
+
+@pytest.fixture
+def count_aggregations(monkeypatch: pytest.MonkeyPatch) -> list[int]:
+    calls: list[int] = []
+
+    async def counted() -> dict[str, dict[str, int]]:
+        calls.append(1)
+        return await aggregate_task_report()
+
+    monkeypatch.setattr(reporting, "aggregate_task_report", counted)
+    return calls
+
+
+async def test_counter_deltas_follow_writes() -> None:
+    await reconcile_task_counters()
+    repo = TaskRepository()
+    first = await repo.create(_task(1, 10, TaskStatus.ASSIGNED))
+    await repo.create(_task(1, 11, TaskStatus.PENDING))
+    second = await repo.create(_task(2, 10, TaskStatus.ASSIGNED))
+    assert first.id is not None
+    assert second.id is not None
+
+    await repo.update(first.id, {"status": TaskStatus.COMPLETED})
+    await repo.update(second.id, {"project_id": 3})
+    await repo.delete(second.id)
+
+    assert await tasks_by_project_status() == {
+        1: {"COMPLETED": 1, "PENDING": 1},
+    }
+    assert await tasks_by_project_status(1) == {1: {"COMPLETED": 1, "PENDING": 1}}
+    assert await open_tasks_by_assignee() == {11: 1}
+    assert await get_redis().exists(BUILT_KEY)
+
+
+async def test_stale_counters_rebuild_once_for_concurrent_readers(
+    count_aggregations: list[int],
+) -> None:
+    repo = TaskRepository()
+    await repo.create(_task(1, 10, TaskStatus.ASSIGNED))
+    await repo.create(_task(1, 10, TaskStatus.PENDING))
+    await mark_counters_stale()
+
+    results = await asyncio.gather(*(open_tasks_by_assignee() for _ in range(10)))
+
+    assert results == [{10: 2}] * 10
+    assert len(count_aggregations) == 1
+    assert await get_redis().exists(BUILT_KEY)
+    assert not await get_redis().exists(REBUILD_LOCK_KEY)
+
+
+async def test_reader_losing_the_race_reads_the_winners_counters(
+    count_aggregations: list[int], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(reporting, "_REBUILD_POLL_SECONDS", 0.01)
+    await TaskRepository().create(_task(1, 10, TaskStatus.ASSIGNED))
+    await mark_counters_stale()
+    # Another process is rebuilding.
+    token = await acquire_lock(REBUILD_LOCK_KEY, 10_000)
+    assert token is not None
+
+    async def other_process() -> None:
+        await asyncio.sleep(0.05)
+        await get_redis().hset(reporting.OPEN_BY_ASSIGNEE_KEY, "10", 1)
+        await release_lock(REBUILD_LOCK_KEY, token)
+
+    result, _ = await asyncio.gather(open_tasks_by_assignee(), other_process())
+
+    assert result == {10: 1}
+    assert count_aggregations == []
+
+
+async def test_rebuild_racing_a_counted_write_is_not_marked_built(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await TaskRepository().create(_task(1, 10, TaskStatus.ASSIGNED))
+    await mark_counters_stale()
+
+    async def racing() -> dict[str, dict[str, Any]]:
+        report = await aggregate_task_report()
+        await apply_task_changes(
+            [(None, {"project_id": 2, "assigned_to": 11, "status": "PENDING"})]
+        )
+        return report
+
+    monkeypatch.setattr(reporting, "aggregate_task_report", racing)
+    await reconcile_task_counters()
+    assert not await get_redis().exists(BUILT_KEY)
+
+    monkeypatch.undo()
+    await reconcile_task_counters()
+    assert await get_redis().exists(BUILT_KEY)
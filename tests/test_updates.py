@@ -0,0 +1,89 @@
+from typing import Any
+
+import pytest
+from beanie.exceptions import RevisionIdWasChanged
+
+from app.core.cache import DocumentCache
+from app.models.audit import Audit
+from app.models.enums import TaskStatus
+from app.models.task import Task
+from app.repositories.task import TaskRepository
+from app.repositories.updates import atomic_update, build_update
+
+
+def _task() -> Task:
+    return Task(
+        description="task", project_id=1, assigned_to=10, status=TaskStatus.ASSIGNED
+    )
+
+
+@pytest.mark.parametrize(
+    "patch",
+    [
+        {"$inc": {"description": 1}},
+        {"$inc": {"status": 1}},
+        {"$inc": {"project_id": 1.5}},
+        {"$inc": {"project_id": True}},
+        {"$push": {"status": "DONE"}},
+        {"$push": {"description": "x"}},
+        {"$unset": {"description": ""}},
+        {"created_at": None},
+    ],
+)
+def test_build_update_rejects_invalid_patches(patch: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        build_update(Task, patch)
+
+
+def test_build_update_validates_and_encodes() -> None:
+    update = build_update(Task, {"status": "COMPLETED", "$inc": {"project_id": 2}})
+
+    assert update == {
+        "$set": {"status": "COMPLETED"},
+        "$inc": {"project_id": 2},
+        "$currentDate": {"updatedAt": True},
+    }
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("backends")
+async def test_expected_revision_guards_concurrent_updates() -> None:
+    task = await TaskRepository().create(_task())
+    assert task.id is not None
+    assert task.revision_id is not None
+
+    updated = await atomic_update(
+        Task, task.id, {"status": "PENDING"}, expected_revision=task.revision_id
+    )
+    assert updated is not None
+    assert updated.revision_id not in (None, task.revision_id)
+
+    with pytest.raises(RevisionIdWasChanged):
+        await atomic_update(
+            Task, task.id, {"status": "COMPLETED"}, expected_revision=task.revision_id
+        )
+    # Updates without an expected revision still move it on.
+    unguarded = await atomic_update(Task, task.id, {"status": "COMPLETED"})
+    assert unguarded is not None
+    assert unguarded.revision_id != updated.revision_id
+
+    with pytest.raises(ValueError, match="revision"):
+        await atomic_update(
+            Audit, task.id, {"action": "x"}, expected_revision=task.revision_id
+        )
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("backends")
+async def test_cached_documents_keep_their_revision() -> None:
+    cache = DocumentCache(Task)
+    repo = TaskRepository(cache=cache)
+    task = await repo.create(_task())
+    assert task.id is not None
+
+    await repo.get(task.id)
+    found, cached = await cache.peek(task.id)
+
+    assert found
+    assert cached is not None
+    assert cached.revision_id == task.revision_id